@@ -387,6 +387,7 @@ def register_v2_blueprints(application):
     from app.v2.inbound_sms.get_inbound_sms import v2_inbound_sms_blueprint
     from app.v2.notifications import (  # noqa
         get_notifications,
+        post_bulk_notifications,
         post_notifications,
         post_notifications_messagebox,
         v2_notification_blueprint,
@@ -428,6 +429,12 @@ def init_app(app):
         response.headers.add("Access-Control-Allow-Methods", "GET,PUT,POST,DELETE")
         return response
 
+    @app.teardown_appcontext
+    def release_daily_limit_reservations(exception):
+        from app.notifications.service_limits import release_daily_limit_reservations
+
+        release_daily_limit_reservations()
+
     @app.errorhandler(Exception)
     def exception(error):
         app.logger.exception(error)
@@ -476,8 +483,21 @@ def setup_sqlalchemy_events(app):  # noqa: C901
         ["method", "host", "path"],
     )
 
+    # avoid circular imports by importing this file later
+    from app.db_statement_stats import (
+        after_cursor_execute,
+        before_cursor_execute,
+        record_request_db_statement_stats,
+        record_task_db_statement_stats,
+    )
+
+    app.teardown_request(record_request_db_statement_stats)
+    app.teardown_appcontext(record_task_db_statement_stats)
+
     # need this or db.engine isn't accessible
     with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
 
         @event.listens_for(db.engine, "connect")
         def connect(dbapi_connection, connection_record):
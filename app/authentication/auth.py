@@ -1,6 +1,8 @@
 import time
 import uuid
+from threading import RLock
 
+import cachetools
 from flask import current_app, g, request
 from gds_metrics import Histogram
 from notifications_python_client.authentication import (
@@ -25,6 +27,12 @@ AUTH_DB_CONNECTION_DURATION_SECONDS = Histogram(
     "Time taken to get DB connection and fetch service from database",
 )
 
+# the id of the API key that most recently authenticated a request for each service (or internal client), so that
+# key can be tried first next time rather than checking the token against every key in turn. This is only ever used
+# to order the keys, so a stale entry costs at most one extra signature check
+recently_used_api_key_ids = cachetools.TTLCache(maxsize=4096, ttl=600)
+recently_used_api_key_ids_lock = RLock()
+
 
 class AuthError(Exception):
     def __init__(self, message, code, service_id=None, api_key_id=None):
@@ -118,7 +126,7 @@ def requires_auth():
 
 
 def _decode_jwt_token(auth_token, api_keys, service_id=None):
-    for api_key in api_keys:
+    for api_key in _order_api_keys_by_recent_use(api_keys, service_id):
         try:
             decode_jwt_token(auth_token, api_key.secret)
         except TokenExpiredError as e:
@@ -148,12 +156,25 @@ def _decode_jwt_token(auth_token, api_keys, service_id=None):
         if api_key.expiry_date:
             raise AuthError("Invalid token: API key revoked", 403, service_id=service_id, api_key_id=api_key.id)
 
+        with recently_used_api_key_ids_lock:
+            recently_used_api_key_ids[service_id] = api_key.id
+
         return api_key
     else:
         # service has API keys, but none matching the one the user provided
         raise AuthError("Invalid token: API key not found", 403, service_id=service_id)
 
 
+def _order_api_keys_by_recent_use(api_keys, service_id):
+    with recently_used_api_key_ids_lock:
+        recent_api_key_id = recently_used_api_key_ids.get(service_id)
+
+    if recent_api_key_id is None:
+        return api_keys
+
+    return sorted(api_keys, key=lambda api_key: api_key.id != recent_api_key_id)
+
+
 def _get_auth_token(req):
     auth_header = req.headers.get("Authorization", None)
     if not auth_header:
@@ -50,6 +50,17 @@ def get_job_metadata_from_s3(service_id, job_id):
     return obj.get()["Metadata"]
 
 
+def get_job_size_and_metadata_from_s3(service_id, job_id):
+    # a HEAD request, so none of the file itself is downloaded
+    obj = get_s3_object(*get_job_location(service_id, job_id))
+    return obj.content_length, obj.metadata
+
+
+def get_job_byte_range_from_s3(service_id, job_id, first_byte, last_byte):
+    obj = get_s3_object(*get_job_location(service_id, job_id))
+    return obj.get(Range=f"bytes={first_byte}-{last_byte}")["Body"].read()
+
+
 def remove_job_from_s3(service_id, job_id):
     return remove_s3_object(*get_job_location(service_id, job_id))
 
@@ -8,7 +8,7 @@ from notifications_utils.timezones import convert_bst_to_utc, convert_utc_to_bst
 
 from app import notify_celery, signing
 from app.aws import s3
-from app.celery.provider_tasks import deliver_letter
+from app.celery.provider_tasks import deliver_letter, deliver_letters_batch
 from app.config import QueueNames, TaskNames
 from app.constants import (
     INTERNATIONAL_LETTERS,
@@ -235,12 +235,15 @@ def send_dvla_letters_via_api(print_run_deadline_local, batch_size=100):
         (row.id for row in letters_to_be_printed),
         batch_size,
     ):
-        shatter_deliver_letter_tasks.apply_async([batch], queue=QueueNames.PERIODIC)
+        if current_app.config["BATCH_DELIVER_LETTERS_ENABLED"]:
+            deliver_letters_batch.apply_async([batch], queue=QueueNames.SEND_LETTER)
+        else:
+            shatter_deliver_letter_tasks.apply_async([batch], queue=QueueNames.PERIODIC)
 
 
 @notify_celery.task(name="shatter-deliver-letters-tasks")
 def shatter_deliver_letter_tasks(notification_ids):
-    # If the number or size of arguments to this function change, then the default
+    # If the number or size of arguments to this function (or to deliver_letters_batch) change, then the default
     # `batch_size` argument of `send_dvla_letters_via_api` needs updating to keep
     # within SQS’s maximum message size
     for id in notification_ids:
@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import UTC, datetime, timedelta
 
 from flask import current_app
@@ -51,7 +52,7 @@ from app.dao.unsubscribe_request_dao import (
 )
 from app.models import FactProcessingTime, Notification
 from app.notifications.notifications_ses_callback import (
-    check_and_queue_callback_task,
+    check_and_queue_callback_tasks,
 )
 from app.utils import get_london_midnight_in_utc
 
@@ -242,16 +243,12 @@ def delete_test_notifications_for_service_and_type(service_id, notification_type
 @notify_celery.task(name="timeout-sending-notifications")
 @cronitor("timeout-sending-notifications")
 def timeout_notifications():
-    notifications = ["dummy value so len() > 0"]
-
     cutoff_time = datetime.utcnow() - timedelta(seconds=current_app.config.get("SENDING_NOTIFICATIONS_TIMEOUT_PERIOD"))
 
-    while len(notifications) > 0:
-        notifications = dao_timeout_notifications(cutoff_time)
-
-        for notification in notifications:
-            statsd_client.incr(f"timeout-sending.{notification.sent_by}")
-            check_and_queue_callback_task(notification)
+    while notifications := dao_timeout_notifications(cutoff_time):
+        for sent_by, count in Counter(notification.sent_by for notification in notifications).items():
+            statsd_client.incr(f"timeout-sending.{sent_by}", count)
+        check_and_queue_callback_tasks(notifications)
 
         current_app.logger.info(
             "Timeout period reached for %s notifications, status has been updated.", len(notifications)
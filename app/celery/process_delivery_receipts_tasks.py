@@ -0,0 +1,131 @@
+import uuid
+from collections import defaultdict
+
+from flask import current_app
+
+from app import notify_celery
+from app.celery.process_ses_receipts_tasks import process_ses_results, record_ses_status_update
+from app.celery.process_sms_client_response_tasks import record_sms_status_update, sms_response_mapper
+from app.config import QueueNames
+from app.constants import EMAIL_TYPE, NOTIFICATION_TECHNICAL_FAILURE, SMS_TYPE
+from app.dao import notifications_dao
+from app.notifications.delivery_receipts_buffer import buffer_delivery_receipts, pop_buffered_delivery_receipts
+
+# the most receipts to apply with each round of UPDATE statements
+DELIVERY_RECEIPTS_BATCH_SIZE = 1000
+# how many batches a receipt can fail to apply in before it's dropped, so one that can never be applied doesn't keep
+# going back in the buffer and failing every batch it ends up in
+MAX_DELIVERY_RECEIPT_ATTEMPTS = 5
+
+
+@notify_celery.task(name="apply-buffered-delivery-receipts")
+def apply_buffered_delivery_receipts():
+    if not current_app.config["REDIS_ENABLED"]:
+        return
+
+    while receipts := pop_buffered_delivery_receipts(DELIVERY_RECEIPTS_BATCH_SIZE):
+        try:
+            apply_sms_delivery_receipts([receipt for receipt in receipts if receipt["notification_type"] == SMS_TYPE])
+            apply_email_delivery_receipts(
+                [receipt for receipt in receipts if receipt["notification_type"] == EMAIL_TYPE]
+            )
+        except Exception:
+            # put the receipts back to try again next time. any that were already applied will be skipped then, as
+            # notifications in a final state aren't updated
+            current_app.logger.exception("Failed to apply %s buffered delivery receipts", len(receipts))
+            if receipts_to_retry := _receipts_to_retry(receipts):
+                buffer_delivery_receipts(receipts_to_retry)
+            raise
+
+        if len(receipts) < DELIVERY_RECEIPTS_BATCH_SIZE:
+            break
+
+
+def _receipts_to_retry(receipts):
+    receipts_to_retry = []
+    for receipt in receipts:
+        attempts = receipt.get("attempts", 0) + 1
+        if attempts < MAX_DELIVERY_RECEIPT_ATTEMPTS:
+            receipts_to_retry.append({**receipt, "attempts": attempts})
+        else:
+            current_app.logger.error(
+                "Dropping %s delivery receipt for reference %s after failing to apply it %s times",
+                receipt["notification_type"],
+                receipt["reference"],
+                attempts,
+            )
+    return receipts_to_retry
+
+
+def apply_sms_delivery_receipts(receipts):
+    """
+    Applies a batch of sms delivery receipts with one UPDATE per status. The notifications that changed then get the
+    same stats and service callbacks as process-sms-client-response would give them.
+    """
+    receipts_by_status = defaultdict(list)
+    client_names = {}
+
+    for receipt in receipts:
+        client_name = receipt["client_name"]
+        try:
+            notification_id = uuid.UUID(receipt["reference"], version=4)
+        except (ValueError, TypeError):
+            current_app.logger.warning("%s callback with invalid reference %s", client_name, receipt["reference"])
+            continue
+
+        try:
+            notification_status, _ = sms_response_mapper[client_name](
+                receipt["status"], receipt["detailed_status_code"]
+            )
+        except KeyError:
+            current_app.logger.warning("%s callback failed: status %s not found.", client_name, receipt["status"])
+            notification_status = NOTIFICATION_TECHNICAL_FAILURE
+
+        receipts_by_status[notification_status].append((notification_id, client_name.lower()))
+        client_names[notification_id] = client_name
+
+    for notification_status, ids_and_sent_by in receipts_by_status.items():
+        updated_ids = notifications_dao.dao_update_notification_statuses_by_id(notification_status, ids_and_sent_by)
+        current_app.logger.info(
+            "Updated %s of %s notifications to %s from sms delivery receipts",
+            len(updated_ids),
+            len(ids_and_sent_by),
+            notification_status,
+        )
+
+        for notification in notifications_dao.get_notifications_by_ids(updated_ids):
+            record_sms_status_update(notification, notification_status, client_names[notification.id])
+
+
+def apply_email_delivery_receipts(receipts):
+    """
+    Applies a batch of SES delivery receipts with one UPDATE per status. Any receipt that doesn't match a notification
+    still waiting for one (eg it's not been saved yet, or has moved to notification_history) is handed back to
+    process-ses-result to deal with on its own.
+    """
+    receipts_by_status = defaultdict(dict)
+    for receipt in receipts:
+        receipts_by_status[receipt["status"]][receipt["reference"]] = receipt
+
+    for notification_status, receipts_by_reference in receipts_by_status.items():
+        updated = notifications_dao.dao_update_notification_statuses_by_reference(
+            notification_status, list(receipts_by_reference)
+        )
+        current_app.logger.info(
+            "Updated %s of %s notifications to %s from SES delivery receipts",
+            len(updated),
+            len(receipts_by_reference),
+            notification_status,
+        )
+
+        for notification in notifications_dao.get_notifications_by_ids(
+            [notification_id for notification_id, _ in updated]
+        ):
+            record_ses_status_update(notification, notification_status)
+
+        updated_references = {reference for _, reference in updated}
+        for reference, receipt in receipts_by_reference.items():
+            if reference not in updated_references:
+                process_ses_results.apply_async(
+                    [receipt["response"]], {"allow_buffering": False}, queue=QueueNames.RETRY
+                )
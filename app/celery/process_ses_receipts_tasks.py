@@ -9,8 +9,9 @@ from sqlalchemy.orm.exc import NoResultFound
 from app import notify_celery, statsd_client
 from app.clients.email.aws_ses import get_aws_responses
 from app.config import QueueNames
-from app.constants import NOTIFICATION_PENDING, NOTIFICATION_SENDING
+from app.constants import EMAIL_TYPE, NOTIFICATION_PENDING, NOTIFICATION_SENDING
 from app.dao import notifications_dao
+from app.notifications.delivery_receipts_buffer import buffer_delivery_receipts, delivery_receipts_buffer_enabled
 from app.notifications.notifications_ses_callback import (
     _check_and_queue_complaint_callback_task,
     check_and_queue_callback_task,
@@ -22,7 +23,7 @@ from app.notifications.notifications_ses_callback import (
 @notify_celery.task(
     bind=True, name="process-ses-result", max_retries=5, default_retry_delay=300, early_log_level=logging.DEBUG
 )
-def process_ses_results(self, response):
+def process_ses_results(self, response, allow_buffering=True):
     try:
         ses_message = json.loads(response["Message"])
         notification_type = ses_message["notificationType"]
@@ -39,23 +40,21 @@ def process_ses_results(self, response):
         notification_status = aws_response_dict["notification_status"]
         reference = ses_message["mail"]["messageId"]
 
-        try:
-            notification = notifications_dao.dao_get_notification_or_history_by_reference(reference=reference)
-        except NoResultFound:
-            message_time = iso8601.parse_date(ses_message["mail"]["timestamp"]).replace(tzinfo=None)
-            if datetime.utcnow() - message_time < timedelta(minutes=5):
-                current_app.logger.info(
-                    "notification not found for reference: %s (update to %s). "
-                    "Callback may have arrived before notification was persisted to the DB. Adding task to retry queue",
-                    reference,
-                    notification_status,
-                )
-                self.retry(queue=QueueNames.RETRY)
-            else:
-                current_app.logger.warning(
-                    "notification not found for reference: %s (update to %s)", reference, notification_status
-                )
-            return
+        if allow_buffering and delivery_receipts_buffer_enabled():
+            _buffer_ses_result(response, reference, notification_status, bounce_message)
+            return True
+
+        # nearly every receipt is for a notification that's still sending, so try updating it straight away, only
+        # looking for it (in notification_history too) if that doesn't find it
+        notification = notifications_dao.dao_update_sending_notification_status_by_reference(
+            reference, notification_status
+        )
+        if notification is None:
+            notification = _update_notification_or_history_by_reference(
+                self, ses_message, reference, notification_status
+            )
+            if notification is None:
+                return
 
         if bounce_message:
             current_app.logger.info(
@@ -69,22 +68,7 @@ def process_ses_results(self, response):
                 notification.id,
             )
 
-        if notification.status not in [NOTIFICATION_SENDING, NOTIFICATION_PENDING]:
-            notifications_dao._duplicate_update_warning(notification=notification, status=notification_status)
-            return
-        else:
-            notifications_dao.dao_update_notifications_by_reference(
-                references=[reference], update_dict={"status": notification_status}
-            )
-
-        statsd_client.incr(f"callback.ses.{notification_status}")
-
-        if notification.sent_at:
-            statsd_client.timing_with_dates(
-                f"callback.ses.{notification_status}.elapsed-time", datetime.utcnow(), notification.sent_at
-            )
-
-        check_and_queue_callback_task(notification)
+        record_ses_status_update(notification, notification_status)
 
         return True
 
@@ -94,3 +78,54 @@ def process_ses_results(self, response):
     except Exception as e:
         current_app.logger.exception("Error processing SES results: %s", type(e))
         self.retry(queue=QueueNames.RETRY)
+
+
+def _update_notification_or_history_by_reference(task, ses_message, reference, notification_status):
+    try:
+        notification = notifications_dao.dao_get_notification_or_history_by_reference(reference=reference)
+    except NoResultFound:
+        message_time = iso8601.parse_date(ses_message["mail"]["timestamp"]).replace(tzinfo=None)
+        if datetime.utcnow() - message_time < timedelta(minutes=5):
+            current_app.logger.info(
+                "notification not found for reference: %s (update to %s). "
+                "Callback may have arrived before notification was persisted to the DB. Adding task to retry queue",
+                reference,
+                notification_status,
+            )
+            task.retry(queue=QueueNames.RETRY)
+        else:
+            current_app.logger.warning(
+                "notification not found for reference: %s (update to %s)", reference, notification_status
+            )
+        return None
+
+    if notification.status not in [NOTIFICATION_SENDING, NOTIFICATION_PENDING]:
+        notifications_dao._duplicate_update_warning(notification=notification, status=notification_status)
+        return None
+
+    notifications_dao.dao_update_notifications_by_reference(
+        references=[reference], update_dict={"status": notification_status}
+    )
+    return notification
+
+
+def _buffer_ses_result(response, reference, notification_status, bounce_message):
+    if bounce_message:
+        current_app.logger.info(
+            "SES bounce for reference %s", reference, extra={"bounce_message": json.dumps(bounce_message)}
+        )
+
+    buffer_delivery_receipts(
+        [{"notification_type": EMAIL_TYPE, "status": notification_status, "reference": reference, "response": response}]
+    )
+
+
+def record_ses_status_update(notification, notification_status):
+    statsd_client.incr(f"callback.ses.{notification_status}")
+
+    if notification.sent_at:
+        statsd_client.timing_with_dates(
+            f"callback.ses.{notification_status}.elapsed-time", datetime.utcnow(), notification.sent_at
+        )
+
+    check_and_queue_callback_task(notification)
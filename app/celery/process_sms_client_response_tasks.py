@@ -74,6 +74,10 @@ def _process_for_status(notification_status, client_name, provider_reference, de
     if not notification:
         return
 
+    record_sms_status_update(notification, notification_status, client_name)
+
+
+def record_sms_status_update(notification, notification_status, client_name):
     statsd_client.incr(f"callback.{client_name.lower()}.{notification_status}")
 
     if notification.sent_at:
@@ -1,13 +1,17 @@
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from uuid import UUID
 
+import boto3
 from botocore.exceptions import ClientError as BotoClientError
 from flask import current_app
 from notifications_utils.recipient_validation.notifynl.postal_address import PostalAddress
 from sqlalchemy.orm.exc import NoResultFound
 
-from app import dvla_client, notify_celery, signing
+from app import dvla_client, get_dvla_client, notify_celery, signing
 from app.clients.email import EmailClientNonRetryableException
 from app.clients.email.aws_ses import AwsSesClientThrottlingSendRateException
 from app.clients.letter.dvla import (
@@ -31,7 +35,12 @@ from app.dao.provider_details_dao import (
 )
 from app.delivery import send_to_providers
 from app.exceptions import NotificationTechnicalFailureException
-from app.letters.utils import LetterPDFNotFound, find_letter_pdf_in_s3
+from app.letters.utils import (
+    LetterPDFNotFound,
+    find_letter_pdf_in_s3,
+    get_bucket_name_and_prefix_for_notification,
+    get_letter_pdf_from_s3,
+)
 
 
 @notify_celery.task(
@@ -64,6 +73,33 @@ def deliver_sms(self, notification_id):
             raise NotificationTechnicalFailureException(message) from e
 
 
+@notify_celery.task(name="deliver_sms_batch", early_log_level=logging.DEBUG)
+def deliver_sms_batch(notification_ids):
+    """
+    Sends SMS notifications with the same content in as few provider requests as possible. Anything that can't be
+    sent as part of the batch, or the whole batch if the provider request fails, is handed to deliver_sms to send (and
+    retry) one at a time. Once the provider has accepted the batch, none of it is sent again.
+    """
+    current_app.logger.info("Start sending SMS batch for %s notifications", len(notification_ids))
+    try:
+        sent = send_to_providers.send_sms_batch_to_provider(
+            notifications_dao.get_notifications_by_ids(notification_ids)
+        )
+    except Exception:
+        current_app.logger.warning(
+            "SMS batch delivery for %s notifications failed, sending individually",
+            len(notification_ids),
+            exc_info=True,
+        )
+        sent = []
+
+    sent_ids = {str(notification.id) for notification in sent}
+    with notify_celery.producer_or_acquire() as producer:
+        for notification_id in notification_ids:
+            if str(notification_id) not in sent_ids:
+                deliver_sms.apply_async([str(notification_id)], queue=QueueNames.SEND_SMS, producer=producer)
+
+
 @notify_celery.task(
     bind=True, name="deliver_email", max_retries=48, default_retry_delay=300, early_log_level=logging.DEBUG
 )
@@ -156,6 +192,109 @@ def deliver_letter(self, notification_id):
         raise NotificationTechnicalFailureException(f"Error when sending letter notification {notification_id}") from e
 
 
+_SENT = "sent"
+_RETRY = "retry"
+_FAILED = "failed"
+
+
+@notify_celery.task(name="deliver_letters_batch")
+def deliver_letters_batch(notification_ids):
+    """
+    Sends a batch of letters to DVLA, with several PDF downloads and print requests in flight at once on the same
+    authenticated DVLA session. Letters that were sent (or that DVLA already had) are updated to sending together, and
+    letters that deliver_letter would fail are updated to technical-failure together. Anything that deliver_letter
+    would retry is handed to it to send (and retry) one at a time.
+    """
+    current_app.logger.info("Start sending letter batch for %s notifications", len(notification_ids))
+    letters = [
+        _get_letter_to_send(notification)
+        for notification in notifications_dao.get_notifications_by_ids(notification_ids)
+        if notification.status == NOTIFICATION_CREATED and notification.key_type == KEY_TYPE_NORMAL
+    ]
+    if not letters:
+        return
+
+    # the dvla client is local to each context, so the threads are given this one (and its session) to share, and it
+    # authenticates once up front rather than in every thread
+    client = get_dvla_client()
+    try:
+        client.jwt_token  # noqa: B018
+    except DvlaRetryableException:
+        current_app.logger.exception("Failed to authenticate with DVLA, sending letters individually")
+        outcomes = [(letter["notification_id"], _RETRY) for letter in letters]
+    else:
+        app = current_app._get_current_object()
+        s3_client = boto3.client("s3")
+        with ThreadPoolExecutor(max_workers=current_app.config["DVLA_PRINT_REQUEST_CONCURRENCY"]) as executor:
+            outcomes = list(executor.map(partial(_send_letter_to_dvla, app, client, s3_client), letters))
+
+    _record_letter_batch_outcomes(outcomes)
+
+
+def _get_letter_to_send(notification):
+    bucket_name, prefix = get_bucket_name_and_prefix_for_notification(notification)
+    return {
+        "notification_id": notification.id,
+        "bucket_name": bucket_name,
+        "prefix": prefix,
+        "send_letter_kwargs": {
+            "notification_id": str(notification.id),
+            "reference": str(notification.reference),
+            "address": PostalAddress(notification.to, allow_international_letters=True),
+            "postage": notification.postage,
+            "service_id": str(notification.service_id),
+            "organisation_id": str(notification.service.organisation_id),
+            "callback_url": _get_callback_url(notification.id),
+        },
+    }
+
+
+def _send_letter_to_dvla(app, client, s3_client, letter):
+    notification_id = letter["notification_id"]
+    with app.app_context():
+        try:
+            file_bytes = get_letter_pdf_from_s3(s3_client, letter["bucket_name"], letter["prefix"])
+        except (BotoClientError, LetterPDFNotFound):
+            current_app.logger.exception("Error getting letter from bucket for notification %s", notification_id)
+            return notification_id, _FAILED
+
+        try:
+            client.send_letter(pdf_file=file_bytes, **letter["send_letter_kwargs"])
+        except DvlaRetryableException:
+            current_app.logger.warning("Letter notification %s failed, sending individually", notification_id)
+            return notification_id, _RETRY
+        except DvlaDuplicatePrintRequestException:
+            current_app.logger.warning("Duplicate print request for notification %s", notification_id)
+        except Exception:
+            current_app.logger.exception("Error when sending letter notification %s", notification_id)
+            return notification_id, _FAILED
+
+    return notification_id, _SENT
+
+
+def _record_letter_batch_outcomes(outcomes):
+    notification_ids_by_outcome = defaultdict(list)
+    for notification_id, outcome in outcomes:
+        notification_ids_by_outcome[outcome].append(notification_id)
+
+    provider = get_provider_details_by_notification_type(LETTER_TYPE)[0]
+    notifications_dao.dao_update_notification_statuses_by_id(
+        NOTIFICATION_SENDING,
+        [(notification_id, provider.identifier) for notification_id in notification_ids_by_outcome[_SENT]],
+        sent_at=datetime.utcnow(),
+    )
+    notifications_dao.dao_update_notification_statuses_by_id(
+        NOTIFICATION_TECHNICAL_FAILURE,
+        [(notification_id, None) for notification_id in notification_ids_by_outcome[_FAILED]],
+    )
+
+    with notify_celery.producer_or_acquire() as producer:
+        for notification_id in notification_ids_by_outcome[_RETRY]:
+            deliver_letter.apply_async(
+                kwargs={"notification_id": str(notification_id)}, queue=QueueNames.SEND_LETTER, producer=producer
+            )
+
+
 def update_letter_to_sending(notification):
     provider = get_provider_details_by_notification_type(LETTER_TYPE)[0]
 
@@ -10,12 +10,17 @@ from app.constants import EMAIL_TYPE, LETTER_TYPE, SMS_TYPE, CacheKeys
 from app.cronitor import cronitor
 from app.dao.fact_billing_dao import (
     fetch_billing_data_for_day,
+    fetch_service_ids_with_billing_changes_since,
     update_ft_billing,
     update_ft_billing_letter_despatch,
 )
 from app.dao.fact_notification_status_dao import update_fact_notification_status
 from app.dao.notifications_dao import get_service_ids_with_notifications_on_date
 
+# notifications updated in a transaction that was still open when update-ft-billing-for-today last ran could have an
+# updated_at a little before then, so look back a bit further than the last run
+INCREMENTAL_FT_BILLING_OVERLAP = timedelta(minutes=5)
+
 
 @notify_celery.task(name="create-nightly-billing")
 @cronitor("create-nightly-billing")
@@ -58,10 +63,41 @@ def create_nightly_billing(
 @cronitor("update-ft-billing-for-today")
 def update_ft_billing_for_today():
     process_day = convert_utc_to_bst(datetime.utcnow()).date().isoformat()
-    create_or_update_ft_billing_for_day(process_day=process_day)
+    if current_app.config["INCREMENTAL_FT_BILLING_ENABLED"]:
+        update_ft_billing_for_day_incrementally(process_day)
+    else:
+        create_or_update_ft_billing_for_day(process_day=process_day)
     redis_store.set(CacheKeys.FT_BILLING_FOR_TODAY_UPDATED_AT_UTC_ISOFORMAT, datetime.now(tz=pytz.utc).isoformat())
 
 
+def update_ft_billing_for_day_incrementally(process_day: str):
+    """
+    Aggregates ft_billing again only for the services with notifications created or updated since the last run for
+    this day, rather than for every service. Each of those services' rows for the day is recomputed in full, so a
+    notification moving between billable and non-billable statuses is still counted correctly.
+
+    The first run for a day has nothing to go on, so it aggregates every service.
+    """
+    process_date = datetime.strptime(process_day, "%Y-%m-%d").date()
+    cache_key = CacheKeys.FT_BILLING_FOR_DAY_AGGREGATED_UP_TO_UTC_ISOFORMAT.format(process_day)
+    # naive utc, to compare with notification timestamps
+    started_at = datetime.utcnow()
+
+    if aggregated_up_to := redis_store.get(cache_key):
+        since = datetime.fromisoformat(aggregated_up_to.decode()) - INCREMENTAL_FT_BILLING_OVERLAP
+        service_ids = fetch_service_ids_with_billing_changes_since(process_date, since)
+        current_app.logger.info(
+            "update-ft-billing-for-today for %s: %s service(s) changed since %s", process_date, len(service_ids), since
+        )
+        if service_ids:
+            billing_data = fetch_billing_data_for_day(process_day=process_date, service_ids=service_ids)
+            update_ft_billing(billing_data, process_date)
+    else:
+        create_or_update_ft_billing_for_day(process_day=process_day)
+
+    redis_store.set(cache_key, started_at.isoformat(), ex=int(timedelta(days=2).total_seconds()))
+
+
 @notify_celery.task(name="create-or-update-ft-billing-for-day")
 def create_or_update_ft_billing_for_day(process_day: str):
     process_date = datetime.strptime(process_day, "%Y-%m-%d").date()
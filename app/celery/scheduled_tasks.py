@@ -23,7 +23,7 @@ from app.aws import s3
 from app.celery.letters_pdf_tasks import get_pdf_for_templated_letter
 from app.celery.tasks import (
     get_id_task_args_kwargs_for_job_row,
-    get_recipient_csv_and_template_and_sender_id,
+    get_job_rows_and_template_and_sender_id,
     process_incomplete_jobs,
     process_job,
     process_job_row,
@@ -51,6 +51,7 @@ from app.dao.invited_user_dao import (
     delete_invitations_created_more_than_two_days_ago,
 )
 from app.dao.jobs_dao import (
+    dao_get_finished_jobs_to_check_for_missing_rows,
     dao_set_scheduled_jobs_to_pending,
     dao_update_job,
     find_jobs_with_missing_rows,
@@ -58,6 +59,7 @@ from app.dao.jobs_dao import (
 )
 from app.dao.notifications_dao import (
     SlowProviderDeliveryReport,
+    dao_get_notification_count_for_job_id,
     dao_old_letters_with_created_status,
     dao_precompiled_letters_still_pending_virus_check,
     get_slow_text_message_delivery_reports_by_provider,
@@ -76,6 +78,7 @@ from app.dao.services_dao import (
 )
 from app.dao.templates_dao import dao_get_template_by_id
 from app.dao.users_dao import delete_codes_older_created_more_than_a_day_ago, get_users_for_research
+from app.job.created_rows import get_job_rows_not_created, job_created_rows_enabled
 from app.letters.utils import generate_letter_pdf_filename
 from app.models import (
     AnnualBilling,
@@ -393,23 +396,55 @@ def check_if_letters_still_in_created():
 
 @notify_celery.task(name="check-for-missing-rows-in-completed-jobs")
 def check_for_missing_rows_in_completed_jobs():
-    jobs_missing, jobs_nomissing = find_jobs_with_missing_rows()
+    if job_created_rows_enabled():
+        jobs_missing, jobs_nomissing = _find_jobs_with_missing_rows_from_bitmaps()
+    else:
+        jobs_missing, jobs_nomissing = find_jobs_with_missing_rows()
 
     for job in jobs_nomissing:
         job.job_status = JOB_STATUS_FINISHED_ALL_NOTIFICATIONS_CREATED
         dao_update_job(job)
 
     for job in jobs_missing:
-        recipient_csv, template, sender_id = get_recipient_csv_and_template_and_sender_id(job)
-        missing_rows = find_missing_row_for_job(job.id, job.notification_count)
-        for row_to_process in missing_rows:
-            row = recipient_csv[row_to_process.missing_row]
+        # a row missing from a job's bitmap might still have a notification (eg if redis was unavailable when it
+        # was saved), so the rows to send again always come from the job's notifications
+        missing_row_numbers = {row.missing_row for row in find_missing_row_for_job(job.id, job.notification_count)}
+        if not missing_row_numbers:
+            # the bitmap was missing rows that were created after all, so there's nothing left to check it for
+            job.job_status = JOB_STATUS_FINISHED_ALL_NOTIFICATIONS_CREATED
+            dao_update_job(job)
+            continue
+
+        rows, template, sender_id = get_job_rows_and_template_and_sender_id(job, start_row=min(missing_row_numbers))
+        for row in rows:
+            if row.index not in missing_row_numbers:
+                continue
+
             _, task_args_kwargs = get_id_task_args_kwargs_for_job_row(
                 row, template, job, job.service, sender_id=sender_id
             )
-            current_app.logger.info("Processing missing row: %s for job: %s", row_to_process.missing_row, job.id)
+            current_app.logger.info("Processing missing row: %s for job: %s", row.index, job.id)
             process_job_row(template.template_type, task_args_kwargs)
 
+            missing_row_numbers.discard(row.index)
+            if not missing_row_numbers:
+                break
+
+
+def _find_jobs_with_missing_rows_from_bitmaps():
+    jobs_missing, jobs_nomissing = [], []
+    for job in dao_get_finished_jobs_to_check_for_missing_rows():
+        rows_not_created = get_job_rows_not_created(job.id, job.notification_count)
+        if rows_not_created is None:
+            # no bitmap for this job, so count its notifications instead
+            has_all_notifications = dao_get_notification_count_for_job_id(job_id=job.id) == job.notification_count
+        else:
+            has_all_notifications = not rows_not_created
+
+        (jobs_nomissing if has_all_notifications else jobs_missing).append(job)
+
+    return jobs_missing, jobs_nomissing
+
 
 @notify_celery.task(name="check-for-services-with-high-failure-rates-or-sending-to-tv-numbers")
 def check_for_services_with_high_failure_rates_or_sending_to_tv_numbers():
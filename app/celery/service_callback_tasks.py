@@ -7,6 +7,7 @@ from urllib.parse import urlparse
 import requests
 from flask import current_app
 from notifications_utils.local_vars import LazyLocalGetter
+from requests.adapters import HTTPAdapter
 from werkzeug.local import LocalProxy
 
 from app import memo_resetters, notify_celery, signing
@@ -14,17 +15,48 @@ from app.config import QueueNames
 from app.dao.inbound_sms_dao import dao_get_inbound_sms_by_id
 from app.dao.returned_letters_dao import fetch_returned_letter_callback_data_dao
 from app.dao.service_callback_api_dao import get_service_callback_api_by_callback_type
+from app.notifications.service_callbacks_buffer import (
+    acquire_service_callback_slot,
+    buffer_delivery_status_callback,
+    get_service_callbacks_buffer_keys,
+    pop_buffered_delivery_status_callbacks,
+    release_service_callback_slot,
+    return_delivery_status_callbacks_to_buffer,
+    service_callbacks_buffer_enabled,
+    service_callbacks_buffer_key,
+)
 from app.utils import DATETIME_FORMAT
 
+# how many callback hosts to keep a pool of connections for. urllib3 keeps a pool per host and client certificate, so
+# this needs to be big enough that connections to busy hosts aren't dropped (and their TLS sessions with them) to make
+# room for others
+SERVICE_CALLBACK_CONNECTION_POOLS = 100
+
+# the most delivery status callbacks to send to an endpoint in one request, when they're sent in batches
+SERVICE_CALLBACK_BATCH_SIZE = 100
+
+
+def _create_requests_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=SERVICE_CALLBACK_CONNECTION_POOLS))
+    session.mount("http://", HTTPAdapter(pool_connections=SERVICE_CALLBACK_CONNECTION_POOLS))
+    return session
+
+
 # thread-local copies of persistent requests.Session
 _requests_session_context_var: ContextVar[requests.Session] = ContextVar("service_callback_requests_session")
 get_requests_session: LazyLocalGetter[requests.Session] = LazyLocalGetter(
     _requests_session_context_var,
-    lambda: requests.Session(),
+    _create_requests_session,
 )
 memo_resetters.append(lambda: get_requests_session.clear())
 requests_session = LocalProxy(get_requests_session)
 
+# client certificate paths by host, or None for hosts without one. The certificates are deployed with the app, so this
+# saves checking the filesystem for every callback
+_client_certificate_paths: dict[str, str | None] = {}
+memo_resetters.append(lambda: _client_certificate_paths.clear())
+
 
 @notify_celery.task(bind=True, name="send-returned-letter", max_retries=5, default_retry_delay=300)
 def send_returned_letter_to_service(self, encoded_returned_letter):
@@ -58,7 +90,67 @@ def send_returned_letter_to_service(self, encoded_returned_letter):
 def send_delivery_status_to_service(self, notification_id, encoded_status_update):
     status_update = signing.decode(encoded_status_update)
 
-    data = {
+    data = _create_delivery_status_callback_payload(notification_id, status_update)
+
+    _send_data_to_service_callback_api(
+        self,
+        data,
+        status_update["service_callback_api_url"],
+        status_update["service_callback_api_bearer_token"],
+        "send_delivery_status_to_service",
+    )
+
+
+@notify_celery.task(name="send-buffered-delivery-status-callbacks")
+def send_buffered_delivery_status_callbacks():
+    """
+    Queues the delivery status callbacks buffered since the last run, in batches of up to SERVICE_CALLBACK_BATCH_SIZE
+    to the same url and bearer token.
+    """
+    if not current_app.config["REDIS_ENABLED"]:
+        return
+
+    for buffer_key in get_service_callbacks_buffer_keys():
+        while encoded_status_updates := pop_buffered_delivery_status_callbacks(buffer_key, SERVICE_CALLBACK_BATCH_SIZE):
+            send_delivery_statuses_to_service.apply_async([encoded_status_updates], queue=QueueNames.CALLBACKS)
+
+            if len(encoded_status_updates) < SERVICE_CALLBACK_BATCH_SIZE:
+                break
+
+
+@notify_celery.task(
+    bind=True, name="send-delivery-statuses", max_retries=5, default_retry_delay=300, early_log_level=logging.DEBUG
+)
+def send_delivery_statuses_to_service(self, encoded_status_updates):
+    """
+    Sends a batch of delivery status callbacks for the same url and bearer token as one JSON array.
+
+    Only SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT batches are sent to an endpoint at once. If there are already
+    that many in flight, the batch goes back in the buffer for the next send-buffered-delivery-status-callbacks
+    rather than holding on to a worker while it waits. It goes back at the front, so it's still sent before anything
+    buffered after it.
+    """
+    status_updates = [signing.decode(encoded_status_update) for encoded_status_update in encoded_status_updates]
+    service_callback_url = status_updates[0]["service_callback_api_url"]
+    token = status_updates[0]["service_callback_api_bearer_token"]
+    buffer_key = service_callbacks_buffer_key(service_callback_url, token)
+
+    if not (slot_key := acquire_service_callback_slot(buffer_key)):
+        return_delivery_status_callbacks_to_buffer(buffer_key, encoded_status_updates)
+        return
+
+    try:
+        data = [
+            _create_delivery_status_callback_payload(status_update["notification_id"], status_update)
+            for status_update in status_updates
+        ]
+        _send_data_to_service_callback_api(self, data, service_callback_url, token, "send_delivery_statuses_to_service")
+    finally:
+        release_service_callback_slot(slot_key)
+
+
+def _create_delivery_status_callback_payload(notification_id, status_update):
+    return {
         "id": str(notification_id),
         "reference": status_update["notification_client_reference"],
         "to": status_update["notification_to"],
@@ -71,14 +163,6 @@ def send_delivery_status_to_service(self, notification_id, encoded_status_update
         "template_version": status_update["template_version"],
     }
 
-    _send_data_to_service_callback_api(
-        self,
-        data,
-        status_update["service_callback_api_url"],
-        status_update["service_callback_api_bearer_token"],
-        "send_delivery_status_to_service",
-    )
-
 
 @notify_celery.task(bind=True, name="send-complaint", max_retries=5, default_retry_delay=300)
 def send_complaint_to_service(self, complaint_data):
@@ -125,7 +209,10 @@ def send_inbound_sms_to_service(self, inbound_sms_id, service_id):
 
 
 def _send_data_to_service_callback_api(self, data, service_callback_url, token, function_name):
-    object_id = data["notification_id"] if "notification_id" in data else data["id"]
+    if isinstance(data, list):
+        object_id = f"{len(data)} delivery statuses"
+    else:
+        object_id = data["notification_id"] if "notification_id" in data else data["id"]
     try:
         request_kwargs = {
             "method": "POST",
@@ -136,14 +223,7 @@ def _send_data_to_service_callback_api(self, data, service_callback_url, token,
         }
 
         ### [NotifyNL] #################################################################################################
-        certificate_name = f"{urlparse(service_callback_url).hostname.replace('.', '-')}.pem"
-        certificate_path = f"{current_app.config.get('SSL_CERT_DIR')}/{certificate_name}"
-
-        if os.path.exists(certificate_path):
-            current_app.logger.info(
-                "Certificate [%s] found for [%s], using as client certificate.", certificate_name, service_callback_url
-            )
-
+        if certificate_path := _get_client_certificate_path(service_callback_url):
             request_kwargs["cert"] = certificate_path
         ################################################################################################################
 
@@ -185,6 +265,43 @@ def _send_data_to_service_callback_api(self, data, service_callback_url, token,
             )
 
 
+def _get_client_certificate_path(service_callback_url):
+    hostname = urlparse(service_callback_url).hostname
+    if hostname not in _client_certificate_paths:
+        certificate_name = f"{hostname.replace('.', '-')}.pem"
+        certificate_path = f"{current_app.config.get('SSL_CERT_DIR')}/{certificate_name}"
+
+        if os.path.exists(certificate_path):
+            current_app.logger.info(
+                "Certificate [%s] found for [%s], using as client certificate.", certificate_name, service_callback_url
+            )
+            _client_certificate_paths[hostname] = certificate_path
+        else:
+            _client_certificate_paths[hostname] = None
+
+    return _client_certificate_paths[hostname]
+
+
+def queue_delivery_status_callback(notification_id, encoded_status_update, service_callback_api, producer=None):
+    """
+    Queues send-delivery-status for the notification or, if the callback api has opted in to batch_callbacks, buffers
+    it to be sent along with the others to the same endpoint by send-buffered-delivery-status-callbacks. Pass a
+    producer to queue a lot of callbacks over the same connection to the broker.
+    """
+    if service_callbacks_buffer_enabled(service_callback_api):
+        try:
+            buffer_delivery_status_callback(service_callback_api, encoded_status_update)
+            return
+        except Exception:
+            current_app.logger.exception(
+                "Failed to buffer delivery status callback for notification %s", notification_id
+            )
+
+    send_delivery_status_to_service.apply_async(
+        [str(notification_id), encoded_status_update], queue=QueueNames.CALLBACKS, producer=producer
+    )
+
+
 def create_delivery_status_callback_data(notification, service_callback_api):
     data = {
         "notification_id": str(notification.id),
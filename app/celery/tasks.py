@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from collections.abc import Sequence
 from datetime import datetime
 
@@ -8,6 +9,7 @@ from notifications_utils.insensitive_dict import InsensitiveDict
 from notifications_utils.recipient_validation.errors import InvalidPhoneError
 from notifications_utils.recipient_validation.notifynl.postal_address import PostalAddress
 from notifications_utils.recipients import RecipientCSV
+from notifications_utils.template import SMSMessageTemplate
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import create_random_identifier, create_uuid, notify_celery, signing
@@ -44,7 +46,12 @@ from app.dao.service_callback_api_dao import get_returned_letter_callback_api_fo
 from app.dao.service_email_reply_to_dao import dao_get_reply_to_by_id
 from app.dao.service_sms_sender_dao import dao_get_service_sms_senders_by_id
 from app.dao.templates_dao import dao_get_template_by_id
-from app.notifications.process_notifications import persist_notification
+from app.job.recipient_csv_stream import StreamingRecipientCSV, UnstreamableJobFile
+from app.notifications.process_notifications import (
+    build_notification,
+    persist_notification,
+    persist_notifications_in_bulk,
+)
 from app.notifications.validators import (
     check_service_over_daily_message_limit,
     validate_and_format_recipient,
@@ -94,11 +101,11 @@ def process_job(job_id, sender_id=None, shatter_batch_size=DEFAULT_SHATTER_JOB_R
     if __sending_limits_for_job_exceeded(service, job, job_id):
         return
 
-    recipient_csv, template, sender_id = get_recipient_csv_and_template_and_sender_id(job)
+    rows, template, sender_id = get_job_rows_and_template_and_sender_id(job)
 
     current_app.logger.info("Starting job %s processing %s notifications", job_id, job.notification_count)
 
-    for shatter_batch in batched(recipient_csv.get_rows(), n=shatter_batch_size):
+    for shatter_batch in batched(rows, n=shatter_batch_size):
         batch_args_kwargs = [
             get_id_task_args_kwargs_for_job_row(row, template, job, service, sender_id=sender_id)[1]
             for row in shatter_batch
@@ -148,6 +155,10 @@ def shatter_job_rows(
     template_type: str,
     args_kwargs_seq: Sequence,
 ):
+    if current_app.config["BATCH_SAVE_JOB_ROWS_ENABLED"] and template_type in {SMS_TYPE, EMAIL_TYPE}:
+        save_job_rows.apply_async((template_type, args_kwargs_seq), queue=QueueNames.DATABASE)
+        return
+
     for task_args_kwargs in args_kwargs_seq:
         process_job_row(template_type, task_args_kwargs)
 
@@ -194,6 +205,25 @@ def get_recipient_csv_and_template_and_sender_id(job):
     return recipient_csv, template, meta_data.get("sender_id")
 
 
+def get_job_rows_and_template_and_sender_id(job, start_row=0):
+    """
+    Returns an iterator over the job's rows from `start_row` onwards. If STREAM_JOB_FILES_FROM_S3 is set the file is
+    read from S3 in chunks as the rows are consumed, rather than all at once.
+    """
+    if current_app.config["STREAM_JOB_FILES_FROM_S3"]:
+        template = dao_get_template_by_id(job.template_id, job.template_version)._as_utils_template()
+        try:
+            recipient_csv = StreamingRecipientCSV(service_id=str(job.service_id), job_id=str(job.id), template=template)
+        except UnstreamableJobFile:
+            current_app.logger.warning("Job %s file can't be streamed, reading the whole file instead", job.id)
+        else:
+            return recipient_csv.get_rows(start_row=start_row), template, recipient_csv.metadata.get("sender_id")
+
+    recipient_csv, template, sender_id = get_recipient_csv_and_template_and_sender_id(job)
+
+    return (row for row in recipient_csv.get_rows() if row.index >= start_row), template, sender_id
+
+
 def get_id_task_args_kwargs_for_job_row(row, template, job, service, sender_id=None):
     encoded = signing.encode(
         {
@@ -247,6 +277,34 @@ def __sending_limits_for_job_exceeded(service, job, job_id):
     return False
 
 
+def _get_sms_recipient_data_and_extra_args(to, service):
+    try:
+        recipient_data = validate_and_format_recipient(
+            send_to=to,
+            key_type=KEY_TYPE_NORMAL,
+            service=service,
+            notification_type=SMS_TYPE,
+            check_intl_sms_limit=False,
+        )
+        extra_args = {}
+
+    except InvalidPhoneError:
+        recipient_data = {
+            "unformatted_recipient": to,
+            "normalised_to": to,
+            "international": False,
+            "phone_prefix": "+44",
+            "rate_multiplier": 0,
+        }
+        extra_args = {
+            "status": NOTIFICATION_VALIDATION_FAILED,
+            "billable_units": 0,
+            "updated_at": datetime.utcnow(),
+        }
+
+    return recipient_data, extra_args
+
+
 @notify_celery.task(bind=True, name="save-sms", max_retries=5, default_retry_delay=300)
 def save_sms(
     self,
@@ -272,29 +330,7 @@ def save_sms(
         current_app.logger.debug("SMS %s failed as restricted service", notification_id)
         return
 
-    try:
-        recipient_data = validate_and_format_recipient(
-            send_to=notification["to"],
-            key_type=KEY_TYPE_NORMAL,
-            service=service,
-            notification_type=SMS_TYPE,
-            check_intl_sms_limit=False,
-        )
-        extra_args = {}
-
-    except InvalidPhoneError:
-        recipient_data = {
-            "unformatted_recipient": notification["to"],
-            "normalised_to": notification["to"],
-            "international": False,
-            "phone_prefix": "+44",
-            "rate_multiplier": 0,
-        }
-        extra_args = {
-            "status": NOTIFICATION_VALIDATION_FAILED,
-            "billable_units": 0,
-            "updated_at": datetime.utcnow(),
-        }
+    recipient_data, extra_args = _get_sms_recipient_data_and_extra_args(notification["to"], service)
 
     try:
         saved_notification = persist_notification(
@@ -443,6 +479,138 @@ def save_letter(
         handle_exception(self, notification, notification_id, e)
 
 
+@notify_celery.task(bind=True, name="save-job-rows", max_retries=5, default_retry_delay=300)
+def save_job_rows(
+    self,
+    template_type: str,
+    args_kwargs_seq: Sequence,
+):
+    """
+    Batched equivalent of save_sms/save_email for a whole shatter batch of job rows. All rows in a batch come from
+    the same job, so they share a service, template and sender. The notifications are persisted with a single
+    multi-row insert and their deliver tasks are sent over one broker connection.
+    """
+    (service_id, _, _), task_kwargs = args_kwargs_seq[0]
+    sender_id = task_kwargs.get("sender_id")
+
+    rows = [
+        (notification_id, signing.decode(encoded_notification))
+        for (_, notification_id, encoded_notification), _ in args_kwargs_seq
+    ]
+
+    service = SerialisedService.from_id(service_id)
+    template = SerialisedTemplate.from_id_and_service_id(
+        rows[0][1]["template"],
+        service_id=service.id,
+        version=rows[0][1]["template_version"],
+    )
+
+    if template_type == SMS_TYPE:
+        reply_to_text = (
+            dao_get_service_sms_senders_by_id(service_id, sender_id).sms_sender if sender_id else template.reply_to_text
+        )
+    else:
+        reply_to_text = (
+            dao_get_reply_to_by_id(reply_to_id=sender_id, service_id=service_id).email_address
+            if sender_id
+            else template.reply_to_text
+        )
+
+    notifications = []
+    for notification_id, notification in rows:
+        if not service_allowed_to_send_to(notification["to"], service, KEY_TYPE_NORMAL):
+            current_app.logger.debug("%s %s failed as restricted service", template_type, notification_id)
+            continue
+
+        if template_type == SMS_TYPE:
+            recipient, extra_args = _get_sms_recipient_data_and_extra_args(notification["to"], service)
+        else:
+            recipient, extra_args = notification["to"], {}
+
+        notifications.append(
+            build_notification(
+                template_id=notification["template"],
+                template_version=notification["template_version"],
+                recipient=recipient,
+                service=service,
+                personalisation=notification.get("personalisation"),
+                notification_type=template_type,
+                api_key_id=None,
+                key_type=KEY_TYPE_NORMAL,
+                created_at=datetime.utcnow(),
+                job_id=notification.get("job", None),
+                job_row_number=notification.get("row_number", None),
+                notification_id=notification_id,
+                reply_to_text=reply_to_text,
+                client_reference=notification.get("client_reference", None),
+                **extra_args,
+            )
+        )
+
+    try:
+        saved_notifications = persist_notifications_in_bulk(notifications, service, KEY_TYPE_NORMAL)
+    except SQLAlchemyError as e:
+        # the insert skips rows that already exist, so retrying the whole batch is safe
+        retry_msg = f"save-job-rows for job {rows[0][1].get('job', None)} with {len(rows)} rows"
+        current_app.logger.exception("Retry %s", retry_msg)
+        try:
+            self.retry(queue=QueueNames.RETRY, exc=e)
+        except self.MaxRetriesExceededError:
+            current_app.logger.error("Max retry failed %s", retry_msg)
+        return
+
+    _deliver_job_row_notifications(
+        template_type,
+        [n for n in saved_notifications if n.status != NOTIFICATION_VALIDATION_FAILED],
+        service,
+        template,
+    )
+
+    current_app.logger.info(
+        "Saved %s of %s %s notifications for job %s",
+        len(saved_notifications),
+        len(rows),
+        template_type,
+        rows[0][1].get("job", None),
+    )
+
+
+def _deliver_job_row_notifications(template_type, notifications, service, template):
+    if template_type == SMS_TYPE:
+        deliver_task, deliver_queue = provider_tasks.deliver_sms, QueueNames.SEND_SMS
+    else:
+        deliver_task, deliver_queue = provider_tasks.deliver_email, QueueNames.SEND_EMAIL
+
+    with notify_celery.producer_or_acquire() as producer:
+        if template_type == SMS_TYPE and current_app.config["BATCH_DELIVER_SMS_ENABLED"]:
+            for notification_ids in _group_sms_by_content(notifications, service, template):
+                if len(notification_ids) > 1:
+                    provider_tasks.deliver_sms_batch.apply_async(
+                        [notification_ids], queue=QueueNames.SEND_SMS, producer=producer
+                    )
+                else:
+                    deliver_task.apply_async(notification_ids, queue=deliver_queue, producer=producer)
+        else:
+            for notification in notifications:
+                deliver_task.apply_async([str(notification.id)], queue=deliver_queue, producer=producer)
+
+
+def _group_sms_by_content(notifications, service, template):
+    groups = defaultdict(list)
+    for notification in notifications:
+        content = str(
+            SMSMessageTemplate(
+                template.__dict__,
+                values=notification.personalisation,
+                prefix=service.name,
+                show_prefix=service.prefix_sms,
+            )
+        )
+        groups[(content, notification.international)].append(str(notification.id))
+
+    return list(groups.values())
+
+
 def handle_exception(task, notification, notification_id, exc):
     if not get_notification_by_id(notification_id):
         retry_msg = "{task} notification for job {job} row number {row} and notification id {noti}".format(
@@ -492,12 +660,9 @@ def process_incomplete_job(job_id, shatter_batch_size=DEFAULT_SHATTER_JOB_ROWS_B
 
     current_app.logger.info("Resuming job %s from row %s", job_id, resume_from_row)
 
-    recipient_csv, template, sender_id = get_recipient_csv_and_template_and_sender_id(job)
+    rows, template, sender_id = get_job_rows_and_template_and_sender_id(job, start_row=resume_from_row + 1)
 
-    for shatter_batch in batched(
-        (row for row in recipient_csv.get_rows() if row.index > resume_from_row),
-        n=shatter_batch_size,
-    ):
+    for shatter_batch in batched(rows, n=shatter_batch_size):
         batch_args_kwargs = [
             get_id_task_args_kwargs_for_job_row(row, template, job, job.service, sender_id=sender_id)[1]
             for row in shatter_batch
@@ -2,6 +2,7 @@ import base64
 import contextlib
 import secrets
 import string
+import threading
 import time
 from collections.abc import Callable
 from typing import Literal
@@ -66,21 +67,24 @@ class SSMParameter:
         self.key = key
         self.ssm_client = ssm_client
         self._value = None
+        self._lock = threading.Lock()
 
     def get(self):
-        if self._value is not None:
+        with self._lock:
+            if self._value is None:
+                self._value = self.ssm_client.get_parameter(Name=self.key, WithDecryption=True)["Parameter"]["Value"]
             return self._value
-        self._value = self.ssm_client.get_parameter(Name=self.key, WithDecryption=True)["Parameter"]["Value"]
-        return self._value
 
     def set(self, value):
-        # this errors if the parameter doesn't exist yet in SSM as we haven't supplied a `Type`
-        # this is fine for our purposes, as we'll always want to pre-seed this data.
-        self.ssm_client.put_parameter(Name=self.key, Value=value, Overwrite=True)
-        self._value = value
+        with self._lock:
+            # this errors if the parameter doesn't exist yet in SSM as we haven't supplied a `Type`
+            # this is fine for our purposes, as we'll always want to pre-seed this data.
+            self.ssm_client.put_parameter(Name=self.key, Value=value, Overwrite=True)
+            self._value = value
 
     def clear(self):
-        self._value = None
+        with self._lock:
+            self._value = None
 
 
 class _SpecifiedCiphersAdapter(HTTPAdapter):
@@ -106,7 +110,8 @@ class DVLAClient:
     """
     DVLA HTTP API letter client.
 
-    This class is not thread-safe.
+    Threads can share a client (and its session): the JWT and the SSM parameters are each refreshed under a lock, so
+    only one thread fetches a new one at a time.
     """
 
     name = "dvla"
@@ -127,17 +132,19 @@ class DVLAClient:
 
         self.session = requests.Session()
         self.session.mount(self.base_url, _SpecifiedCiphersAdapter(ciphers=self.ciphers))
+        self._jwt_lock = threading.Lock()
 
     @property
     def jwt_token(self):
         # if the jwt is about to expire, just reset it ourselves to avoid unnecessary 401s
         buffer = 60
-        if not self._jwt_token or time.time() + buffer >= self._jwt_expires_at:
-            self._jwt_token = self.authenticate()
-            jwt_dict = jwt.decode(self._jwt_token, options={"verify_signature": False})
-            self._jwt_expires_at = jwt_dict["exp"]
+        with self._jwt_lock:
+            if not self._jwt_token or time.time() + buffer >= self._jwt_expires_at:
+                self._jwt_token = self.authenticate()
+                jwt_dict = jwt.decode(self._jwt_token, options={"verify_signature": False})
+                self._jwt_expires_at = jwt_dict["exp"]
 
-        return self._jwt_token
+            return self._jwt_token
 
     def authenticate(self):
         """
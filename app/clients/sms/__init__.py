@@ -26,6 +26,10 @@ class SmsClient(Client):
     Base Sms client for sending smss.
     """
 
+    # whether the provider can send the same content to many recipients in one request, see send_sms_batch. Clients
+    # that can implement try_send_sms_batch
+    supports_batch_sms = False
+
     def __init__(self, current_app, statsd_client):
         super().__init__()
         self.current_app = current_app
@@ -81,6 +85,34 @@ class SmsClient(Client):
 
         return response
 
+    def send_sms_batch(self, recipients, content, reference, sender):
+        start_time = monotonic()
+
+        try:
+            response = self.try_send_sms_batch(recipients, content, reference, sender)
+            self.record_outcome(True)
+        except SmsClientResponseException as e:
+            self.record_outcome(False)
+            raise e
+        finally:
+            elapsed_time = monotonic() - start_time
+            self.statsd_client.timing(f"clients.{self.name}.batch-request-time", elapsed_time)
+            self.current_app.logger.info(
+                "%s batch request for %s with %s recipients finished in %s",
+                self.name,
+                reference,
+                len(recipients),
+                elapsed_time,
+                extra={
+                    "provider_name": self.name,
+                    "reference": reference,
+                    "recipient_count": len(recipients),
+                    "elapsed_time": elapsed_time,
+                },
+            )
+
+        return response
+
     @abstractmethod
     def try_send_sms(self):
         pass
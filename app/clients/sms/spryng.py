@@ -1,7 +1,7 @@
 import json
 import logging
 
-from requests import RequestException, request
+from requests import RequestException
 
 from app.clients.sms import SmsClient, SmsClientResponseException
 
@@ -35,6 +35,9 @@ class SpryngClient(SmsClient):
     """
 
     name = "spryng"
+    supports_batch_sms = True
+    # the most recipients Spryng accepts in a single message request
+    max_batch_size = 1000
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -43,9 +46,19 @@ class SpryngClient(SmsClient):
         self.receipt_url = self.current_app.config.get("SPRYNG_RECEIPT_URL")
 
     def try_send_sms(self, to, content, reference, international, sender):
+        return self._post_message([to], content, reference, sender)
+
+    def try_send_sms_batch(self, recipients, content, reference, sender):
+        """
+        Sends the same content to all recipients in one request. Spryng sends a delivery receipt per recipient,
+        each with the shared reference and the recipient's number.
+        """
+        return self._post_message(recipients, content, reference, sender)
+
+    def _post_message(self, recipients, content, reference, sender):
         data = {
             "originator": sender,
-            "recipients": [to.replace("+", "")],
+            "recipients": [to.replace("+", "") for to in recipients],
             "body": content,
             "reference": reference,
             "route": "business",
@@ -53,7 +66,7 @@ class SpryngClient(SmsClient):
         }
 
         try:
-            response = request(
+            response = self.requests_session.request(
                 "POST",
                 self.url,
                 data=json.dumps(data),
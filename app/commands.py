@@ -6,6 +6,7 @@ import itertools
 import logging
 import os
 import random
+import statistics
 import uuid
 from datetime import date, datetime, timedelta
 from time import monotonic
@@ -30,7 +31,7 @@ from app.celery.letters_pdf_tasks import (
 )
 from app.celery.tasks import get_id_task_args_kwargs_for_job_row, process_job_row
 from app.config import QueueNames
-from app.constants import KEY_TYPE_TEST, NOTIFICATION_CREATED, SMS_TYPE
+from app.constants import EMAIL_TYPE, KEY_TYPE_TEST, NOTIFICATION_CREATED, SMS_TYPE
 from app.dao.annual_billing_dao import (
     dao_create_or_update_annual_billing_for_year,
     set_default_free_allowance_for_service,
@@ -41,7 +42,10 @@ from app.dao.fact_billing_dao import (
     update_ft_billing,
 )
 from app.dao.jobs_dao import dao_get_job_by_id
-from app.dao.notifications_dao import move_notifications_to_notification_history
+from app.dao.notifications_dao import (
+    get_notifications_by_recipient_or_reference_query,
+    move_notifications_to_notification_history,
+)
 from app.dao.organisation_dao import (
     dao_add_service_to_organisation,
     dao_get_organisation_by_email_address,
@@ -933,7 +937,7 @@ def generate_bulktest_data(user_id):
             notifications_batch.append(
                 Notification(
                     to=f"BULKTEST-{notification_num}@notify.works",
-                    normalised_to=f"BULKTEST-{notification_num}@notify.works",
+                    normalised_to=f"bulktest-{notification_num}@notify.works",
                     job_id=None,
                     job_row_number=None,
                     service_id=random.choice(service_ids),
@@ -974,3 +978,112 @@ def generate_bulktest_data(user_id):
     pprint("Committing...")
     db.session.commit()
     pprint("Finished.")
+
+
+@click.option("-s", "--service-id", required=False, type=click.UUID, help="Defaults to the first BULKTEST service")
+@click.option("-r", "--runs", default=20, show_default=True, type=int, help="Number of times to run each search")
+@notify_command(name="benchmark-recipient-search")
+def benchmark_recipient_search(service_id, runs):
+    """
+    Compares searching a service's notifications for a complete email address, which can use the (service_id,
+    normalised_to) index, with searching for part of one, which relies on the trigram indexes. Run it after
+    generate-bulktest-data, so there's a large table to search.
+    """
+    if os.getenv("NOTIFY_ENVIRONMENT", "") not in ["development", "test"]:
+        current_app.logger.error("Can only be run in development")
+        return
+
+    current_app.logger.setLevel(logging.ERROR)
+
+    if service_id is None:
+        service_id = Service.query.filter(Service.name.like("BULKTEST: %")).order_by(Service.name).first().id
+    # as a string, so the parameters can be passed straight to the driver for the EXPLAIN
+    service_id = str(service_id)
+
+    notification = Notification.query.filter_by(service_id=service_id, notification_type=EMAIL_TYPE).first()
+    if not notification:
+        print(f"Service {service_id} has no email notifications to search for")
+        raise SystemExit(1)
+
+    for description, search_term in (
+        ("complete address", notification.to),
+        ("partial address", notification.to[2:-8]),
+        ("short term", notification.to[:2]),
+    ):
+        query = get_notifications_by_recipient_or_reference_query(
+            service_id, search_term, notification_type=EMAIL_TYPE
+        ).limit(current_app.config["PAGE_SIZE"])
+
+        durations = []
+        for _ in range(runs):
+            start = monotonic()
+            query.all()
+            durations.append(monotonic() - start)
+
+        statement = query.statement.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", statement.params)
+        print(f"{description} ({search_term!r}):")
+        print(f"  median {statistics.median(durations) * 1000:.1f}ms, max {max(durations) * 1000:.1f}ms")
+        for (line,) in plan:
+            print(f"    {line}")
+
+
+@click.option("-s", "--service-id", required=False, type=click.UUID, help="Defaults to the first BULKTEST service")
+@click.option(
+    "-t", "--notification-type", type=click.Choice([EMAIL_TYPE, SMS_TYPE]), default=EMAIL_TYPE, show_default=True
+)
+@click.option("-n", "--count", default=500, show_default=True, type=int, help="Number of notifications to send")
+@click.option("-b", "--baseline", required=False, help="JSON file of results to compare with")
+@click.option("--save-baseline", is_flag=True, help="Save the results to the baseline file rather than comparing")
+@click.option(
+    "--tolerance", default=0.2, show_default=True, type=float, help="How much worse than the baseline is a regression"
+)
+@notify_command(name="benchmark-throughput")
+def benchmark_throughput(service_id, notification_type, count, baseline, save_baseline, tolerance):
+    """
+    Sends notifications through the v2 API and the deliver tasks with the providers stubbed out, followed by SES
+    receipts for emails or the nightly timeout for text messages, and reports notifications/sec, latencies and DB
+    queries per notification for each stage. Exits with an error if any stage has regressed from the baseline.
+    """
+    # imported here, as it pulls in the celery tasks and the v2 API that no other command needs
+    from app.throughput_benchmark import compare_with_baseline, run_throughput_benchmark, serialize_results
+
+    if os.getenv("NOTIFY_ENVIRONMENT", "") not in ["development", "test"]:
+        current_app.logger.error("Can only be run in development")
+        return
+
+    current_app.logger.setLevel(logging.ERROR)
+
+    if service_id is None:
+        service = Service.query.filter(Service.name.like("BULKTEST: %")).order_by(Service.name).first()
+    else:
+        service = Service.query.get(service_id)
+    if not service:
+        print("No service to send notifications from, run generate-bulktest-data first or pass a --service-id")
+        raise SystemExit(1)
+
+    results = run_throughput_benchmark(service, notification_type, count)
+
+    print(f"{'stage':<24}{'notifications':>14}{'per sec':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>10}")
+    for result in results:
+        p50, p95, p99 = result.latency_percentiles()
+        print(
+            f"{result.stage:<24}{result.notifications:>14}{result.notifications_per_second:>10.1f}"
+            f"{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{result.queries_per_notification:>10.2f}"
+        )
+
+    if not baseline:
+        return
+
+    if save_baseline:
+        with open(baseline, "w") as f:
+            json.dump(serialize_results(results), f, indent=2)
+        print(f"Saved baseline to {baseline}")
+        return
+
+    with open(baseline) as f:
+        regressions = compare_with_baseline(results, json.load(f)["stages"], tolerance)
+    for regression in regressions:
+        print(f"Regression in {regression}")
+    if regressions:
+        raise SystemExit(1)
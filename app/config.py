@@ -174,6 +174,12 @@ class Config:
         == "1"
     )
     DATABASE_STATEMENT_TIMEOUT_MS = int(os.getenv("DATABASE_STATEMENT_TIMEOUT_MS", 1_200_000))
+    # log the most repeated statements of any request or task making more than this many, to find N+1 queries.
+    # 0 turns it off. DATABASE_STATEMENT_BUDGETS overrides it for particular url rules or task names
+    DATABASE_STATEMENT_BUDGET = int(os.getenv("DATABASE_STATEMENT_BUDGET", 0))
+    DATABASE_STATEMENT_BUDGETS = {}
+    # also log the plan of the most repeated statement, which takes another round trip to the database
+    DATABASE_STATEMENT_BUDGET_EXPLAIN = os.getenv("DATABASE_STATEMENT_BUDGET_EXPLAIN", "0") == "1"
 
     PAGE_SIZE = 50
     API_PAGE_SIZE = 250
@@ -235,6 +241,8 @@ class Config:
             "app.celery.scheduled_tasks",
             "app.celery.reporting_tasks",
             "app.celery.nightly_tasks",
+            "app.celery.process_delivery_receipts_tasks",
+            "app.celery.service_callback_tasks",
         ],
         # this is overriden by the -Q command, but locally, we should read from all queues
         "task_queues": [Queue(queue, Exchange("default"), routing_key=queue) for queue in QueueNames.all_queues()],
@@ -245,6 +253,18 @@ class Config:
                 "schedule": crontab(minute="0,15,30,45"),
                 "options": {"queue": QueueNames.PERIODIC},
             },
+            # app/celery/process_delivery_receipts_tasks.py
+            "apply-buffered-delivery-receipts": {
+                "task": "apply-buffered-delivery-receipts",
+                "schedule": timedelta(seconds=10),
+                "options": {"queue": QueueNames.PERIODIC},
+            },
+            # app/celery/service_callback_tasks.py
+            "send-buffered-delivery-status-callbacks": {
+                "task": "send-buffered-delivery-status-callbacks",
+                "schedule": timedelta(seconds=5),
+                "options": {"queue": QueueNames.PERIODIC},
+            },
             "delete-verify-codes": {
                 "task": "delete-verify-codes",
                 "schedule": timedelta(minutes=63),
@@ -497,6 +517,37 @@ class Config:
 
     REPORT_REQUEST_NOTIFICATIONS_TIMEOUT_MINUTES = 30
     REPORT_REQUEST_NOTIFICATIONS_CSV_BATCH_SIZE = 2500
+    # split each report's retention window into this many time slices and export them concurrently
+    REPORT_REQUEST_NOTIFICATIONS_SLICES = int(os.environ.get("REPORT_REQUEST_NOTIFICATIONS_SLICES", 1))
+
+    # save each shatter batch of sms/email job rows with one multi-row insert instead of a save task per row
+    BATCH_SAVE_JOB_ROWS_ENABLED = os.environ.get("BATCH_SAVE_JOB_ROWS_ENABLED", "0") == "1"
+    # read job files from S3 in ranged chunks instead of downloading the whole file into memory
+    STREAM_JOB_FILES_FROM_S3 = os.environ.get("STREAM_JOB_FILES_FROM_S3", "0") == "1"
+    # send job sms that render to the same content in one provider request, where the provider supports it
+    BATCH_DELIVER_SMS_ENABLED = os.environ.get("BATCH_DELIVER_SMS_ENABLED", "0") == "1"
+    # buffer sms and SES delivery receipts in redis and apply them in bulk, instead of updating each one on its own
+    BUFFER_DELIVERY_RECEIPTS_ENABLED = os.environ.get("BUFFER_DELIVERY_RECEIPTS_ENABLED", "0") == "1"
+    # hold services, templates and API keys in memory for longer, evicting them when told to over redis pub/sub
+    LONG_LIVED_MODEL_CACHE_ENABLED = os.environ.get("LONG_LIVED_MODEL_CACHE_ENABLED", "0") == "1"
+    # check the api rate limit and daily limits, and count the request against them, in one atomic redis call
+    ATOMIC_SERVICE_LIMITS_ENABLED = os.environ.get("ATOMIC_SERVICE_LIMITS_ENABLED", "0") == "1"
+    # only aggregate ft_billing again for services with notifications changed since update-ft-billing-for-today last ran
+    INCREMENTAL_FT_BILLING_ENABLED = os.environ.get("INCREMENTAL_FT_BILLING_ENABLED", "0") == "1"
+    # keep counts of each job's notifications by status in redis, for the admin to show progress without counting them
+    JOB_STATUS_COUNTS_ENABLED = os.environ.get("JOB_STATUS_COUNTS_ENABLED", "0") == "1"
+    # keep a redis bitmap of which rows of each job have a notification, to find missing rows without counting them
+    JOB_CREATED_ROWS_BITMAP_ENABLED = os.environ.get("JOB_CREATED_ROWS_BITMAP_ENABLED", "0") == "1"
+    # send the print run's letters to DVLA in batches, with several print requests in flight at once per batch
+    BATCH_DELIVER_LETTERS_ENABLED = os.environ.get("BATCH_DELIVER_LETTERS_ENABLED", "0") == "1"
+    # requests' default connection pool for the DVLA session holds 10 connections
+    DVLA_PRINT_REQUEST_CONCURRENCY = int(os.environ.get("DVLA_PRINT_REQUEST_CONCURRENCY", 10))
+    # keep today's notification counts for each service in redis, for the dashboards to read instead of aggregating
+    # the notifications table
+    INTRADAY_SERVICE_STATS_ENABLED = os.environ.get("INTRADAY_SERVICE_STATS_ENABLED", "0") == "1"
+    SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT = int(
+        os.environ.get("SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT", 4)
+    )
 
 
 ######################
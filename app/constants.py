@@ -356,6 +356,8 @@ class Retention:
 # Redis cache keys
 class CacheKeys:
     FT_BILLING_FOR_TODAY_UPDATED_AT_UTC_ISOFORMAT = "update_ft_billing_for_today:updated-at-utc-isoformat"
+    # format with the bst date being aggregated
+    FT_BILLING_FOR_DAY_AGGREGATED_UP_TO_UTC_ISOFORMAT = "update_ft_billing_for_today:{}:aggregated-up-to-utc-isoformat"
     NUMBER_OF_TIMES_OVER_SLOW_SMS_DELIVERY_THRESHOLD = "slow-sms-delivery:number-of-times-over-threshold"
 
 
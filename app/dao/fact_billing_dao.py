@@ -3,7 +3,7 @@ from typing import Any
 
 from flask import current_app
 from notifications_utils.timezones import convert_utc_to_bst
-from sqlalchemy import Date, Integer, and_, desc, func, not_, union
+from sqlalchemy import Date, Integer, and_, desc, func, not_, or_, union
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql.expression import case, literal, tuple_
 
@@ -512,6 +512,30 @@ def fetch_billing_data_for_day(process_day: date, service_ids=None, check_permis
     return billing_data
 
 
+def fetch_service_ids_with_billing_changes_since(process_day: date, since: datetime):
+    """
+    Returns the services with a notification created on process_day that has been created or updated since the given
+    time. Only those services' ft_billing rows for the day can have changed, so only they need aggregating again.
+
+    This only looks at the notifications table, so should only be used for recent days. The created_at and updated_at
+    indexes mean it only reads the notifications that have changed, rather than all of process_day's.
+    """
+    start_date = get_london_midnight_in_utc(process_day)
+    end_date = get_london_midnight_in_utc(process_day + timedelta(days=1))
+
+    query = (
+        db.session.query(Notification.service_id)
+        .filter(
+            Notification.created_at >= start_date,
+            Notification.created_at < end_date,
+            Notification.key_type.in_((KEY_TYPE_NORMAL, KEY_TYPE_TEAM)),
+            or_(Notification.created_at >= since, Notification.updated_at >= since),
+        )
+        .distinct()
+    )
+    return {row.service_id for row in query}
+
+
 def _query_for_billing_data(notification_type, start_date, end_date, service_ids, check_permissions):
     base_query = db.session.query(NotificationAllTimeView).join(
         Service, NotificationAllTimeView.service_id == Service.id
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import Date, case, func
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Date, case, cast, column, func, values
+from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.sql.expression import extract, literal
 from sqlalchemy.types import DateTime, Integer
 
@@ -29,6 +29,7 @@ from app.models import (
     Service,
     Template,
 )
+from app.service.intraday_stats import get_intraday_stats, sum_intraday_stats
 from app.utils import (
     get_london_midnight_in_utc,
     get_london_month_from_utc_column,
@@ -149,24 +150,31 @@ def fetch_notification_status_for_service_for_today_and_7_previous_days(service_
         FactNotificationStatus.key_type != KEY_TYPE_TEST,
     )
 
-    stats_for_today = (
-        db.session.query(
-            Notification.notification_type.cast(db.Text),
-            Notification.status,
-            *([Notification.template_id] if by_template else []),
-            func.count().label("count"),
-        )
-        .filter(
-            Notification.created_at >= get_london_midnight_in_utc(now),
-            Notification.service_id == service_id,
-            Notification.key_type != KEY_TYPE_TEST,
-        )
-        .group_by(
-            Notification.notification_type, *([Notification.template_id] if by_template else []), Notification.status
+    if (intraday_stats := get_intraday_stats(now.date(), service_ids=[service_id])) is not None:
+        stats_for_today = _get_stats_for_today_from_intraday_stats(intraday_stats[str(service_id)], by_template)
+    else:
+        stats_for_today = (
+            db.session.query(
+                Notification.notification_type.cast(db.Text),
+                Notification.status,
+                *([Notification.template_id] if by_template else []),
+                func.count().label("count"),
+            )
+            .filter(
+                Notification.created_at >= get_london_midnight_in_utc(now),
+                Notification.service_id == service_id,
+                Notification.key_type != KEY_TYPE_TEST,
+            )
+            .group_by(
+                Notification.notification_type,
+                *([Notification.template_id] if by_template else []),
+                Notification.status,
+            )
         )
-    )
 
-    all_stats_table = stats_for_7_days.union_all(stats_for_today).subquery()
+    all_stats_table = (
+        stats_for_7_days.union_all(stats_for_today) if stats_for_today is not None else stats_for_7_days
+    ).subquery()
 
     aggregation = (
         db.session.query(
@@ -200,6 +208,30 @@ def fetch_notification_status_for_service_for_today_and_7_previous_days(service_
     return query.all()
 
 
+def _get_stats_for_today_from_intraday_stats(intraday_stats, by_template):
+    counts = sum_intraday_stats(
+        intraday_stats, ("notification_type", "status", *(["template_id"] if by_template else []))
+    )
+    if not counts:
+        # there's no such thing as an empty VALUES list
+        return None
+
+    stats_for_today = values(
+        column("notification_type", db.Text),
+        column("status", db.Text),
+        *([column("template_id", db.Text)] if by_template else []),
+        column("count", Integer),
+        name="stats_for_today",
+    ).data([(*stat, count) for stat, count in sorted(counts.items())])
+
+    return db.session.query(
+        stats_for_today.c.notification_type,
+        stats_for_today.c.status,
+        *([cast(stats_for_today.c.template_id, UUID(as_uuid=True))] if by_template else []),
+        stats_for_today.c.count,
+    )
+
+
 def fetch_notification_status_totals_for_all_services(start_date, end_date):
     stats = (
         db.session.query(
@@ -7,7 +7,7 @@ from notifications_utils.letter_timings import (
     CANCELLABLE_JOB_LETTER_STATUSES,
     letter_can_be_cancelled,
 )
-from sqlalchemy import and_, asc, desc, func
+from sqlalchemy import and_, asc, desc, func, update
 
 from app import db, redis_store
 from app.constants import (
@@ -23,7 +23,9 @@ from app.constants import (
 )
 from app.dao.dao_utils import autocommit
 from app.dao.fact_notification_status_dao import fetch_notification_statuses_for_job
+from app.dao.notifications_dao import NOTIFICATION_STATUS_CHANGE_COLUMNS, record_notification_status_changes
 from app.dao.templates_dao import dao_get_template_by_id
+from app.job.status_counts import get_job_status_counts
 from app.models import (
     FactNotificationStatus,
     Job,
@@ -205,12 +207,22 @@ def dao_get_jobs_older_than_data_retention(notification_types):
 
 @autocommit
 def dao_cancel_letter_job(job):
-    number_of_notifications_cancelled = Notification.query.filter(Notification.job_id == job.id).update(
-        {"status": NOTIFICATION_CANCELLED, "updated_at": datetime.utcnow(), "billable_units": 0}
-    )
+    table = Notification.__table__
+    # joining the table to itself gives us the status before the update, to keep the status counts in redis up to date
+    old_notifications = table.alias("old_notifications")
+    cancelled = db.session.execute(
+        update(table)
+        .where(table.c.job_id == job.id, old_notifications.c.id == table.c.id)
+        .values(status=NOTIFICATION_CANCELLED, updated_at=datetime.utcnow(), billable_units=0)
+        .returning(
+            *(table.c[name] for name in NOTIFICATION_STATUS_CHANGE_COLUMNS),
+            old_notifications.c.status.label("old_status"),
+        )
+    ).all()
+    record_notification_status_changes((row, row.old_status, NOTIFICATION_CANCELLED) for row in cancelled)
     job.job_status = JOB_STATUS_CANCELLED
     dao_update_job(job)
-    return number_of_notifications_cancelled
+    return len(cancelled)
 
 
 def can_letter_job_be_cancelled(job):
@@ -236,16 +248,10 @@ def find_jobs_with_missing_rows() -> (list[Job], list[Job]):
     Returns a tuple of two lists of "finished" jobs, the first with missing rows, the
     second with all rows created
     """
-    # Jobs can be a maximum of 100,000 rows. It typically takes 10 minutes to create all those notifications.
-    # Using 20 minutes as a condition seems reasonable.
-    ten_minutes_ago = datetime.utcnow() - timedelta(minutes=20)
-    yesterday = datetime.utcnow() - timedelta(days=1)
     jobs_has_all_notifications = (
         db.session.query(Job, (func.count(Notification.id) == Job.notification_count).label("has_all_notifications"))
         .filter(
-            Job.job_status == JOB_STATUS_FINISHED,
-            Job.processing_finished < ten_minutes_ago,
-            Job.processing_finished > yesterday,
+            *_finished_jobs_to_check_for_missing_rows_filters(),
             Job.id == Notification.job_id,
         )
         .group_by(Job)
@@ -257,6 +263,22 @@ def find_jobs_with_missing_rows() -> (list[Job], list[Job]):
     ]
 
 
+def dao_get_finished_jobs_to_check_for_missing_rows():
+    return Job.query.filter(*_finished_jobs_to_check_for_missing_rows_filters()).all()
+
+
+def _finished_jobs_to_check_for_missing_rows_filters():
+    # Jobs can be a maximum of 100,000 rows. It typically takes 10 minutes to create all those notifications.
+    # Using 20 minutes as a condition seems reasonable.
+    ten_minutes_ago = datetime.utcnow() - timedelta(minutes=20)
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    return (
+        Job.job_status == JOB_STATUS_FINISHED,
+        Job.processing_finished < ten_minutes_ago,
+        Job.processing_finished > yesterday,
+    )
+
+
 def find_missing_row_for_job(job_id, job_size):
     expected_row_numbers = db.session.query(func.generate_series(0, job_size - 1).label("row")).subquery()
 
@@ -282,6 +304,10 @@ def get_possibly_cached_notification_outcomes_for_job(
     elif processing_started.replace(tzinfo=None) < midnight_n_days_ago(3):
         # ft_notification_status table
         statuses = fetch_notification_statuses_for_job(job_id)
+    elif (
+        live_statuses := get_live_notification_outcomes_for_job(job_id, notification_count, processing_started)
+    ) is not None:
+        return RequestCache.CacheResultWrapper(value=live_statuses, cache_decision=False)
     else:
         # notifications table
         statuses = dao_get_notification_outcomes_for_job(job_id)
@@ -295,3 +321,29 @@ def get_possibly_cached_notification_outcomes_for_job(
             and all(status.status in NOTIFICATION_STATUS_TYPES_COMPLETED for status in statuses)
         ),
     )
+
+
+def get_live_notification_outcomes_for_job(
+    job_id: uuid.UUID | str, notification_count: int | None, processing_started: datetime | None
+):
+    """
+    Returns the job's notification counts by status from redis while it's still being processed and sent, so the
+    admin can show its progress without counting its notifications each time.
+
+    Returns None if there are no counts for the job, or the job started too long ago to rely on them. Also returns
+    None once the counts say every notification is in a final state. The notifications are then counted once to
+    confirm it, and that result is cached.
+    """
+    if processing_started is None or processing_started.replace(tzinfo=None) < datetime.utcnow() - timedelta(days=1):
+        return None
+
+    statuses = get_job_status_counts(job_id)
+    if statuses is None:
+        return None
+
+    if sum(status["count"] for status in statuses) >= (notification_count or 0) and all(
+        status["status"] in NOTIFICATION_STATUS_TYPES_COMPLETED for status in statuses
+    ):
+        return None
+
+    return statuses
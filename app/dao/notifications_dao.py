@@ -1,4 +1,5 @@
 import uuid
+from collections import namedtuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from itertools import groupby
@@ -11,11 +12,28 @@ from notifications_utils.international_billing_rates import (
     INTERNATIONAL_BILLING_RATES,
 )
 from notifications_utils.recipient_validation.email_address import validate_and_format_email_address
-from notifications_utils.recipient_validation.errors import InvalidEmailError
+from notifications_utils.recipient_validation.errors import InvalidEmailError, InvalidPhoneError
 from notifications_utils.timezones import convert_bst_to_utc, convert_utc_to_bst
-from sqlalchemy import and_, asc, desc, func, or_, union
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import defer, joinedload, undefer
+from sqlalchemy import (
+    String,
+    and_,
+    asc,
+    cast,
+    column,
+    desc,
+    event,
+    func,
+    inspect,
+    not_,
+    or_,
+    select,
+    tuple_,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Session, defer, joinedload, undefer
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql import functions
 from sqlalchemy.sql.expression import case
@@ -44,19 +62,26 @@ from app.constants import (
     SMS_TYPE,
 )
 from app.dao.dao_utils import autocommit
+from app.job.status_counts import record_job_status_changes
 from app.letters.utils import LetterPDFNotFound, find_letter_pdf_in_s3
 from app.models import (
+    ApiKey,
     FactNotificationStatus,
+    Job,
     LetterCostThreshold,
     Notification,
     NotificationHistory,
     NotificationLetterDespatch,
     ProviderDetails,
+    TemplateHistory,
+    User,
 )
+from app.service.intraday_stats import record_intraday_stats_changes
 from app.utils import (
     escape_special_characters,
     get_london_midnight_in_utc,
     midnight_n_days_ago,
+    parse_and_format_phone_number,
     try_parse_and_format_phone_number,
 )
 
@@ -132,6 +157,62 @@ def dao_get_last_date_template_was_used(template):
     return None
 
 
+# the columns record_notification_status_changes needs, for bulk updates to return
+NOTIFICATION_STATUS_CHANGE_COLUMNS = (
+    "job_id",
+    "service_id",
+    "notification_type",
+    "key_type",
+    "template_id",
+    "created_at",
+)
+
+NotificationStatusChange = namedtuple("NotificationStatusChange", NOTIFICATION_STATUS_CHANGE_COLUMNS)
+
+# where the session keeps the status changes made in its transaction until they're committed
+PENDING_NOTIFICATION_STATUS_CHANGES = "pending_notification_status_changes"
+
+
+def record_notification_status_changes(changes):
+    """
+    Takes (notification, old_status, new_status) for each notification that was created (with an old_status of None),
+    changed status or was deleted (with a new_status of None), and keeps the job status counts and intraday service
+    stats in redis up to date. notification can be anything with the notification's job_id, service_id,
+    notification_type, key_type, template_id and created_at.
+
+    Nothing is recorded until the session's transaction commits, so changes that are rolled back are never counted.
+    """
+    db.session.info.setdefault(PENDING_NOTIFICATION_STATUS_CHANGES, []).extend(
+        (
+            NotificationStatusChange(*(getattr(notification, name) for name in NOTIFICATION_STATUS_CHANGE_COLUMNS)),
+            old_status,
+            new_status,
+        )
+        for notification, old_status, new_status in changes
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _record_committed_notification_status_changes(session):
+    # releasing a savepoint commits too, but its changes can still be rolled back with the transaction around it
+    if session.in_nested_transaction():
+        return
+
+    changes = session.info.pop(PENDING_NOTIFICATION_STATUS_CHANGES, None)
+    if changes:
+        record_job_status_changes(
+            [(notification.job_id, old_status, new_status) for notification, old_status, new_status in changes]
+        )
+        record_intraday_stats_changes(changes)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_notification_status_changes(session, transaction):
+    # anything still pending once the outermost transaction has ended was rolled back
+    if transaction.parent is None:
+        session.info.pop(PENDING_NOTIFICATION_STATUS_CHANGES, None)
+
+
 @autocommit
 def dao_create_notification(notification):
     if not notification.id:
@@ -141,6 +222,44 @@ def dao_create_notification(notification):
         notification.status = NOTIFICATION_CREATED
 
     db.session.add(notification)
+    record_notification_status_changes([(notification, None, notification.status)])
+
+
+def _notification_insert_values(notification):
+    row_values = {}
+    for table_column in Notification.__table__.columns:
+        value = getattr(notification, table_column.key)
+        # a multi-row insert needs every row to specify every column, so fill in the scalar column defaults that the
+        # ORM would otherwise apply for us
+        if value is None and table_column.default is not None and table_column.default.is_scalar:
+            value = table_column.default.arg
+        row_values[table_column.key] = value
+    return row_values
+
+
+@autocommit
+def dao_create_notifications_in_bulk(notifications):
+    """
+    Insert all notifications with one multi-row INSERT. Rows that already exist (by id, or by job and row number)
+    are left untouched, so re-running the same batch is safe. Returns the ids (as strings) of the rows inserted.
+    """
+    if not notifications:
+        return set()
+
+    stmt = (
+        insert(Notification.__table__)
+        .values([_notification_insert_values(notification) for notification in notifications])
+        .on_conflict_do_nothing()
+        .returning(Notification.__table__.c.id)
+    )
+
+    inserted_ids = {str(row.id) for row in db.session.execute(stmt)}
+    record_notification_status_changes(
+        (notification, None, notification.status)
+        for notification in notifications
+        if str(notification.id) in inserted_ids
+    )
+    return inserted_ids
 
 
 def _decide_permanent_temporary_failure(status, notification, detailed_status_code=None):
@@ -208,9 +327,106 @@ def update_notification_status_by_id(notification_id, status, sent_by=None, deta
     )
 
 
+@autocommit
+def dao_update_notification_statuses_by_id(status, notification_ids_and_sent_by, sent_at=None, billable_units=None):
+    """
+    Bulk version of update_notification_status_by_id for providers that don't need the current status to decide the
+    new one. Updates all the notifications with a single UPDATE ... FROM (VALUES ...), skipping any that are already
+    in a final state or are international sms to a country that doesn't send delivery receipts. sent_at and
+    billable_units are set too, if given.
+
+    Returns the ids of the notifications that were updated.
+    """
+    if not notification_ids_and_sent_by:
+        return []
+
+    table = Notification.__table__
+    # joining the table to itself gives us the status before the update, to keep job status counts up to date
+    old_notifications = table.alias("old_notifications")
+    receipts = values(column("id", String), column("sent_by", String), name="receipts").data(
+        [(str(notification_id), sent_by) for notification_id, sent_by in notification_ids_and_sent_by]
+    )
+    phone_prefixes_without_receipts = [
+        phone_prefix for phone_prefix in INTERNATIONAL_BILLING_RATES if not country_records_delivery(phone_prefix)
+    ]
+
+    result = db.session.execute(
+        update(table)
+        .where(
+            table.c.id == cast(receipts.c.id, UUID(as_uuid=True)),
+            old_notifications.c.id == table.c.id,
+            table.c.status.in_(
+                [
+                    NOTIFICATION_CREATED,
+                    NOTIFICATION_SENDING,
+                    NOTIFICATION_PENDING,
+                    NOTIFICATION_SENT,
+                    NOTIFICATION_PENDING_VIRUS_CHECK,
+                ]
+            ),
+            not_(
+                and_(
+                    table.c.notification_type == SMS_TYPE,
+                    table.c.international.is_(True),
+                    table.c.phone_prefix.in_(phone_prefixes_without_receipts),
+                )
+            ),
+        )
+        .values(
+            status=status,
+            sent_by=func.coalesce(table.c.sent_by, receipts.c.sent_by),
+            **({"sent_at": sent_at} if sent_at else {}),
+            **({"billable_units": billable_units} if billable_units is not None else {}),
+        )
+        .returning(
+            table.c.id,
+            *(table.c[name] for name in NOTIFICATION_STATUS_CHANGE_COLUMNS),
+            old_notifications.c.status.label("old_status"),
+        )
+    ).all()
+    record_notification_status_changes((row, row.old_status, status) for row in result)
+    return [row.id for row in result]
+
+
+@autocommit
+def dao_update_notification_statuses_by_reference(status, references):
+    """
+    Bulk version of dao_update_notifications_by_reference for delivery receipts. Only notifications still sending or
+    pending are updated, and the NotificationHistory table is not checked.
+
+    Returns (id, reference) for each notification that was updated.
+    """
+    if not references:
+        return []
+
+    table = Notification.__table__
+    old_notifications = table.alias("old_notifications")
+    receipts = values(column("reference", String), name="receipts").data([(reference,) for reference in references])
+
+    result = db.session.execute(
+        update(table)
+        .where(
+            table.c.reference == receipts.c.reference,
+            old_notifications.c.id == table.c.id,
+            table.c.status.in_([NOTIFICATION_SENDING, NOTIFICATION_PENDING]),
+        )
+        .values(status=status)
+        .returning(
+            table.c.id,
+            table.c.reference,
+            *(table.c[name] for name in NOTIFICATION_STATUS_CHANGE_COLUMNS),
+            old_notifications.c.status.label("old_status"),
+        )
+    ).all()
+    record_notification_status_changes((row, row.old_status, status) for row in result)
+    return [(row.id, row.reference) for row in result]
+
+
 @autocommit
 def dao_update_notification(notification):
     notification.updated_at = datetime.utcnow()
+    if (status_history := inspect(notification).attrs.status.history).deleted:
+        record_notification_status_changes([(notification, status_history.deleted[0], notification.status)])
     db.session.add(notification)
 
 
@@ -245,6 +461,10 @@ def get_notification_by_id(notification_id, service_id=None, _raise=False):
     return query.one() if _raise else query.first()
 
 
+def get_notifications_by_ids(notification_ids):
+    return Notification.query.filter(Notification.id.in_(notification_ids)).all()
+
+
 def dao_get_notification_or_history_by_id(notification_id):
     if notification := Notification.query.get(notification_id):
         return notification
@@ -323,6 +543,85 @@ def get_notifications_for_service(  # noqa: C901
     )
 
 
+def get_notifications_for_service_for_csv(
+    service_id,
+    page_size,
+    filter_dict=None,
+    limit_days=None,
+    older_than=None,
+    created_from=None,
+    created_before=None,
+):
+    """
+    Returns a page of a service's notifications (not from test keys), newest first, as rows of just the columns
+    Notification.serialize_row_for_csv needs rather than as Notification objects. created_from and created_before
+    narrow the results to notifications created in [created_from, created_before).
+
+    Pages are keyed on (created_at, id): older_than is the (created_at, id) of the last row of the previous page, so
+    each page is a range scan of ix_notifications_service_created_at however far into the results it is, and
+    notifications created at the same moment are never skipped between pages.
+    """
+    filters = [Notification.service_id == service_id, Notification.key_type != KEY_TYPE_TEST]
+
+    if limit_days is not None:
+        filters.append(Notification.created_at >= midnight_n_days_ago(limit_days))
+
+    if created_from is not None:
+        filters.append(Notification.created_at >= created_from)
+
+    if created_before is not None:
+        filters.append(Notification.created_at < created_before)
+
+    if older_than is not None:
+        filters.append(tuple_(Notification.created_at, Notification.id) < tuple(older_than))
+
+    query = (
+        select(
+            Notification.id,
+            Notification.created_at,
+            Notification.job_row_number,
+            Notification.to,
+            Notification.client_reference,
+            Notification.status,
+            TemplateHistory.name.label("template_name"),
+            TemplateHistory.template_type,
+            Job.original_file_name.label("job_name"),
+            User.name.label("created_by_name"),
+            User.email_address.label("created_by_email_address"),
+            ApiKey.name.label("api_key_name"),
+        )
+        .select_from(Notification)
+        .join(
+            TemplateHistory,
+            and_(
+                TemplateHistory.id == Notification.template_id,
+                TemplateHistory.version == Notification.template_version,
+            ),
+        )
+        .outerjoin(Job, Job.id == Notification.job_id)
+        .outerjoin(User, User.id == Notification.created_by_id)
+        .outerjoin(ApiKey, ApiKey.id == Notification.api_key_id)
+        .where(*filters)
+    )
+    query = _filter_query(query, filter_dict)
+
+    return db.session.execute(
+        query.order_by(desc(Notification.created_at), desc(Notification.id)).limit(page_size)
+    ).all()
+
+
+def get_notification_keyset_for_csv(service_id, notification_id):
+    """
+    Returns the (created_at, id) to pass as older_than to get_notifications_for_service_for_csv to carry on from the
+    given notification, or None if the service has no such notification.
+    """
+    return (
+        db.session.query(Notification.created_at, Notification.id)
+        .filter(Notification.id == notification_id, Notification.service_id == service_id)
+        .one_or_none()
+    )
+
+
 def _filter_query(query, filter_dict=None):
     if filter_dict is None:
         return query
@@ -352,54 +651,43 @@ def insert_notification_history_delete_notifications(
     Delete up to 50,000 notifications that are past retention for a notification type and service.
 
 
-    Steps are as follows:
-
-    Create a temporary notifications table
-    Populate that table with up to 50k notifications that are to be deleted. (Note: no specified order)
-    Insert everything in the temp table into notification history
-    Delete from notifications if notification id is in the temp table
-    Drop the temp table (automatically when the transaction commits)
-
-    Temporary tables are in a separate postgres schema, and only visible to the current session (db connection,
-    in a celery task there's one connection per thread.)
+    This is done in a single statement: the notifications are deleted, and the deleted rows (as returned by the
+    DELETE) are inserted into notification history, skipping any that are already there. Compared with copying them
+    into a temporary table first, this reads the notifications once rather than three times, and doesn't create and
+    drop a table (and its catalog entries) for each batch.
     """
     # Setting default query limit to 50,000 which take about 48 seconds on current table size
     # 10, 000 took 11s and 100,000 took 1 min 30 seconds.
     fields_to_transfer_to_notification_history = ", ".join(FIELDS_TO_TRANSFER_TO_NOTIFICATION_HISTORY)
 
-    select_into_temp_table = f"""
-         CREATE TEMP TABLE NOTIFICATION_ARCHIVE ON COMMIT DROP AS
-         SELECT {fields_to_transfer_to_notification_history}
-          FROM notifications
-        WHERE service_id = :service_id
-          AND notification_type = :notification_type
-          AND created_at < :timestamp_to_delete_backwards_from
-          AND key_type in ('normal', 'team')
-        ORDER BY created_at
-        limit :qry_limit
-        """
-    select_into_temp_table_for_letters = f"""
-         CREATE TEMP TABLE NOTIFICATION_ARCHIVE ON COMMIT DROP AS
-         SELECT {fields_to_transfer_to_notification_history}
-          FROM notifications
-        WHERE service_id = :service_id
-          AND notification_type = :notification_type
-          AND created_at < :timestamp_to_delete_backwards_from
-          AND notification_status NOT IN ('pending-virus-check', 'created', 'sending')
-          AND key_type in ('normal', 'team')
-        ORDER BY created_at
-        limit :qry_limit
-        """
+    letter_status_filter = (
+        "AND notification_status NOT IN ('pending-virus-check', 'created', 'sending')"
+        if notification_type == LETTER_TYPE
+        else ""
+    )
     # Insert into NotificationHistory if the row already exists do nothing.
-    insert_query = f"""
-        insert into notification_history ({fields_to_transfer_to_notification_history})
-         SELECT {fields_to_transfer_to_notification_history} from NOTIFICATION_ARCHIVE
-          ON CONFLICT ON CONSTRAINT notification_history_pkey
-          DO NOTHING
-    """
-    delete_query = """
-        DELETE FROM notifications
-        where id in (select id from NOTIFICATION_ARCHIVE)
+    move_query = f"""
+        WITH archived AS (
+            DELETE FROM notifications
+            WHERE id IN (
+                SELECT id
+                  FROM notifications
+                WHERE service_id = :service_id
+                  AND notification_type = :notification_type
+                  AND created_at < :timestamp_to_delete_backwards_from
+                  {letter_status_filter}
+                  AND key_type in ('normal', 'team')
+                ORDER BY created_at
+                limit :qry_limit
+            )
+            RETURNING {fields_to_transfer_to_notification_history}
+        ), inserted AS (
+            insert into notification_history ({fields_to_transfer_to_notification_history})
+             SELECT {fields_to_transfer_to_notification_history} from archived
+              ON CONFLICT ON CONSTRAINT notification_history_pkey
+              DO NOTHING
+        )
+        SELECT count(*) FROM archived
     """
     input_params = {
         "service_id": service_id,
@@ -408,16 +696,7 @@ def insert_notification_history_delete_notifications(
         "qry_limit": qry_limit,
     }
 
-    select_to_use = select_into_temp_table_for_letters if notification_type == "letter" else select_into_temp_table
-    db.session.execute(select_to_use, input_params)
-
-    result = db.session.execute("select count(*) from NOTIFICATION_ARCHIVE").fetchone()[0]
-
-    db.session.execute(insert_query)
-
-    db.session.execute(delete_query)
-
-    return result
+    return db.session.execute(move_query, input_params).scalar()
 
 
 def move_notifications_to_notification_history(
@@ -519,32 +798,73 @@ def _delete_test_letters_from_s3(service_id, date_to_delete_from, query_limit):
 
 @autocommit
 def dao_delete_notifications_by_id(notification_id):
+    deleted = db.session.execute(
+        select(
+            *(getattr(Notification, name) for name in NOTIFICATION_STATUS_CHANGE_COLUMNS), Notification.status
+        ).where(Notification.id == notification_id)
+    ).all()
     db.session.query(Notification).filter(Notification.id == notification_id).delete(synchronize_session="fetch")
+    record_notification_status_changes((row, row.status, None) for row in deleted)
 
 
-def dao_timeout_notifications(cutoff_time, limit=100000):
+# the columns for status updates to return, instead of loading Notification objects: enough to record the status
+# changes, queue the service callbacks (see create_delivery_status_callback_data) and record metrics by provider
+NOTIFICATION_STATUS_UPDATE_COLUMNS = (
+    *NOTIFICATION_STATUS_CHANGE_COLUMNS,
+    "id",
+    "client_reference",
+    "to",
+    "status",
+    "updated_at",
+    "sent_at",
+    "template_version",
+    "sent_by",
+)
+
+
+def dao_timeout_notifications(cutoff_time, limit=10000):
     """
     Set email and SMS notifications (only) to "temporary-failure" status
     if they're still sending from before the specified cutoff_time.
+
+    Times out up to `limit` notifications at a time with a single UPDATE ... RETURNING, so callers should call this
+    until it returns nothing. Returns rows of just the NOTIFICATION_STATUS_UPDATE_COLUMNS, not Notification objects.
     """
     updated_at = datetime.utcnow()
     current_statuses = [NOTIFICATION_SENDING, NOTIFICATION_PENDING]
     new_status = NOTIFICATION_TEMPORARY_FAILURE
 
-    notifications = (
-        Notification.query.filter(
-            Notification.created_at < cutoff_time,
-            Notification.status.in_(current_statuses),
-            Notification.notification_type.in_([SMS_TYPE, EMAIL_TYPE]),
+    table = Notification.__table__
+    # joining the table to itself gives us the status before the update, to keep job status counts up to date
+    old_notifications = table.alias("old_notifications")
+    to_time_out = table.alias("to_time_out")
+
+    notifications = db.session.execute(
+        update(table)
+        .where(
+            table.c.id.in_(
+                select(to_time_out.c.id)
+                .where(
+                    to_time_out.c.created_at < cutoff_time,
+                    to_time_out.c.status.in_(current_statuses),
+                    to_time_out.c.notification_type.in_([SMS_TYPE, EMAIL_TYPE]),
+                )
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ),
+            table.c.status.in_(current_statuses),
+            old_notifications.c.id == table.c.id,
         )
-        .limit(limit)
-        .all()
-    )
-
-    Notification.query.filter(
-        Notification.id.in_([n.id for n in notifications]),
-    ).update({"status": new_status, "updated_at": updated_at}, synchronize_session=False)
+        .values(status=new_status, updated_at=updated_at)
+        .returning(
+            *(table.c[name] for name in NOTIFICATION_STATUS_UPDATE_COLUMNS),
+            old_notifications.c.status.label("old_status"),
+        )
+    ).all()
 
+    record_notification_status_changes(
+        (notification, notification.old_status, notification.status) for notification in notifications
+    )
     db.session.commit()
     return notifications
 
@@ -649,19 +969,33 @@ def get_slow_text_message_delivery_reports_by_provider(
 
 @autocommit
 def dao_update_notifications_by_reference(references, update_dict):
-    updated_count = Notification.query.filter(Notification.reference.in_(references)).update(
-        update_dict, synchronize_session=False
-    )
+    updated_count = _update_notifications_by_reference(Notification, references, update_dict)
 
     updated_history_count = 0
     if updated_count != len(references):
-        updated_history_count = NotificationHistory.query.filter(NotificationHistory.reference.in_(references)).update(
-            update_dict, synchronize_session=False
-        )
+        updated_history_count = _update_notifications_by_reference(NotificationHistory, references, update_dict)
 
     return updated_count, updated_history_count
 
 
+def _update_notifications_by_reference(model, references, update_dict):
+    table = model.__table__
+    # joining the table to itself gives us the status before the update, to keep job status counts up to date
+    old_notifications = table.alias("old_notifications")
+    updated = db.session.execute(
+        update(table)
+        .where(table.c.reference.in_(references), old_notifications.c.id == table.c.id)
+        .values(update_dict)
+        .returning(
+            *(table.c[name] for name in NOTIFICATION_STATUS_CHANGE_COLUMNS),
+            table.c.status,
+            old_notifications.c.status.label("old_status"),
+        )
+    ).all()
+    record_notification_status_changes((row, row.old_status, row.status) for row in updated)
+    return len(updated)
+
+
 def dao_get_notifications_by_recipient_or_reference(
     service_id,
     search_term,
@@ -671,6 +1005,55 @@ def dao_get_notifications_by_recipient_or_reference(
     page_size=None,
     error_out=True,
 ):
+    return get_notifications_by_recipient_or_reference_query(
+        service_id, search_term, notification_type=notification_type, statuses=statuses
+    ).paginate(page=page, per_page=page_size, count=False, error_out=error_out)
+
+
+def get_notifications_by_recipient_or_reference_query(service_id, search_term, notification_type=None, statuses=None):
+    if exact_recipient := _get_exact_recipient_search_term(search_term, notification_type):
+        # a complete phone number or email address can be looked up on the (service_id, normalised_to) index, rather
+        # than matching the pattern against every service's notifications with the trigram indexes
+        recipient_or_reference_filter = or_(
+            Notification.normalised_to == exact_recipient,
+            Notification.client_reference == search_term,
+        )
+    else:
+        recipient_or_reference_filter = _get_partial_recipient_or_reference_filter(search_term, notification_type)
+
+    filters = [
+        Notification.service_id == service_id,
+        recipient_or_reference_filter,
+        Notification.key_type != KEY_TYPE_TEST,
+    ]
+
+    if statuses:
+        filters.append(Notification.status.in_(statuses))
+    if notification_type:
+        filters.append(Notification.notification_type == notification_type)
+    return db.session.query(Notification).filter(*filters).order_by(desc(Notification.created_at))
+
+
+def _get_exact_recipient_search_term(search_term, notification_type):
+    """
+    Returns the search term formatted the same way as normalised_to, if it's a complete phone number or email address
+    """
+    if notification_type == SMS_TYPE:
+        try:
+            return parse_and_format_phone_number(search_term)
+        except InvalidPhoneError:
+            return None
+
+    if notification_type == EMAIL_TYPE:
+        try:
+            return validate_and_format_email_address(search_term)
+        except InvalidEmailError:
+            return None
+
+    return None
+
+
+def _get_partial_recipient_or_reference_filter(search_term, notification_type):
     if notification_type == SMS_TYPE:
         normalised = try_parse_and_format_phone_number(search_term, with_country_code=False)
         for character in {"(", ")", " ", "-"}:
@@ -679,10 +1062,7 @@ def dao_get_notifications_by_recipient_or_reference(
         normalised = normalised.lstrip("+0")
 
     elif notification_type == EMAIL_TYPE:
-        try:
-            normalised = validate_and_format_email_address(search_term)
-        except InvalidEmailError:
-            normalised = search_term.lower()
+        normalised = search_term.lower()
 
     elif notification_type in {LETTER_TYPE, None}:
         # For letters, we store the address without spaces, so we need
@@ -698,32 +1078,48 @@ def dao_get_notifications_by_recipient_or_reference(
 
     normalised = escape_special_characters(normalised)
     search_term = escape_special_characters(search_term)
-    filters = [
-        Notification.service_id == service_id,
-        or_(
-            Notification.normalised_to.like(f"%{normalised}%"),
-            Notification.client_reference.ilike(f"%{search_term}%"),
-        ),
-        Notification.key_type != KEY_TYPE_TEST,
-    ]
-
-    if statuses:
-        filters.append(Notification.status.in_(statuses))
-    if notification_type:
-        filters.append(Notification.notification_type == notification_type)
-    results = (
-        db.session.query(Notification)
-        .filter(*filters)
-        .order_by(desc(Notification.created_at))
-        .paginate(page=page, per_page=page_size, count=False, error_out=error_out)
+    return or_(
+        Notification.normalised_to.like(f"%{normalised}%"),
+        Notification.client_reference.ilike(f"%{search_term}%"),
     )
-    return results
 
 
 def dao_get_notification_by_reference(reference):
     return Notification.query.filter(Notification.reference == reference).one()
 
 
+@autocommit
+def dao_update_sending_notification_status_by_reference(reference, status):
+    """
+    Sets the status of the notification with the given reference if it's still sending or pending, finding and
+    updating it with one probe of the reference index rather than loading it first.
+
+    Returns the notification as a row of the NOTIFICATION_STATUS_UPDATE_COLUMNS, or None if there's no such
+    notification (eg it's not been saved yet, has already had its final status or has moved to notification_history).
+    """
+    table = Notification.__table__
+    # joining the table to itself gives us the status before the update, to keep job status counts up to date
+    old_notifications = table.alias("old_notifications")
+
+    notification = db.session.execute(
+        update(table)
+        .where(
+            table.c.reference == reference,
+            old_notifications.c.id == table.c.id,
+            table.c.status.in_([NOTIFICATION_SENDING, NOTIFICATION_PENDING]),
+        )
+        .values(status=status)
+        .returning(
+            *(table.c[name] for name in NOTIFICATION_STATUS_UPDATE_COLUMNS),
+            old_notifications.c.status.label("old_status"),
+        )
+    ).one_or_none()
+
+    if notification is not None:
+        record_notification_status_changes([(notification, notification.old_status, status)])
+    return notification
+
+
 def dao_get_notification_or_history_by_reference(reference):
     try:
         # This try except is necessary because test keys do not create notification history.
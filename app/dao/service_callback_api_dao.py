@@ -15,11 +15,13 @@ def save_service_callback_api(service_callback_api):
 
 @autocommit
 @version_class(ServiceCallbackApi)
-def reset_service_callback_api(service_callback_api, updated_by_id, url=None, bearer_token=None):
+def reset_service_callback_api(service_callback_api, updated_by_id, url=None, bearer_token=None, batch_callbacks=None):
     if url:
         service_callback_api.url = url
     if bearer_token:
         service_callback_api.bearer_token = bearer_token
+    if batch_callbacks is not None:
+        service_callback_api.batch_callbacks = batch_callbacks
     service_callback_api.updated_by_id = updated_by_id
     service_callback_api.updated_at = datetime.utcnow()
 
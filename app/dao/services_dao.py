@@ -1,3 +1,4 @@
+from collections import namedtuple
 from datetime import date, datetime, timedelta
 
 from flask import current_app
@@ -59,6 +60,7 @@ from app.models import (
     User,
     VerifyCode,
 )
+from app.service.intraday_stats import get_intraday_stats, sum_intraday_stats
 from app.utils import (
     email_address_is_nhs,
     escape_special_characters,
@@ -422,8 +424,19 @@ def delete_service_and_all_associated_db_objects(service):
     db.session.commit()
 
 
+TodaysStats = namedtuple("TodaysStats", ["notification_type", "status", "count"])
+TodaysServiceStats = namedtuple(
+    "TodaysServiceStats",
+    ["service_id", "name", "restricted", "active", "created_at", "notification_type", "status", "count"],
+)
+
+
 def dao_fetch_todays_stats_for_service(service_id):
     today = date.today()
+    if (intraday_stats := get_intraday_stats(today, service_ids=[service_id])) is not None:
+        counts = sum_intraday_stats(intraday_stats[str(service_id)], ("notification_type", "status"))
+        return [TodaysStats(*stat, count) for stat, count in sorted(counts.items())]
+
     start_date = get_london_midnight_in_utc(today)
 
     return (
@@ -445,6 +458,11 @@ def dao_fetch_todays_stats_for_service(service_id):
 
 def dao_fetch_todays_stats_for_all_services(include_from_test_key=True, only_active=True):
     today = date.today()
+    if (intraday_stats := get_intraday_stats(today)) is not None:
+        return _fetch_todays_stats_for_all_services_from_intraday_stats(
+            intraday_stats, include_from_test_key, only_active
+        )
+
     start_date = get_london_midnight_in_utc(today)
     end_date = get_london_midnight_in_utc(today + timedelta(days=1))
 
@@ -485,6 +503,28 @@ def dao_fetch_todays_stats_for_all_services(include_from_test_key=True, only_act
     return query.all()
 
 
+def _fetch_todays_stats_for_all_services_from_intraday_stats(intraday_stats, include_from_test_key, only_active):
+    services = db.session.query(
+        Service.id.label("service_id"), Service.name, Service.restricted, Service.active, Service.created_at
+    ).order_by(Service.id)
+
+    if only_active:
+        services = services.filter(Service.active)
+
+    rows = []
+    for service in services:
+        counts = sum_intraday_stats(
+            intraday_stats.get(str(service.service_id), []),
+            ("notification_type", "status"),
+            include_from_test_key=include_from_test_key,
+        )
+        # like the outer join in dao_fetch_todays_stats_for_all_services, services with no stats still get a row
+        stats = sorted(counts.items()) or [((None, None), None)]
+        rows.extend(TodaysServiceStats(*service, *stat, count) for stat, count in stats)
+
+    return rows
+
+
 def dao_fetch_active_users_for_service(service_id):
     query = User.query.filter(User.services.any(id=service_id), User.state == "active")
 
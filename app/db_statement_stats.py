@@ -0,0 +1,144 @@
+import time
+from collections import Counter
+
+from celery import current_task
+from flask import current_app, g, has_app_context, has_request_context, request
+from gds_metrics.metrics import Histogram
+
+from app import db
+
+DB_STATEMENTS_COUNT = Histogram(
+    "db_statements_count",
+    "How many SQL statements each web request or celery task makes",
+    ["method", "path"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf")),
+)
+
+DB_STATEMENTS_ROWS = Histogram(
+    "db_statements_rows",
+    "How many rows the SQL statements made by each web request or celery task return or change",
+    ["method", "path"],
+    buckets=(1, 10, 100, 1000, 10_000, 100_000, float("inf")),
+)
+
+DB_STATEMENTS_DURATION_SECONDS = Histogram(
+    "db_statements_duration_seconds",
+    "How long each web request or celery task spends waiting on SQL statements in seconds",
+    ["method", "path"],
+)
+
+
+class DbStatementStats:
+    def __init__(self, collect_statements=True):
+        self.statements = 0
+        self.rows = 0
+        self.duration = 0.0
+        # the statements themselves are only kept if there's a budget to explain going over
+        self.collect_statements = collect_statements
+        self.statement_counts = Counter()
+        # the parameters each statement was last run with, to explain it if the budget's exceeded
+        self.last_parameters = {}
+
+    def most_repeated(self, n):
+        return self.statement_counts.most_common(n)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # a connection only runs one statement at a time, so there's only ever one start time to keep
+    conn.info["statement_start_time"] = time.monotonic()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.monotonic() - conn.info["statement_start_time"]
+    if not has_app_context():
+        return
+
+    # flask's g belongs to the app context, which each request and task gets its own of
+    stats = g.get("db_statement_stats")
+    if stats is None:
+        stats = g.db_statement_stats = DbStatementStats(collect_statements=bool(_get_current_db_statement_budget()))
+    stats.statements += 1
+    stats.rows += max(cursor.rowcount, 0)
+    stats.duration += duration
+    if stats.collect_statements:
+        stats.statement_counts[statement] += 1
+        stats.last_parameters[statement] = parameters
+
+
+def _get_request_path():
+    return request.url_rule.rule if request.url_rule else "No endpoint"
+
+
+def _get_db_statement_budget(path):
+    return current_app.config["DATABASE_STATEMENT_BUDGETS"].get(path, current_app.config["DATABASE_STATEMENT_BUDGET"])
+
+
+def _get_current_db_statement_budget():
+    # the same request or task that the stats will be recorded against
+    if has_request_context():
+        return _get_db_statement_budget(_get_request_path())
+    if current_task:
+        return _get_db_statement_budget(current_task.name)
+    return None
+
+
+def record_request_db_statement_stats(exc=None):
+    if has_request_context():
+        _record_db_statement_stats(request.method, _get_request_path())
+
+
+def record_task_db_statement_stats(exc=None):
+    # requests are recorded as the request ends, so anything left belongs to a task or a cli command
+    if current_task:
+        _record_db_statement_stats("celery", current_task.name)
+
+
+def _record_db_statement_stats(method, path):
+    stats = g.pop("db_statement_stats", None)
+    if stats is None:
+        return
+
+    try:
+        DB_STATEMENTS_COUNT.labels(method, path).observe(stats.statements)
+        DB_STATEMENTS_ROWS.labels(method, path).observe(stats.rows)
+        DB_STATEMENTS_DURATION_SECONDS.labels(method, path).observe(stats.duration)
+
+        budget = _get_db_statement_budget(path)
+        if budget and stats.statements > budget:
+            _log_db_statement_budget_exceeded(method, path, budget, stats)
+    except Exception:
+        current_app.logger.exception("Failed to record SQL statement stats for %s %s", method, path)
+
+
+def _log_db_statement_budget_exceeded(method, path, budget, stats):
+    most_repeated = stats.most_repeated(3)
+    current_app.logger.warning(
+        "%s %s made %s SQL statements, more than its budget of %s, returning %s rows in %.3f seconds",
+        method,
+        path,
+        stats.statements,
+        budget,
+        stats.rows,
+        stats.duration,
+        extra={
+            "db_statements": stats.statements,
+            "db_statement_budget": budget,
+            "db_most_repeated_statements": [
+                {"statement": statement, "count": count} for statement, count in most_repeated
+            ],
+        },
+    )
+
+    statement, count = most_repeated[0]
+    if current_app.config["DATABASE_STATEMENT_BUDGET_EXPLAIN"] and statement.lstrip().upper().startswith("SELECT"):
+        # on a connection of its own, so the plan's taken outside of the request or task's transaction
+        with db.engine.connect() as connection:
+            plan = connection.exec_driver_sql(f"EXPLAIN {statement}", stats.last_parameters[statement])
+            current_app.logger.warning(
+                "Plan for the statement %s %s made %s times:\n%s",
+                method,
+                path,
+                count,
+                "\n".join(line for (line,) in plan),
+                extra={"db_statement": statement},
+            )
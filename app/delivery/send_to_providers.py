@@ -1,3 +1,4 @@
+import json
 import random
 from datetime import datetime, timedelta
 from threading import RLock
@@ -21,6 +22,7 @@ from app.constants import (
     BRANDING_ORG_BANNER,
     EMAIL_TYPE,
     KEY_TYPE_TEST,
+    NOTIFICATION_CREATED,
     NOTIFICATION_SENDING,
     NOTIFICATION_SENT,
     NOTIFICATION_STATUS_TYPES_COMPLETED,
@@ -30,7 +32,7 @@ from app.constants import (
     SMS_TYPE,
 )
 from app.dao.email_branding_dao import dao_get_email_branding_by_id
-from app.dao.notifications_dao import dao_update_notification
+from app.dao.notifications_dao import dao_update_notification, dao_update_notification_statuses_by_id
 from app.dao.provider_details_dao import (
     dao_reduce_sms_provider_priority,
     get_provider_details_by_notification_type,
@@ -39,6 +41,9 @@ from app.exceptions import NotificationTechnicalFailureException
 from app.models import Notification
 from app.serialised_models import SerialisedService, SerialisedTemplate
 
+# how long to keep the recipient to notification id mapping for a batch, for its delivery receipts to use
+SMS_BATCH_REFERENCE_TTL_SECONDS = 7 * 24 * 60 * 60
+
 
 def send_sms_to_provider(notification):
     service = SerialisedService.from_id(notification.service_id)
@@ -86,12 +91,7 @@ def send_sms_to_provider(notification):
             except Exception as e:
                 notification.billable_units = template.fragment_count
                 dao_update_notification(notification)
-
-                if redis_store.exceeded_rate_limit(
-                    f"{provider.name}-error-rate", SMS_PROVIDER_ERROR_THRESHOLD, SMS_PROVIDER_ERROR_INTERVAL
-                ):
-                    dao_reduce_sms_provider_priority(provider.name, time_threshold=timedelta(minutes=1))
-                    current_app.logger.warning("Error threshold exceeded for provider %s", provider.name)
+                _record_sms_provider_error(provider)
                 raise e
             else:
                 notification.billable_units = template.fragment_count
@@ -108,6 +108,127 @@ def send_sms_to_provider(notification):
             statsd_client.timing("sms.live-key.total-time", delta_seconds)
 
 
+def send_sms_batch_to_provider(notifications):
+    """
+    Sends SMS notifications that render to the same content to many recipients in a single provider request, if the
+    provider supports it. Delivery receipts for the batch share one reference, so the notification id for each
+    recipient is kept in redis for the callback to look up.
+
+    Returns the notifications that were sent. Any others (eg test key notifications, international text messages,
+    duplicate recipients or content that differs from the rest) should be sent one at a time with
+    send_sms_to_provider. Once the provider has accepted the batch, this doesn't raise, as sending any of it again
+    would send those messages twice.
+    """
+    notifications = [
+        notification
+        for notification in notifications
+        if notification.status == NOTIFICATION_CREATED and not notification.international
+    ]
+    if len(notifications) < 2 or not current_app.config["REDIS_ENABLED"]:
+        return []
+
+    service = SerialisedService.from_id(notifications[0].service_id)
+    if not service.active:
+        return []
+
+    sender = notifications[0].reply_to_text
+    provider = provider_to_use(SMS_TYPE)
+    if not provider.supports_batch_sms:
+        return []
+
+    content, batch = _get_sms_batch(notifications, service, provider)
+    if len(batch) < 2:
+        return []
+
+    reference = str(create_uuid())
+    redis_store.set(
+        get_sms_batch_cache_key(reference),
+        json.dumps({to.replace("+", ""): str(notification.id) for to, notification in batch.items()}),
+        ex=SMS_BATCH_REFERENCE_TTL_SECONDS,
+    )
+
+    # as in send_sms_to_provider, don't hold a DB connection open while waiting on the provider
+    db.session.close()
+    try:
+        provider.send_sms_batch(recipients=list(batch), content=content, reference=reference, sender=sender)
+    except Exception as e:
+        _record_sms_provider_error(provider)
+        raise e
+
+    sent_at = datetime.utcnow()
+    try:
+        dao_update_notification_statuses_by_id(
+            NOTIFICATION_SENDING,
+            [(notification.id, provider.name) for notification in batch.values()],
+            sent_at=sent_at,
+            billable_units=next(iter(batch.values())).billable_units,
+        )
+    except Exception:
+        current_app.logger.exception(
+            "Failed to update SMS batch %s of %s notifications to sending", reference, len(batch)
+        )
+
+    for notification in batch.values():
+        delta_seconds = (sent_at - notification.created_at).total_seconds()
+        statsd_client.timing("sms.total-time", delta_seconds)
+        statsd_client.timing("sms.live-key.total-time", delta_seconds)
+
+    return list(batch.values())
+
+
+def _get_sms_batch(notifications, service, provider):
+    sender = notifications[0].reply_to_text
+    content = None
+    batch = {}
+
+    for notification in notifications:
+        if (
+            notification.key_type == KEY_TYPE_TEST
+            or notification.reply_to_text != sender
+            or notification.normalised_to in batch
+            or len(batch) >= provider.max_batch_size
+        ):
+            continue
+
+        template_model = SerialisedTemplate.from_id_and_service_id(
+            template_id=notification.template_id, service_id=service.id, version=notification.template_version
+        )
+        template = SMSMessageTemplate(
+            template_model.__dict__,
+            values=notification.personalisation,
+            prefix=service.name,
+            show_prefix=service.prefix_sms,
+        )
+        rendered = str(template)
+        content = content or rendered
+        if rendered != content:
+            continue
+
+        notification.billable_units = template.fragment_count
+        batch[notification.normalised_to] = notification
+
+    return content, batch
+
+
+def get_sms_batch_cache_key(reference):
+    return f"sms-batch-{reference}"
+
+
+def get_notification_id_for_sms_batch_recipient(reference, recipient):
+    if cached := redis_store.get(get_sms_batch_cache_key(reference)):
+        return json.loads(cached).get(recipient.replace("+", ""))
+
+    return None
+
+
+def _record_sms_provider_error(provider):
+    if redis_store.exceeded_rate_limit(
+        f"{provider.name}-error-rate", SMS_PROVIDER_ERROR_THRESHOLD, SMS_PROVIDER_ERROR_INTERVAL
+    ):
+        dao_reduce_sms_provider_priority(provider.name, time_threshold=timedelta(minutes=1))
+        current_app.logger.warning("Error threshold exceeded for provider %s", provider.name)
+
+
 def _get_email_headers(notification: Notification, template: SerialisedTemplate) -> list[dict[str, str]]:
     if unsubscribe_link := notification.get_unsubscribe_link_for_headers(
         template_has_unsubscribe_link=template.has_unsubscribe_link
@@ -133,23 +254,6 @@ def send_email_to_provider(notification):
             template_id=notification.template_id, service_id=service.id, version=notification.template_version
         )
 
-        unsubscribe_link_for_body = notification.get_unsubscribe_link_for_body(
-            template_has_unsubscribe_link=template.has_unsubscribe_link
-        )
-
-        html_email = HTMLEmailTemplate(
-            template.__dict__,
-            values=notification.personalisation,
-            unsubscribe_link=unsubscribe_link_for_body,
-            asset_path=current_app.config["ASSET_PATH"],
-            **get_html_email_options(service),
-        )
-
-        plain_text_email = PlainTextEmailTemplate(
-            template.__dict__,
-            values=notification.personalisation,
-            unsubscribe_link=unsubscribe_link_for_body,
-        )
         created_at = notification.created_at
         key_type = notification.key_type
         if notification.key_type == KEY_TYPE_TEST:
@@ -162,15 +266,26 @@ def send_email_to_provider(notification):
                 f'"{email_sender_name}" <{service.email_sender_local_part}@{current_app.config["NOTIFY_EMAIL_DOMAIN"]}>'
             )
 
-            reference = provider.send_email(
-                from_address=from_address,
-                to_address=notification.normalised_to,
-                subject=plain_text_email.subject,
-                body=str(plain_text_email),
-                html_body=str(html_email),
-                reply_to_address=notification.reply_to_text,
-                headers=_get_email_headers(notification, template),
+            unsubscribe_link_for_body = notification.get_unsubscribe_link_for_body(
+                template_has_unsubscribe_link=template.has_unsubscribe_link
+            )
+            subject, body, html_body = _render_email(
+                template, service, notification.personalisation, unsubscribe_link_for_body
             )
+
+            # as with sms, pull everything we need out of the DB models and end the session before calling the
+            # provider, so a DB connection isn't held open for the duration of the request
+            send_email_kwargs = {
+                "from_address": from_address,
+                "to_address": notification.normalised_to,
+                "subject": subject,
+                "body": body,
+                "html_body": html_body,
+                "reply_to_address": notification.reply_to_text,
+                "headers": _get_email_headers(notification, template),
+            }
+            db.session.close()  # no commit needed as no changes to objects have been made above
+            reference = provider.send_email(**send_email_kwargs)
             notification.reference = reference
             update_notification_to_sending(notification, provider)
         delta_seconds = (datetime.utcnow() - created_at).total_seconds()
@@ -181,6 +296,42 @@ def send_email_to_provider(notification):
             statsd_client.timing("email.live-key.total-time", delta_seconds)
 
 
+# templates with no placeholders and no unsubscribe link render the same for every recipient, so rendering them
+# once per version and branding saves rendering the markdown again for each email sent
+rendered_email_cache = TTLCache(maxsize=64, ttl=60)
+rendered_email_cache_lock = RLock()
+
+
+def _render_email(template, service, personalisation, unsubscribe_link):
+    plain_text_email = PlainTextEmailTemplate(
+        template.__dict__,
+        values=personalisation,
+        unsubscribe_link=unsubscribe_link,
+    )
+
+    cache_key = None
+    if not unsubscribe_link and not plain_text_email.placeholders:
+        cache_key = (template.id, template.version, service.email_branding)
+        with rendered_email_cache_lock:
+            if (rendered := rendered_email_cache.get(cache_key)) is not None:
+                return rendered
+
+    html_email = HTMLEmailTemplate(
+        template.__dict__,
+        values=personalisation,
+        unsubscribe_link=unsubscribe_link,
+        asset_path=current_app.config["ASSET_PATH"],
+        **get_html_email_options(service),
+    )
+    rendered = (plain_text_email.subject, str(plain_text_email), str(html_email))
+
+    if cache_key:
+        with rendered_email_cache_lock:
+            rendered_email_cache[cache_key] = rendered
+
+    return rendered
+
+
 def update_notification_to_sending(notification, provider):
     notification.sent_at = datetime.utcnow()
     notification.sent_by = provider.name
@@ -242,10 +393,21 @@ def get_html_email_options(service):
             "rebrand": True,
         }
     if isinstance(service, SerialisedService):
-        branding = dao_get_email_branding_by_id(service.email_branding)
-    else:
-        branding = service.email_branding
+        return _get_html_email_options_for_branding_id(service.email_branding)
+
+    return _get_html_email_options_for_branding(service.email_branding)
+
+
+email_branding_options_cache = TTLCache(maxsize=1024, ttl=10)
+email_branding_options_cache_lock = RLock()
+
+
+@cached(cache=email_branding_options_cache, lock=email_branding_options_cache_lock)
+def _get_html_email_options_for_branding_id(email_branding_id):
+    return _get_html_email_options_for_branding(dao_get_email_branding_by_id(email_branding_id))
+
 
+def _get_html_email_options_for_branding(branding):
     logo_url = get_logo_url(current_app.config["ADMIN_BASE_URL"], branding.logo) if branding.logo else None
 
     return {
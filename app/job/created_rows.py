@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from flask import current_app
+
+from app import redis_store
+
+JOB_CREATED_ROWS_TTL_SECONDS = int(timedelta(days=2).total_seconds())
+
+
+def job_created_rows_enabled():
+    return current_app.config["JOB_CREATED_ROWS_BITMAP_ENABLED"] and current_app.config["REDIS_ENABLED"]
+
+
+def job_created_rows_key(job_id):
+    return f"job-{job_id}-created-rows"
+
+
+def record_job_rows_created(job_id, row_numbers):
+    """
+    Sets the bit for each row number in a redis bitmap for the job, so check-for-missing-rows-in-completed-jobs can
+    tell which rows have a notification without counting them. Only call this once the notifications are committed.
+    """
+    if not job_created_rows_enabled() or job_id is None or not row_numbers:
+        return
+
+    try:
+        with redis_store.redis_store.pipeline() as pipe:
+            for row_number in row_numbers:
+                pipe.setbit(job_created_rows_key(job_id), row_number, 1)
+            pipe.expire(job_created_rows_key(job_id), JOB_CREATED_ROWS_TTL_SECONDS)
+            pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to record created rows for job %s", job_id)
+
+
+def get_job_rows_not_created(job_id, job_size):
+    """
+    Returns the set of row numbers, out of the first job_size, that don't have a bit set in the job's bitmap. Returns
+    None if there's no bitmap for the job (eg it started before the bitmaps were turned on).
+    """
+    if not job_created_rows_enabled():
+        return None
+
+    try:
+        bitmap = redis_store.redis_store.get(job_created_rows_key(job_id))
+    except Exception:
+        current_app.logger.exception("Failed to get created rows for job %s", job_id)
+        return None
+
+    if bitmap is None:
+        return None
+
+    # redis numbers the bits from the most significant bit of the first byte
+    num_bits = len(bitmap) * 8
+    created_rows = int.from_bytes(bitmap, "big")
+    return {
+        row_number
+        for row_number in range(job_size)
+        if row_number >= num_bits or not (created_rows >> (num_bits - 1 - row_number)) & 1
+    }
@@ -0,0 +1,146 @@
+import csv
+import json
+from collections.abc import Iterator
+from io import StringIO
+
+from notifications_utils.recipients import RecipientCSV, Row
+
+from app import redis_store
+from app.aws import s3
+
+# how much of the job file to fetch from S3 in each ranged GET
+JOB_FILE_RANGE_SIZE_BYTES = 2 * 1024 * 1024
+# how many rows to hand to RecipientCSV for validation at a time
+ROWS_PER_CHUNK = 1000
+
+ROW_OFFSETS_CACHE_TTL_SECONDS = 3 * 24 * 60 * 60
+
+
+class UnstreamableJobFile(Exception):
+    pass
+
+
+class StreamingRecipientCSV:
+    """
+    Reads a job's CSV file from S3 with ranged GETs and yields validated rows lazily, so memory use stays flat
+    regardless of the size of the file.
+
+    Rows are validated by RecipientCSV one chunk at a time, and their indexes are shifted so they match the index
+    each row would have if the whole file were read at once. The byte offset each chunk starts at is cached in redis
+    after a full read, so a later read starting part way through (eg to resume a job or replay missing rows) can
+    start downloading from the nearest chunk instead of the top of the file.
+    """
+
+    def __init__(
+        self,
+        service_id: str,
+        job_id: str,
+        template,
+        range_size: int = JOB_FILE_RANGE_SIZE_BYTES,
+        rows_per_chunk: int = ROWS_PER_CHUNK,
+    ):
+        self.service_id = service_id
+        self.job_id = job_id
+        self.template = template
+        self.range_size = range_size
+        self.rows_per_chunk = rows_per_chunk
+        self.size, self.metadata = s3.get_job_size_and_metadata_from_s3(service_id, job_id)
+        self._position = 0
+        self.header, self.data_start = self._read_header()
+
+    @property
+    def row_offsets_cache_key(self) -> str:
+        return f"job-{self.job_id}-row-byte-offsets"
+
+    def get_rows(self, start_row: int = 0) -> Iterator[Row]:
+        if self.header is None:
+            return
+
+        chunk_index, offset = self._get_nearest_row_offset(start_row)
+        row_offsets = {}
+        chunk = []
+        blank_records = []
+
+        for record, end_offset in self._iter_records(offset):
+            if not any(field.strip() for field in record):
+                # RecipientCSV strips whitespace from the end of the file, so blank rows only count as rows if
+                # something follows them. This also means a chunk never ends with a blank row.
+                blank_records.append(record)
+                continue
+
+            chunk += blank_records
+            chunk.append(record)
+            blank_records = []
+
+            if len(chunk) >= self.rows_per_chunk:
+                yield from self._validate_chunk(chunk, chunk_index, start_row)
+                chunk_index += len(chunk)
+                chunk = []
+                row_offsets[chunk_index] = end_offset
+
+        if chunk:
+            yield from self._validate_chunk(chunk, chunk_index, start_row)
+
+        if offset == self.data_start and row_offsets:
+            redis_store.set(self.row_offsets_cache_key, json.dumps(row_offsets), ex=ROW_OFFSETS_CACHE_TTL_SECONDS)
+
+    def _read_header(self) -> tuple[list[str] | None, int | None]:
+        try:
+            for record, end_offset in self._iter_records(0):
+                if any(field.strip() for field in record):
+                    return record, end_offset
+        except csv.Error as e:
+            # most likely a file with bare carriage return line endings, which we can only split up after reading
+            # the whole thing
+            raise UnstreamableJobFile(f"Could not read header of job {self.job_id}") from e
+
+        return None, None
+
+    def _get_nearest_row_offset(self, start_row: int) -> tuple[int, int]:
+        nearest = (0, self.data_start)
+
+        if start_row > 0 and (cached := redis_store.get(self.row_offsets_cache_key)):
+            for row_index, offset in json.loads(cached).items():
+                if nearest[0] < int(row_index) <= start_row:
+                    nearest = (int(row_index), offset)
+
+        return nearest
+
+    def _validate_chunk(self, records: list[list[str]], first_index: int, start_row: int) -> Iterator[Row]:
+        if first_index + len(records) <= start_row:
+            return
+
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.header)
+        writer.writerows(records)
+
+        for row in RecipientCSV(buffer.getvalue(), template=self.template).get_rows():
+            row.index += first_index
+            if row.index >= start_row:
+                yield row
+
+    def _iter_records(self, offset: int) -> Iterator[tuple[list[str], int]]:
+        reader = csv.reader(self._iter_lines(offset), quoting=csv.QUOTE_MINIMAL, skipinitialspace=True)
+        for record in reader:
+            # csv.reader doesn't read ahead, so this is the offset just after the end of this record
+            yield record, self._position
+
+    def _iter_lines(self, offset: int) -> Iterator[str]:
+        self._position = offset
+        remainder = b""
+
+        while offset < self.size:
+            last_byte = min(offset + self.range_size, self.size) - 1
+            data = remainder + s3.get_job_byte_range_from_s3(self.service_id, self.job_id, offset, last_byte)
+            offset = last_byte + 1
+
+            # splitting the raw bytes on \n is safe as no other utf-8 character contains that byte
+            *lines, remainder = data.split(b"\n")
+            for line in lines:
+                self._position += len(line) + 1
+                yield line.decode("utf-8") + "\n"
+
+        if remainder:
+            self._position += len(remainder)
+            yield remainder.decode("utf-8")
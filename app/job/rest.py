@@ -21,6 +21,7 @@ from app.dao.jobs_dao import (
     dao_get_scheduled_job_by_id_and_service_id,
     dao_get_scheduled_job_stats,
     dao_update_job,
+    get_live_notification_outcomes_for_job,
     get_possibly_cached_notification_outcomes_for_job,
 )
 from app.dao.notifications_dao import (
@@ -48,10 +49,15 @@ register_errors(job_blueprint)
 @job_blueprint.route("/<job_id>", methods=["GET"])
 def get_job_by_service_and_job_id(service_id, job_id):
     job = dao_get_job_by_service_id_and_job_id(service_id, job_id)
-    statistics = dao_get_notification_outcomes_for_job(job_id)
     data = job_schema.dump(job)
 
-    data["statistics"] = [{"status": statistic[1], "count": statistic[0]} for statistic in statistics]
+    statistics = get_live_notification_outcomes_for_job(job_id, job.notification_count, job.processing_started)
+    if statistics is None:
+        statistics = [
+            {"status": statistic[1], "count": statistic[0]}
+            for statistic in dao_get_notification_outcomes_for_job(job_id)
+        ]
+    data["statistics"] = statistics
 
     return jsonify(data=data)
 
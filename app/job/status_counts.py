@@ -0,0 +1,76 @@
+from collections import Counter
+from datetime import timedelta
+
+from flask import current_app
+
+from app import redis_store
+
+JOB_STATUS_COUNTS_TTL_SECONDS = int(timedelta(days=3).total_seconds())
+
+
+def job_status_counts_enabled():
+    return current_app.config["JOB_STATUS_COUNTS_ENABLED"] and current_app.config["REDIS_ENABLED"]
+
+
+def job_status_counts_key(job_id):
+    return f"job-{job_id}-status-counts"
+
+
+def record_job_status_changes(changes):
+    """
+    Keeps a redis hash of notification counts by status for each job, so the admin can show a job's progress without
+    counting its notifications.
+
+    Takes (job_id, old_status, new_status) for each notification that was created (with an old_status of None),
+    changed status or was deleted (with a new_status of None). Notifications that aren't part of a job are ignored.
+    """
+    if not job_status_counts_enabled():
+        return
+
+    counts = _count_job_status_changes(changes)
+    if not any(counts.values()):
+        return
+
+    try:
+        with redis_store.redis_store.pipeline() as pipe:
+            for (job_id, status), count in counts.items():
+                if count:
+                    pipe.hincrby(job_status_counts_key(job_id), status, count)
+            for job_id in {job_id for job_id, _ in counts}:
+                pipe.expire(job_status_counts_key(job_id), JOB_STATUS_COUNTS_TTL_SECONDS)
+            pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to record job status changes")
+
+
+def _count_job_status_changes(changes):
+    counts = Counter()
+    for job_id, old_status, new_status in changes:
+        if job_id is None or old_status == new_status:
+            continue
+        if old_status is not None:
+            counts[(str(job_id), old_status)] -= 1
+        if new_status is not None:
+            counts[(str(job_id), new_status)] += 1
+    return counts
+
+
+def get_job_status_counts(job_id):
+    """
+    Returns [{"status": ..., "count": ...}] from the job's redis hash, or None if there's nothing recorded for it.
+    """
+    if not job_status_counts_enabled():
+        return None
+
+    try:
+        counts = redis_store.redis_store.hgetall(job_status_counts_key(job_id))
+    except Exception:
+        current_app.logger.exception("Failed to get status counts for job %s", job_id)
+        return None
+
+    if not counts:
+        return None
+
+    return [
+        {"status": status.decode(), "count": int(count)} for status, count in sorted(counts.items()) if int(count) > 0
+    ]
@@ -7,6 +7,7 @@ from app.errors import InvalidRequest, register_errors
 from app.letter_attachment.schema import post_archive_letter_attachment_schema, post_create_letter_attachment_schema
 from app.models import LetterAttachment
 from app.schema_validation import validate
+from app.serialised_models import invalidate_serialised_models
 
 letter_attachment_blueprint = Blueprint("letter_attachment", __name__)
 register_errors(letter_attachment_blueprint)
@@ -41,6 +42,7 @@ def create_letter_attachment():
 
     # need to call this function so it creates a new template history version
     dao_update_template(template)
+    invalidate_serialised_models(template.service_id, template.id)
 
     return jsonify(letter_attachment.serialize()), 201
 
@@ -58,5 +60,6 @@ def archive_letter_attachment(letter_attachment_id):
     letter_attachment.archived_at = datetime.datetime.utcnow()
     letter_attachment.archived_by_id = data["archived_by"]
     dao_update_template(template)
+    invalidate_serialised_models(template.service_id, template.id)
 
     return "", 204
@@ -57,6 +57,17 @@ def find_letter_pdf_in_s3(notification):
     return item
 
 
+def get_letter_pdf_from_s3(s3_client, bucket_name, prefix):
+    """
+    Like find_letter_pdf_in_s3, but takes an S3 client (which, unlike a resource, can be shared between threads) and
+    the bucket and prefix from get_bucket_name_and_prefix_for_notification, and returns the PDF's bytes.
+    """
+    response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix, MaxKeys=1)
+    if not response.get("Contents"):
+        raise LetterPDFNotFound(f"File not found in bucket {bucket_name} with prefix {prefix}")
+    return s3_client.get_object(Bucket=bucket_name, Key=response["Contents"][0]["Key"])["Body"].read()
+
+
 def generate_letter_pdf_filename(reference, created_at, ignore_folder=False, postage=NETHERLANDS):
     upload_file_name = LETTERS_PDF_FILE_LOCATION_STRUCTURE.format(
         folder="" if ignore_folder else get_folder_name(created_at),
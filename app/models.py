@@ -862,6 +862,8 @@ class ServiceCallbackApi(db.Model, Versioned):
     updated_at = db.Column(db.DateTime, nullable=True)
     updated_by = db.relationship("User")
     updated_by_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), index=True, nullable=False)
+    # send delivery status callbacks to this endpoint in batches, as JSON arrays, which the endpoint has to accept
+    batch_callbacks = db.Column(db.Boolean, nullable=False, default=False)
 
     __table_args__ = (UniqueConstraint("service_id", "callback_type", name="uix_service_callback_type"),)
 
@@ -884,6 +886,7 @@ class ServiceCallbackApi(db.Model, Versioned):
             "updated_by_id": str(self.updated_by_id),
             "created_at": self.created_at.strftime(DATETIME_FORMAT),
             "updated_at": get_dt_string_or_none(self.updated_at),
+            "batch_callbacks": self.batch_callbacks,
         }
 
 
@@ -1427,6 +1430,8 @@ class Notification(db.Model):
         Index("ix_notifications_notification_type_composite", "notification_type", "status", "created_at"),
         Index("ix_notifications_service_created_at", "service_id", "created_at"),
         Index("ix_notifications_service_id_ntype_created_at", "service_id", "notification_type", "created_at"),
+        Index("ix_notifications_service_id_normalised_to", "service_id", "normalised_to"),
+        Index("ix_notifications_updated_at", "updated_at"),
         # unsubscribe_link value should be null for non-email notifications
         CheckConstraint(
             "notification_type = 'email' OR unsubscribe_link is null",
@@ -1527,6 +1532,10 @@ class Notification(db.Model):
 
     @property
     def formatted_status(self):
+        return self.format_status(self.template.template_type, self.status)
+
+    @staticmethod
+    def format_status(template_type, status):
         return {
             "email": {
                 "failed": "Failed",
@@ -1556,7 +1565,7 @@ class Notification(db.Model):
                 "delivered": "Received",
                 "returned-letter": "Returned",
             },
-        }[self.template.template_type].get(self.status, self.status)
+        }[template_type].get(status, status)
 
     def get_letter_status(self):
         """
@@ -1607,6 +1616,26 @@ class Notification(db.Model):
 
         return serialized
 
+    @classmethod
+    def serialize_row_for_csv(cls, row):
+        """
+        Like serialize_for_csv, but for a row from get_notifications_for_service_for_csv rather than a Notification
+        """
+        return {
+            "id": row.id,
+            "row_number": "" if row.job_row_number is None else row.job_row_number + 1,
+            "recipient": row.to,
+            "client_reference": row.client_reference or "",
+            "template_name": row.template_name,
+            "template_type": row.template_type,
+            "job_name": row.job_name or "",
+            "status": cls.format_status(row.template_type, row.status),
+            "created_at": utc_string_to_bst_string(row.created_at),
+            "created_by_name": row.created_by_name,
+            "created_by_email_address": row.created_by_email_address,
+            "api_key_name": row.api_key_name,
+        }
+
     def serialize(self):
         template_dict = {"version": self.template.version, "id": self.template.id, "uri": self.template.get_link()}
 
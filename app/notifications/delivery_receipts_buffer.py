@@ -0,0 +1,28 @@
+import json
+
+from flask import current_app
+
+from app import redis_store
+
+DELIVERY_RECEIPTS_BUFFER_KEY = "delivery-receipts-buffer"
+
+
+def delivery_receipts_buffer_enabled():
+    return current_app.config["BUFFER_DELIVERY_RECEIPTS_ENABLED"] and current_app.config["REDIS_ENABLED"]
+
+
+def buffer_delivery_receipts(receipts):
+    """
+    Adds delivery receipts to a redis list for apply-buffered-delivery-receipts to apply in bulk, rather than queueing
+    a task to update each notification on its own.
+    """
+    redis_store.redis_store.rpush(DELIVERY_RECEIPTS_BUFFER_KEY, *(json.dumps(receipt) for receipt in receipts))
+
+
+def pop_buffered_delivery_receipts(count):
+    with redis_store.redis_store.pipeline() as pipe:
+        pipe.lrange(DELIVERY_RECEIPTS_BUFFER_KEY, 0, count - 1)
+        pipe.ltrim(DELIVERY_RECEIPTS_BUFFER_KEY, count, -1)
+        receipts, _ = pipe.execute()
+
+    return [json.loads(receipt) for receipt in receipts]
@@ -11,7 +11,7 @@ from app import signing
 from app.celery.process_letter_client_response_tasks import process_letter_callback_data
 from app.celery.service_callback_tasks import (
     create_delivery_status_callback_data,
-    send_delivery_status_to_service,
+    queue_delivery_status_callback,
 )
 from app.config import QueueNames
 from app.constants import DVLA_NOTIFICATION_DISPATCHED, DVLA_NOTIFICATION_REJECTED
@@ -209,6 +209,4 @@ def check_and_queue_callback_task(notification):
     service_callback_api = get_delivery_status_callback_api_for_service(service_id=notification.service_id)
     if service_callback_api:
         notification_data = create_delivery_status_callback_data(notification, service_callback_api)
-        send_delivery_status_to_service.apply_async(
-            [str(notification.id), notification_data], queue=QueueNames.CALLBACKS
-        )
+        queue_delivery_status_callback(notification.id, notification_data, service_callback_api)
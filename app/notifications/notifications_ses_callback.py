@@ -1,10 +1,11 @@
 from flask import current_app
 
+from app import notify_celery
 from app.celery.service_callback_tasks import (
     create_complaint_callback_data,
     create_delivery_status_callback_data,
+    queue_delivery_status_callback,
     send_complaint_to_service,
-    send_delivery_status_to_service,
 )
 from app.config import QueueNames
 from app.dao.complaint_dao import save_complaint
@@ -73,9 +74,26 @@ def check_and_queue_callback_task(notification):
     service_callback_api = get_delivery_status_callback_api_for_service(service_id=notification.service_id)
     if service_callback_api:
         notification_data = create_delivery_status_callback_data(notification, service_callback_api)
-        send_delivery_status_to_service.apply_async(
-            [str(notification.id), notification_data], queue=QueueNames.CALLBACKS
-        )
+        queue_delivery_status_callback(notification.id, notification_data, service_callback_api)
+
+
+def check_and_queue_callback_tasks(notifications):
+    """
+    Bulk version of check_and_queue_callback_task, looking up each service's callback api once and queueing all the
+    callbacks over the same connection to the broker.
+    """
+    service_callback_apis = {}
+    with notify_celery.producer_or_acquire() as producer:
+        for notification in notifications:
+            if notification.service_id not in service_callback_apis:
+                service_callback_apis[notification.service_id] = get_delivery_status_callback_api_for_service(
+                    service_id=notification.service_id
+                )
+            if service_callback_api := service_callback_apis[notification.service_id]:
+                notification_data = create_delivery_status_callback_data(notification, service_callback_api)
+                queue_delivery_status_callback(
+                    notification.id, notification_data, service_callback_api, producer=producer
+                )
 
 
 def _check_and_queue_complaint_callback_task(complaint, notification, recipient):
@@ -4,7 +4,10 @@ from app.celery.process_sms_client_response_tasks import (
     process_sms_client_response,
 )
 from app.config import QueueNames
+from app.constants import SMS_TYPE
+from app.delivery.send_to_providers import get_notification_id_for_sms_batch_recipient
 from app.errors import InvalidRequest, register_errors
+from app.notifications.delivery_receipts_buffer import buffer_delivery_receipts, delivery_receipts_buffer_enabled
 
 sms_callback_blueprint = Blueprint("sms_callback", __name__, url_prefix="/notifications/sms")
 register_errors(sms_callback_blueprint)
@@ -23,10 +26,7 @@ def process_mmg_response():
 
     provider_reference = data.get("CID")
 
-    process_sms_client_response.apply_async(
-        [status, provider_reference, client_name, detailed_status_code],
-        queue=QueueNames.SMS_CALLBACKS,
-    )
+    _queue_sms_client_response(status, provider_reference, client_name, detailed_status_code)
 
     return jsonify(result="success"), 200
 
@@ -42,10 +42,7 @@ def process_firetext_response():
     detailed_status_code = request.form.get("code")
     provider_reference = request.form.get("reference")
 
-    process_sms_client_response.apply_async(
-        [status, provider_reference, client_name, detailed_status_code],
-        queue=QueueNames.SMS_CALLBACKS,
-    )
+    _queue_sms_client_response(status, provider_reference, client_name, detailed_status_code)
 
     return jsonify(result="success"), 200
 
@@ -60,14 +57,39 @@ def process_spryng_response():
     status = request.args.get("STATUS")
     detailed_status_code = request.args.get("REASONCODE")
     provider_reference = request.args.get("REFERENCE")
+    if recipient := request.args.get("RECIPIENT"):
+        # messages sent in a batch share a reference, so look up which notification went to this recipient
+        provider_reference = (
+            get_notification_id_for_sms_batch_recipient(provider_reference, recipient) or provider_reference
+        )
 
-    process_sms_client_response.apply_async(
-        [status, provider_reference, client_name, detailed_status_code], queue=QueueNames.SMS_CALLBACKS
-    )
+    _queue_sms_client_response(status, provider_reference, client_name, detailed_status_code)
 
     return jsonify(result="success"), 200
 
 
+def _queue_sms_client_response(status, provider_reference, client_name, detailed_status_code):
+    # firetext receipts need the notification's current status to tell permanent from temporary failures, so are
+    # always processed one at a time
+    if client_name != "Firetext" and delivery_receipts_buffer_enabled():
+        buffer_delivery_receipts(
+            [
+                {
+                    "notification_type": SMS_TYPE,
+                    "status": status,
+                    "reference": provider_reference,
+                    "client_name": client_name,
+                    "detailed_status_code": detailed_status_code,
+                }
+            ]
+        )
+    else:
+        process_sms_client_response.apply_async(
+            [status, provider_reference, client_name, detailed_status_code],
+            queue=QueueNames.SMS_CALLBACKS,
+        )
+
+
 def validate_callback_data(data, fields, client_name):
     errors = []
     for f in fields:
@@ -1,4 +1,5 @@
 import uuid
+from collections import Counter, defaultdict
 from datetime import datetime
 
 from flask import current_app
@@ -14,7 +15,7 @@ from notifications_utils.template import (
     SMSMessageTemplate,
 )
 
-from app import redis_store
+from app import notify_celery, redis_store
 from app.celery import provider_tasks
 from app.celery.letters_pdf_tasks import get_pdf_for_templated_letter
 from app.config import QueueNames
@@ -29,9 +30,12 @@ from app.constants import (
 )
 from app.dao.notifications_dao import (
     dao_create_notification,
+    dao_create_notifications_in_bulk,
     dao_delete_notifications_by_id,
 )
+from app.job.created_rows import record_job_rows_created
 from app.models import Notification
+from app.notifications.service_limits import take_daily_limit_reservation
 from app.utils import parse_and_format_phone_number
 from app.v2.errors import BadRequestError, QrCodeTooLongError
 
@@ -90,7 +94,7 @@ def check_placeholders(template_object):
         raise BadRequestError(fields=[{"template": message}], message=message)
 
 
-def persist_notification(
+def build_notification(
     *,
     template_id,
     template_version,
@@ -106,12 +110,10 @@ def persist_notification(
     reference=None,
     client_reference=None,
     notification_id=None,
-    simulated=False,
     created_by_id=None,
     status=NOTIFICATION_CREATED,
     reply_to_text=None,
     unsubscribe_link=None,
-    template_has_unsubscribe_link=False,
     billable_units=None,
     postage=None,
     document_download_count=None,
@@ -158,14 +160,94 @@ def persist_notification(
         notification.international = postage in INTERNATIONAL_POSTAGE_TYPES
         notification.normalised_to = "".join(notification.to.split()).lower()
 
+    return notification
+
+
+def persist_notification(
+    *,
+    template_id,
+    template_version,
+    recipient,
+    service,
+    personalisation,
+    notification_type,
+    api_key_id,
+    key_type,
+    created_at=None,
+    job_id=None,
+    job_row_number=None,
+    reference=None,
+    client_reference=None,
+    notification_id=None,
+    simulated=False,
+    created_by_id=None,
+    status=NOTIFICATION_CREATED,
+    reply_to_text=None,
+    unsubscribe_link=None,
+    template_has_unsubscribe_link=False,
+    billable_units=None,
+    postage=None,
+    document_download_count=None,
+    updated_at=None,
+):
+    notification = build_notification(
+        template_id=template_id,
+        template_version=template_version,
+        recipient=recipient,
+        service=service,
+        personalisation=personalisation,
+        notification_type=notification_type,
+        api_key_id=api_key_id,
+        key_type=key_type,
+        created_at=created_at,
+        job_id=job_id,
+        job_row_number=job_row_number,
+        reference=reference,
+        client_reference=client_reference,
+        notification_id=notification_id,
+        created_by_id=created_by_id,
+        status=status,
+        reply_to_text=reply_to_text,
+        unsubscribe_link=unsubscribe_link,
+        billable_units=billable_units,
+        postage=postage,
+        document_download_count=document_download_count,
+        updated_at=updated_at,
+    )
+
     # if simulated create a Notification model to return but do not persist the Notification to the dB
     if not simulated:
         dao_create_notification(notification)
         increment_daily_limit_caches(service, notification, key_type)
+        if job_id is not None and job_row_number is not None:
+            record_job_rows_created(job_id, [job_row_number])
 
     return notification
 
 
+def persist_notifications_in_bulk(notifications, service, key_type):
+    """
+    Persist notifications built with `build_notification` using a single multi-row insert, and bump the daily
+    limit counters once for the whole batch.
+
+    Notifications that already exist (eg because the broker delivered the same batch twice) are skipped. Returns
+    only the notifications that were actually inserted, so callers don't queue them for delivery a second time.
+    """
+    inserted_ids = dao_create_notifications_in_bulk(notifications)
+    saved_notifications = [notification for notification in notifications if str(notification.id) in inserted_ids]
+
+    increment_daily_limit_caches_in_bulk(service, saved_notifications, key_type)
+
+    row_numbers_by_job_id = defaultdict(list)
+    for notification in saved_notifications:
+        if notification.job_id is not None and notification.job_row_number is not None:
+            row_numbers_by_job_id[notification.job_id].append(notification.job_row_number)
+    for job_id, row_numbers in row_numbers_by_job_id.items():
+        record_job_rows_created(job_id, row_numbers)
+
+    return saved_notifications
+
+
 def increment_daily_limit_caches(service, notification, key_type):
     if key_type == KEY_TYPE_TEST or not current_app.config["REDIS_ENABLED"]:
         return
@@ -176,16 +258,39 @@ def increment_daily_limit_caches(service, notification, key_type):
         increment_daily_limit_cache(service.id, INTERNATIONAL_SMS_TYPE)
 
 
-def increment_daily_limit_cache(service_id, notification_type):
+def increment_daily_limit_caches_in_bulk(service, notifications, key_type):
+    if key_type == KEY_TYPE_TEST or not current_app.config["REDIS_ENABLED"]:
+        return
+
+    counts = Counter(notification.notification_type for notification in notifications)
+    counts[INTERNATIONAL_SMS_TYPE] = sum(
+        1
+        for notification in notifications
+        if notification.notification_type == SMS_TYPE and str(notification.phone_prefix) != NL_PREFIX
+    )
+
+    for notification_type, count in counts.items():
+        if count:
+            increment_daily_limit_cache(service.id, notification_type, by=count)
+
+
+def increment_daily_limit_cache(service_id, notification_type, by=1):
+    # anything already counted by `reserve_service_limits` for this request doesn't need counting again
+    by -= take_daily_limit_reservation(service_id, notification_type, by)
+    if not by:
+        return
+
     cache_key = redis.daily_limit_cache_key(service_id, notification_type=notification_type)
     if redis_store.get(cache_key) is None:
-        # if cache does not exist set the cache to 1 with an expiry of 24 hours,
+        # if cache does not exist set the cache to the count with an expiry of 24 hours,
         # The cache should be set by the time we create the notification
         # but in case it is this will make sure the expiry is set to 24 hours,
         # where if we let the incr method create the cache it will be set a ttl.
-        redis_store.set(cache_key, 1, ex=86400)
-    else:
+        redis_store.set(cache_key, by, ex=86400)
+    elif by == 1:
         redis_store.incr(cache_key)
+    else:
+        redis_store.incrby(cache_key, by)
 
 
 def send_notification_to_queue_detached(key_type, notification_type, notification_id, queue=None):
@@ -214,6 +319,31 @@ def send_notification_to_queue_detached(key_type, notification_type, notificatio
     current_app.logger.debug("%s %s sent to the %s queue for delivery", notification_type, notification_id, queue)
 
 
+def send_notifications_to_queue_in_bulk(key_type, notification_type, notification_ids):
+    """
+    Queues delivery of many sms or email notifications over one broker connection. If queueing fails part way
+    through, the notifications that weren't queued are deleted, as `send_notification_to_queue_detached` does.
+    """
+    if key_type == KEY_TYPE_TEST:
+        queue = QueueNames.RESEARCH_MODE
+    else:
+        queue = QueueNames.SEND_SMS if notification_type == SMS_TYPE else QueueNames.SEND_EMAIL
+    deliver_task = provider_tasks.deliver_sms if notification_type == SMS_TYPE else provider_tasks.deliver_email
+
+    queued = 0
+    try:
+        with notify_celery.producer_or_acquire() as producer:
+            for notification_id in notification_ids:
+                deliver_task.apply_async([str(notification_id)], queue=queue, producer=producer)
+                queued += 1
+    except Exception:
+        for notification_id in notification_ids[queued:]:
+            dao_delete_notifications_by_id(notification_id)
+        raise
+
+    current_app.logger.debug("%s %s notifications sent to the %s queue for delivery", queued, notification_type, queue)
+
+
 def send_notification_to_queue(notification, queue=None):
     send_notification_to_queue_detached(notification.key_type, notification.notification_type, notification.id, queue)
 
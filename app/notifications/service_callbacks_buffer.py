@@ -0,0 +1,95 @@
+import functools
+import hashlib
+
+from flask import current_app
+
+from app import memo_resetters, redis_store
+
+# the set of buffer keys that have delivery status callbacks waiting to be sent
+BUFFERED_SERVICE_CALLBACKS_KEY = "delivery-status-callbacks-buffers"
+
+# how long a callback batch holds one of its endpoint's slots, so a slot is freed even if its task never releases it
+SERVICE_CALLBACK_SLOT_TTL_SECONDS = 60
+
+# Pops up to ARGV[1] items from the buffer in KEYS[1], removing the buffer (ARGV[2]) from the set in KEYS[2] if that
+# empties it. Doing both atomically means a callback can't be buffered between the two and then never sent.
+POP_BUFFERED_SERVICE_CALLBACKS_SCRIPT = """
+local items = redis.call("LRANGE", KEYS[1], 0, tonumber(ARGV[1]) - 1)
+redis.call("LTRIM", KEYS[1], #items, -1)
+if redis.call("LLEN", KEYS[1]) == 0 then
+    redis.call("SREM", KEYS[2], ARGV[2])
+end
+return items
+"""
+
+
+# registered the first time it's needed rather than on every call, as redis_store isn't set up until the app is
+@functools.cache
+def get_pop_buffered_service_callbacks_script():
+    return redis_store.redis_store.register_script(POP_BUFFERED_SERVICE_CALLBACKS_SCRIPT)
+
+
+memo_resetters.append(lambda: get_pop_buffered_service_callbacks_script.cache_clear())
+
+
+def service_callbacks_buffer_enabled(service_callback_api):
+    return service_callback_api.batch_callbacks and current_app.config["REDIS_ENABLED"]
+
+
+def service_callbacks_buffer_key(service_callback_api_url, service_callback_api_bearer_token):
+    # callbacks are sent in batches to each url and bearer token, without putting either in a redis key
+    endpoint = hashlib.sha256(f"{service_callback_api_url}\n{service_callback_api_bearer_token}".encode()).hexdigest()
+    return f"delivery-status-callbacks-buffer-{endpoint}"
+
+
+def buffer_delivery_status_callback(service_callback_api, encoded_status_update):
+    """
+    Adds a delivery status callback to a redis list for its endpoint, for send-buffered-delivery-status-callbacks to
+    send along with any others to the same endpoint, rather than queueing a task to send it on its own.
+    """
+    buffer_key = service_callbacks_buffer_key(service_callback_api.url, service_callback_api.bearer_token)
+    with redis_store.redis_store.pipeline() as pipe:
+        pipe.rpush(buffer_key, encoded_status_update)
+        pipe.sadd(BUFFERED_SERVICE_CALLBACKS_KEY, buffer_key)
+        pipe.execute()
+
+
+def return_delivery_status_callbacks_to_buffer(buffer_key, encoded_status_updates):
+    """
+    Puts a batch that couldn't be sent back at the front of its buffer, so it's sent before callbacks buffered since.
+    """
+    with redis_store.redis_store.pipeline() as pipe:
+        # LPUSH adds each item to the front in turn, so push them in reverse to keep the batch in order
+        pipe.lpush(buffer_key, *reversed(encoded_status_updates))
+        pipe.sadd(BUFFERED_SERVICE_CALLBACKS_KEY, buffer_key)
+        pipe.execute()
+
+
+def get_service_callbacks_buffer_keys():
+    return [buffer_key.decode() for buffer_key in redis_store.redis_store.smembers(BUFFERED_SERVICE_CALLBACKS_KEY)]
+
+
+def pop_buffered_delivery_status_callbacks(buffer_key, count):
+    encoded_status_updates = get_pop_buffered_service_callbacks_script()(
+        keys=[buffer_key, BUFFERED_SERVICE_CALLBACKS_KEY], args=[count, buffer_key]
+    )
+    return [encoded_status_update.decode() for encoded_status_update in encoded_status_updates]
+
+
+def acquire_service_callback_slot(buffer_key):
+    """
+    Takes one of the endpoint's SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT slots, returning its key to release it
+    with, or None if they're all in use so a slow endpoint can't tie up every callbacks worker.
+
+    Each slot is its own key with its own expiry, so a slot a task never released is freed after
+    SERVICE_CALLBACK_SLOT_TTL_SECONDS however busy the endpoint is.
+    """
+    for slot in range(current_app.config["SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT"]):
+        slot_key = f"{buffer_key}-slot-{slot}"
+        if redis_store.redis_store.set(slot_key, 1, nx=True, ex=SERVICE_CALLBACK_SLOT_TTL_SECONDS):
+            return slot_key
+    return None
+
+
+def release_service_callback_slot(slot_key):
+    redis_store.redis_store.delete(slot_key)
@@ -0,0 +1,183 @@
+import functools
+import time
+import uuid
+from collections import Counter
+
+from flask import current_app, g
+from gds_metrics.metrics import Histogram
+from notifications_utils.clients.redis import (
+    daily_limit_cache_key,
+    rate_limit_cache_key,
+)
+
+from app import memo_resetters, redis_store
+from app.constants import (
+    EMAIL_TYPE,
+    INTERNATIONAL_SMS_TYPE,
+    KEY_TYPE_TEST,
+    LETTER_TYPE,
+    MESSAGEBOX_TYPE,
+    SMS_TYPE,
+)
+from app.v2.errors import RateLimitError, TooManyRequestsError
+
+REDIS_RESERVE_SERVICE_LIMITS_DURATION_SECONDS = Histogram(
+    "redis_reserve_service_limits_duration_seconds",
+    "Time taken to check rate and daily limits and count a request against them",
+)
+
+API_RATE_LIMIT_INTERVAL_SECONDS = 60
+DAILY_LIMIT_TTL_SECONDS = 86400
+
+# Checks the api rate limit and any number of daily limits, then counts the notifications against all of them, all
+# atomically so concurrent requests can't each see room under a limit and then all go over it together. Each
+# notification counts against the rate limit, so a bulk request can't send more than a service's rate limit allows.
+#
+# KEYS[1] is the rate limit sorted set, KEYS[2..n] the daily limit counters.
+# ARGV is now (in seconds, as a float), the rate limit (or -1 to skip it), the rate limit interval (in seconds), the
+# number of notifications, the daily limit ttl, a nonce unique to this request, and then the limit for each daily limit
+# counter. The rate limit set is scored in seconds like RedisClient.exceeded_rate_limit, which shares the same key, and
+# the nonce keeps members from concurrent requests at the same moment from overwriting each other.
+#
+# Returns 0 if nothing was exceeded, -1 if the rate limit was, or the (1-based) position of the daily limit that was.
+RESERVE_SERVICE_LIMITS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate_limit = tonumber(ARGV[2])
+local interval = tonumber(ARGV[3])
+local count = tonumber(ARGV[4])
+local daily_limit_ttl = tonumber(ARGV[5])
+local nonce = ARGV[6]
+
+if rate_limit >= 0 then
+    local members = {}
+    for i = 1, count do
+        members[2 * i - 1] = ARGV[1]
+        members[2 * i] = nonce .. "-" .. i
+    end
+    redis.call("ZADD", KEYS[1], unpack(members))
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - interval)
+    local requests = redis.call("ZCARD", KEYS[1])
+    redis.call("EXPIRE", KEYS[1], interval)
+    if requests > rate_limit then
+        return -1
+    end
+end
+
+for i = 2, #KEYS do
+    local sent = tonumber(redis.call("GET", KEYS[i]) or "0")
+    if sent + count > tonumber(ARGV[5 + i]) then
+        return i - 1
+    end
+end
+
+for i = 2, #KEYS do
+    redis.call("SET", KEYS[i], 0, "EX", daily_limit_ttl, "NX")
+    redis.call("INCRBY", KEYS[i], count)
+end
+
+return 0
+"""
+
+
+# registered the first time it's needed rather than on every call, as redis_store isn't set up until the app is
+@functools.cache
+def get_reserve_service_limits_script():
+    return redis_store.redis_store.register_script(RESERVE_SERVICE_LIMITS_SCRIPT)
+
+
+memo_resetters.append(lambda: get_reserve_service_limits_script.cache_clear())
+
+
+def get_daily_limit(service, notification_type):
+    return {
+        EMAIL_TYPE: service.email_message_limit,
+        SMS_TYPE: service.sms_message_limit,
+        INTERNATIONAL_SMS_TYPE: service.international_sms_message_limit,
+        LETTER_TYPE: service.letter_message_limit,
+        MESSAGEBOX_TYPE: service.messagebox_message_limit,
+    }[notification_type]
+
+
+def reserve_service_limits(service, key_type, notification_types, num_notifications=1, check_api_rate_limit=True):
+    """
+    Checks the service's API rate limit and its daily limit for each of `notification_types`, and counts
+    `num_notifications` against those daily limits, in a single redis round trip.
+
+    The counts are held as reservations until `persist_notification` uses them up. Anything not used up by the end of
+    the app context (eg because the request failed validation, or the recipient was simulated) is handed back by
+    `release_daily_limit_reservations`.
+    """
+    check_api_rate_limit = check_api_rate_limit and current_app.config["API_RATE_LIMIT_ENABLED"]
+    daily_limit_types = [] if key_type == KEY_TYPE_TEST else list(notification_types)
+
+    if not current_app.config["REDIS_ENABLED"] or not (check_api_rate_limit or daily_limit_types):
+        return
+
+    try:
+        with REDIS_RESERVE_SERVICE_LIMITS_DURATION_SECONDS.time():
+            exceeded = get_reserve_service_limits_script()(
+                keys=[rate_limit_cache_key(service.id, key_type)]
+                + [
+                    daily_limit_cache_key(service.id, notification_type=notification_type)
+                    for notification_type in daily_limit_types
+                ],
+                args=[
+                    time.time(),
+                    service.rate_limit if check_api_rate_limit else -1,
+                    API_RATE_LIMIT_INTERVAL_SECONDS,
+                    num_notifications,
+                    DAILY_LIMIT_TTL_SECONDS,
+                    str(uuid.uuid4()),
+                ]
+                + [get_daily_limit(service, notification_type) for notification_type in daily_limit_types],
+            )
+    except Exception:
+        # like the rest of our redis usage, don't stop services sending if redis is unavailable
+        current_app.logger.exception("Failed to check rate and daily limits for service %s", service.id)
+        return
+
+    if exceeded == -1:
+        current_app.logger.info("service %s has been rate limited for throughput", service.id)
+        raise RateLimitError(service.rate_limit, API_RATE_LIMIT_INTERVAL_SECONDS, key_type)
+
+    if exceeded:
+        limit_name = daily_limit_types[exceeded - 1]
+        limit_value = get_daily_limit(service, limit_name)
+        current_app.logger.info(
+            "service %s has been rate limited for %s daily use limit %s", service.id, limit_name, limit_value
+        )
+        raise TooManyRequestsError(limit_name, limit_value)
+
+    reservations = g.setdefault("daily_limit_reservations", Counter())
+    for notification_type in daily_limit_types:
+        reservations[(str(service.id), notification_type)] += num_notifications
+
+
+def take_daily_limit_reservation(service_id, notification_type, count):
+    """
+    Uses up to `count` of the notifications already counted against a daily limit by `reserve_service_limits`, and
+    returns how many were used so the caller only needs to count the rest.
+    """
+    reservations = g.get("daily_limit_reservations")
+    if not reservations:
+        return 0
+
+    key = (str(service_id), notification_type)
+    taken = min(reservations[key], count)
+    reservations[key] -= taken
+    return taken
+
+
+def release_daily_limit_reservations():
+    reservations = g.pop("daily_limit_reservations", None)
+    if not reservations or not any(reservations.values()):
+        return
+
+    try:
+        with redis_store.redis_store.pipeline() as pipe:
+            for (service_id, notification_type), count in reservations.items():
+                if count:
+                    pipe.decrby(daily_limit_cache_key(service_id, notification_type=notification_type), count)
+            pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to release daily limit reservations")
@@ -1,3 +1,5 @@
+import time
+
 from flask import current_app
 from gds_metrics.metrics import Histogram
 from notifications_utils import SMS_CHAR_COUNT_LIMIT
@@ -20,8 +22,6 @@ from app.constants import (
     INTERNATIONAL_SMS_TYPE,
     KEY_TYPE_TEAM,
     KEY_TYPE_TEST,
-    LETTER_TYPE,
-    MESSAGEBOX_TYPE,
     SMS_TO_UK_LANDLINES,
     SMS_TYPE,
 )
@@ -32,6 +32,7 @@ from app.models import Service
 from app.notifications.process_notifications import (
     create_content_for_notification,
 )
+from app.notifications.service_limits import get_daily_limit, reserve_service_limits
 from app.serialised_models import SerialisedTemplate
 from app.service.utils import service_allowed_to_send_to
 from app.utils import get_public_notify_type_text
@@ -48,31 +49,46 @@ REDIS_EXCEEDED_RATE_LIMIT_DURATION_SECONDS = Histogram(
 )
 
 
-def check_service_over_api_rate_limit(service, key_type):
+def check_service_over_api_rate_limit(service, key_type, num_notifications=1):
     if current_app.config["API_RATE_LIMIT_ENABLED"] and current_app.config["REDIS_ENABLED"]:
         cache_key = rate_limit_cache_key(service.id, key_type)
         rate_limit = service.rate_limit
         interval = 60
         with REDIS_EXCEEDED_RATE_LIMIT_DURATION_SECONDS.time():
-            if redis_store.exceeded_rate_limit(cache_key, rate_limit, interval):
+            if num_notifications == 1:
+                exceeded = redis_store.exceeded_rate_limit(cache_key, rate_limit, interval)
+            else:
+                exceeded = _exceeded_rate_limit_for_notifications(cache_key, rate_limit, interval, num_notifications)
+            if exceeded:
                 current_app.logger.info("service %s has been rate limited for throughput", service.id)
                 raise RateLimitError(rate_limit, interval, key_type)
 
 
+def _exceeded_rate_limit_for_notifications(cache_key, rate_limit, interval, num_notifications):
+    """
+    Like RedisClient.exceeded_rate_limit, but counts each of a bulk request's notifications against the rate limit
+    rather than counting the request once.
+    """
+    try:
+        now = time.time()
+        with redis_store.redis_store.pipeline() as pipe:
+            pipe.zadd(cache_key, {f"{now}-{i}": now for i in range(num_notifications)})
+            pipe.zremrangebyscore(cache_key, "-inf", now - interval)
+            pipe.zcard(cache_key)
+            pipe.expire(cache_key, interval)
+            _, _, requests, _ = pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to check rate limit for %s", cache_key)
+        return False
+    return requests > rate_limit
+
+
 def check_service_over_daily_message_limit(service: Service, key_type, notification_type, num_notifications=1):
     if key_type == KEY_TYPE_TEST or not current_app.config["REDIS_ENABLED"]:
         return
 
-    rate_limits = {
-        EMAIL_TYPE: service.email_message_limit,
-        SMS_TYPE: service.sms_message_limit,
-        INTERNATIONAL_SMS_TYPE: service.international_sms_message_limit,
-        LETTER_TYPE: service.letter_message_limit,
-        MESSAGEBOX_TYPE: service.messagebox_message_limit,
-    }
-
     limit_name = notification_type
-    limit_value = rate_limits[notification_type]
+    limit_value = get_daily_limit(service, notification_type)
 
     cache_key = daily_limit_cache_key(service.id, notification_type=notification_type)
     if (service_stats := redis_store.get(cache_key)) is None:
@@ -92,9 +108,15 @@ def check_service_over_daily_message_limit(service: Service, key_type, notificat
         raise TooManyRequestsError(limit_name, limit_value)
 
 
-def check_rate_limiting(service, api_key, notification_type):
-    check_service_over_api_rate_limit(service, api_key.key_type)
-    check_service_over_daily_message_limit(service, api_key.key_type, notification_type=notification_type)
+def check_rate_limiting(service, api_key, notification_type, num_notifications=1):
+    if current_app.config["ATOMIC_SERVICE_LIMITS_ENABLED"]:
+        reserve_service_limits(service, api_key.key_type, [notification_type], num_notifications=num_notifications)
+        return
+
+    check_service_over_api_rate_limit(service, api_key.key_type, num_notifications=num_notifications)
+    check_service_over_daily_message_limit(
+        service, api_key.key_type, notification_type=notification_type, num_notifications=num_notifications
+    )
 
 
 def check_template_is_for_notification_type(notification_type, template_type):
@@ -163,7 +185,10 @@ def validate_and_return_extended_phone_number_info(service, send_to, key_type, c
         recipient_data = _get_extended_phone_number_info(phone_number, send_to)
 
         if check_intl_sms_limit and not phone_number.is_uk_phone_number():
-            check_service_over_daily_message_limit(service, key_type, notification_type=INTERNATIONAL_SMS_TYPE)
+            if current_app.config["ATOMIC_SERVICE_LIMITS_ENABLED"]:
+                reserve_service_limits(service, key_type, [INTERNATIONAL_SMS_TYPE], check_api_rate_limit=False)
+            else:
+                check_service_over_daily_message_limit(service, key_type, notification_type=INTERNATIONAL_SMS_TYPE)
 
         return recipient_data
 
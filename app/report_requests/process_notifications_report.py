@@ -1,4 +1,7 @@
 import csv
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from io import StringIO
 from typing import Any
 
@@ -12,9 +15,14 @@ from notifications_utils.s3 import (
 )
 
 from app.constants import NOTIFICATION_REPORT_REQUEST_MAPPING
-from app.dao.notifications_dao import get_notifications_for_service
+from app.dao.notifications_dao import get_notifications_for_service_for_csv
 from app.dao.report_requests_dao import dao_get_report_request_by_id
 from app.dao.service_data_retention_dao import fetch_service_data_retention_by_notification_type
+from app.models import Notification
+from app.utils import midnight_n_days_ago
+
+# the most parts S3 allows in a multipart upload
+S3_MULTIPART_UPLOAD_MAX_PARTS = 10000
 
 
 class ReportRequestProcessor:
@@ -67,44 +75,134 @@ class ReportRequestProcessor:
     def _fetch_and_upload_notifications(self) -> None:
         service_retention = fetch_service_data_retention_by_notification_type(self.service_id, self.notification_type)
         limit_days = service_retention.days_of_retention if service_retention else 7
+        slices = current_app.config["REPORT_REQUEST_NOTIFICATIONS_SLICES"]
+        if slices > 1:
+            self._fetch_and_upload_notifications_in_slices(limit_days, slices)
+            return
+
         older_than = None
         is_notification = True
         while is_notification:
-            serialized_notifications = self._fetch_serialized_notifications(limit_days, older_than)
+            rows = self._fetch_notification_rows(limit_days, older_than)
 
-            is_notification = len(serialized_notifications) != 0
+            is_notification = len(rows) != 0
 
-            csv_data = self._convert_notifications_to_csv(serialized_notifications)
+            csv_data = self._convert_notifications_to_csv(Notification.serialize_row_for_csv(row) for row in rows)
             self.csv_writer.writerows(csv_data)
             self._upload_csv_part_if_needed()
-            older_than = serialized_notifications[-1]["id"] if is_notification else None
+            older_than = (rows[-1].created_at, rows[-1].id) if is_notification else None
         # Upload any remaining data
         self._upload_remaining_data()
 
-    def _fetch_serialized_notifications(self, limit_days: int, older_than: str | None) -> list[dict[str, Any]]:
+    def _fetch_and_upload_notifications_in_slices(self, limit_days: int, slices: int) -> None:
+        """
+        Splits the retention window into time slices and exports them concurrently, newest first like the serial
+        export. Each slice uploads its own parts from a range of part numbers set aside for it, S3 only needing part
+        numbers to ascend, not to be consecutive.
+
+        Every part but the last must be at least S3_MULTIPART_UPLOAD_MIN_PART_SIZE, so a slice holds back the first
+        part's worth of its CSV (its head) and whatever's left after its last full part (its tail). Once all the
+        slices are done, each tail is uploaded along with the next slice's head, in the part number set aside just
+        before that slice's own parts.
+        """
+        parts_per_slice = S3_MULTIPART_UPLOAD_MAX_PARTS // (slices + 1)
+        window_start = midnight_n_days_ago(limit_days)
+        slice_length = (datetime.utcnow() - window_start) / slices
+        # the newest slice is left open-ended, to include anything created since the report started
+        slice_bounds = [
+            (window_start + slice_length * (slices - i - 1), window_start + slice_length * (slices - i) if i else None)
+            for i in range(slices)
+        ]
+
+        app = current_app._get_current_object()
+        with ThreadPoolExecutor(max_workers=slices) as executor:
+            exports = list(
+                executor.map(
+                    lambda i: self._export_slice(app, i * parts_per_slice + 1, parts_per_slice, *slice_bounds[i]),
+                    range(slices),
+                )
+            )
+
+        # start with the headers
+        pending = self.csv_buffer.getvalue().encode("utf-8")
+        self.csv_buffer.seek(0)
+        self.csv_buffer.truncate(0)
+        for i, (head, parts, tail) in enumerate(exports):
+            pending += head
+            if parts:
+                self.parts.append(self._upload_numbered_part(i * parts_per_slice + 1, pending))
+                self.parts.extend(parts)
+                pending = tail
+            else:
+                # a slice without parts has no part number between its head and tail to upload anything in
+                pending += tail
+        if pending:
+            self.parts.append(self._upload_numbered_part(slices * parts_per_slice + 1, pending))
+
+    def _export_slice(
+        self, app, first_part_number: int, parts_per_slice: int, created_from: datetime, created_before: datetime | None
+    ) -> tuple[bytes, list[dict[str, Any]], bytes]:
+        """
+        Exports the notifications created in [created_from, created_before), returning the slice's head, the parts it
+        uploaded after the first_part_number set aside for its head, and its tail.
+        """
+        with app.app_context():
+            head = None
+            parts = []
+            csv_buffer = StringIO()
+            csv_writer = csv.writer(csv_buffer)
+            older_than = None
+            while rows := self._fetch_notification_rows(
+                None, older_than, created_from=created_from, created_before=created_before
+            ):
+                csv_writer.writerows(
+                    self._convert_notifications_to_csv(Notification.serialize_row_for_csv(row) for row in rows)
+                )
+                older_than = (rows[-1].created_at, rows[-1].id)
+
+                if csv_buffer.tell() < S3_MULTIPART_UPLOAD_MIN_PART_SIZE:
+                    continue
+                data_bytes = csv_buffer.getvalue().encode("utf-8")
+                if len(data_bytes) < S3_MULTIPART_UPLOAD_MIN_PART_SIZE:
+                    continue
+
+                if head is None:
+                    head = data_bytes
+                else:
+                    if len(parts) + 1 >= parts_per_slice:
+                        raise ValueError(f"Report request {self.report_request_id} has too many parts for its slice")
+                    parts.append(self._upload_numbered_part(first_part_number + len(parts) + 1, data_bytes))
+                csv_buffer.seek(0)
+                csv_buffer.truncate(0)
+
+            data_bytes = csv_buffer.getvalue().encode("utf-8")
+            if head is None:
+                return data_bytes, parts, b""
+            return head, parts, data_bytes
+
+    def _fetch_notification_rows(
+        self,
+        limit_days: int | None,
+        older_than: tuple | None,
+        created_from: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> list:
         statuses = NOTIFICATION_REPORT_REQUEST_MAPPING[self.notification_status]
 
-        notifications = get_notifications_for_service(
+        return get_notifications_for_service_for_csv(
             service_id=self.service_id,
+            page_size=self.page_size,
             filter_dict={
                 "template_type": self.notification_type,
                 "status": statuses,
             },
-            page_size=self.page_size,
-            count_pages=False,
             limit_days=limit_days,
-            include_jobs=True,
-            with_personalisation=False,
-            include_from_test_key=False,
-            error_out=False,
-            include_one_off=True,
             older_than=older_than,
+            created_from=created_from,
+            created_before=created_before,
         )
 
-        serialized_notifications = [notification.serialize_for_csv() for notification in notifications]
-        return serialized_notifications
-
-    def _convert_notifications_to_csv(self, serialized_notifications: list[dict[str, Any]]) -> list[tuple]:
+    def _convert_notifications_to_csv(self, serialized_notifications: Iterable[dict[str, Any]]) -> list[tuple]:
         values = []
         for notification in serialized_notifications:
             values.append(
@@ -125,6 +223,11 @@ class ReportRequestProcessor:
         return values
 
     def _upload_csv_part_if_needed(self) -> None:
+        # the buffer's length in characters is never more than its length in bytes once encoded, so there's no need
+        # to encode it after every page until it's at least that long
+        if self.csv_buffer.tell() < S3_MULTIPART_UPLOAD_MIN_PART_SIZE:
+            return
+
         data_bytes = self.csv_buffer.getvalue().encode("utf-8")
         if len(data_bytes) >= S3_MULTIPART_UPLOAD_MIN_PART_SIZE:
             self._upload_part(data_bytes)
@@ -141,23 +244,26 @@ class ReportRequestProcessor:
             self._upload_part(data_bytes)
 
     def _upload_part(self, data_bytes: bytes) -> None:
+        self.parts.append(self._upload_numbered_part(self.part_number, data_bytes))
+        self.part_number += 1
+
+    def _upload_numbered_part(self, part_number: int, data_bytes: bytes) -> dict[str, Any]:
         response = s3_multipart_upload_part(
-            part_number=self.part_number,
+            part_number=part_number,
             bucket_name=self.s3_bucket,
             filename=self.filename,
             upload_id=self.upload_id,
             data_bytes=data_bytes,
         )
-        self.parts.append({"PartNumber": self.part_number, "ETag": response["ETag"]})
-        self.part_number += 1
         current_app.logger.info(
             "Uploaded part %s of report request %s to bucket %s with filename %s. Rows per part: %s.",
-            self.part_number - 1,
+            part_number,
             self.report_request_id,
             self.s3_bucket,
             self.filename,
             data_bytes.count(b"\n"),
         )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
 
     def _finalize_upload(self) -> None:
         s3_multipart_upload_complete(
@@ -128,8 +128,23 @@ def send_a_file_confirm_email_before_download(instance):
     )
 
 
+# the schemas are module level dicts that last as long as the app, so rather than building a validator for one every
+# time it's used, one is built the first time and kept, along with the schema so its id can't be reused by another
+_validators = {}
+
+
+def get_validator(schema):
+    schema_and_validator = _validators.get(id(schema))
+    if schema_and_validator is None or schema_and_validator[0] is not schema:
+        schema_and_validator = _validators[id(schema)] = (
+            schema,
+            Draft7Validator(schema, format_checker=format_checker),
+        )
+    return schema_and_validator[1]
+
+
 def validate(json_to_validate, schema):
-    validator = Draft7Validator(schema, format_checker=format_checker)
+    validator = get_validator(schema)
     errors = list(validator.iter_errors(json_to_validate))
     if errors.__len__() > 0:
         raise ValidationError(build_error_message(errors))
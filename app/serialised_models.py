@@ -1,10 +1,15 @@
+import json
+import logging
+import os
+import time
 from collections import defaultdict
 from datetime import datetime
-from functools import partial
 from threading import RLock
 from typing import Any
 
 import cachetools
+from flask import current_app
+from gds_metrics.metrics import Counter
 from notifications_utils.clients.redis import RequestCache
 from notifications_utils.serialised_model import (
     SerialisedModel,
@@ -12,23 +17,146 @@ from notifications_utils.serialised_model import (
 )
 from werkzeug.utils import cached_property
 
-from app import db, redis_store
+from app import db, redis_store, signing
 from app.dao.api_key_dao import get_model_api_keys
 from app.dao.services_dao import dao_fetch_service_by_id
 
-caches = defaultdict(partial(cachetools.TTLCache, maxsize=1024, ttl=2))
+logger = logging.getLogger(__name__)
+
+SERIALISED_MODEL_CACHE_LOOKUPS = Counter(
+    "serialised_model_cache_lookups",
+    "Lookups of services, templates and API keys in the in-memory cache",
+    ["cache", "result"],
+)
+SERIALISED_MODEL_CACHE_EVICTIONS = Counter(
+    "serialised_model_cache_evictions",
+    "Services, templates and API keys removed from the in-memory cache",
+    ["cache", "reason"],
+)
+
+# how long entries can be held in memory while this process is listening for invalidations. This is only a backstop
+# in case a change is made without publishing an invalidation, eg straight to the database
+LONG_LIVED_CACHE_TTL_SECONDS = 600
+CACHE_INVALIDATION_CHANNEL = "serialised-model-cache-invalidation"
+CACHE_INVALIDATION_LISTENER_RETRY_SECONDS = 30
+
+
+class MeteredTTLCache(cachetools.TTLCache):
+    def __init__(self, name, maxsize, ttl):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.name = name
+
+    def popitem(self):
+        item = super().popitem()
+        SERIALISED_MODEL_CACHE_EVICTIONS.labels(self.name, "size").inc()
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        if expired:
+            SERIALISED_MODEL_CACHE_EVICTIONS.labels(self.name, "expired").inc(len(expired))
+        return expired
+
+
+class MeteredTTLCaches(dict):
+    def __init__(self, ttl):
+        super().__init__()
+        self.ttl = ttl
+
+    def __missing__(self, name):
+        cache = self[name] = MeteredTTLCache(name, maxsize=1024, ttl=self.ttl)
+        return cache
+
+
+caches = MeteredTTLCaches(ttl=2)
+long_lived_caches = MeteredTTLCaches(ttl=LONG_LIVED_CACHE_TTL_SECONDS)
 locks = defaultdict(RLock)
 redis_cache = RequestCache(redis_store)
 
 
+class CacheInvalidationListener:
+    """
+    Subscribes to cache invalidations published by other processes, so that this process can hold entries in
+    `long_lived_caches`. Whenever it isn't subscribed, eg because redis went away, `memory_cache` falls back to the
+    2 second `caches`, and anything held in `long_lived_caches` is thrown away as it may have missed invalidations.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.pid = None
+        self.worker_thread = None
+        self.next_attempt = 0
+        # bumped on every invalidation, so a lookup that raced with one doesn't put what it fetched into the cache
+        self.generation = 0
+
+    def is_listening(self):
+        if not (current_app.config["LONG_LIVED_MODEL_CACHE_ENABLED"] and current_app.config["REDIS_ENABLED"]):
+            return False
+
+        with self.lock:
+            # a forked process doesn't inherit the parent's subscription thread, so needs its own
+            if self.pid == os.getpid() and self.worker_thread and self.worker_thread.is_alive():
+                return True
+
+            if time.monotonic() < self.next_attempt:
+                return False
+
+            self.next_attempt = time.monotonic() + CACHE_INVALIDATION_LISTENER_RETRY_SECONDS
+            try:
+                self._subscribe()
+            except Exception:
+                current_app.logger.exception("Failed to subscribe to %s", CACHE_INVALIDATION_CHANNEL)
+                return False
+
+            return True
+
+    def _subscribe(self):
+        clear_long_lived_caches()
+        pubsub = redis_store.redis_store.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CACHE_INVALIDATION_CHANNEL: self._handle_message})
+        self.worker_thread = pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=self._handle_error)
+        self.pid = os.getpid()
+
+    def _handle_message(self, message):
+        invalidation = json.loads(message["data"])
+        evict_from_memory_caches(invalidation["service_id"], invalidation.get("template_id"))
+
+    def _handle_error(self, error, pubsub, worker_thread):
+        logger.exception("Stopped listening to %s", CACHE_INVALIDATION_CHANNEL, exc_info=error)
+        with self.lock:
+            worker_thread.stop()
+            pubsub.close()
+            self.worker_thread = None
+            clear_long_lived_caches()
+
+
+cache_invalidation_listener = CacheInvalidationListener()
+
+
 def memory_cache(func):
-    @cachetools.cached(
-        cache=caches[func.__qualname__],
-        lock=locks[func.__qualname__],
-        key=ignore_first_argument_cache_key,
-    )
+    name = func.__qualname__
+
     def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
+        cache = long_lived_caches[name] if cache_invalidation_listener.is_listening() else caches[name]
+        key = ignore_first_argument_cache_key(*args, **kwargs)
+
+        with locks[name]:
+            try:
+                value = cache[key]
+            except KeyError:
+                generation = cache_invalidation_listener.generation
+            else:
+                SERIALISED_MODEL_CACHE_LOOKUPS.labels(name, "hit").inc()
+                return value
+
+        SERIALISED_MODEL_CACHE_LOOKUPS.labels(name, "miss").inc()
+        value = func(*args, **kwargs)
+
+        with locks[name]:
+            if generation == cache_invalidation_listener.generation:
+                cache[key] = value
+
+        return value
 
     return wrapper
 
@@ -37,6 +165,54 @@ def ignore_first_argument_cache_key(cls, *args, **kwargs):
     return cachetools.keys.hashkey(*args, **kwargs)
 
 
+def clear_long_lived_caches():
+    for cache in long_lived_caches.values():
+        with locks[cache.name]:
+            cache.clear()
+
+
+def evict_from_memory_caches(service_id, template_id=None):
+    """
+    Removes any cached service, API keys and templates for a service, or just the versions of one template if a
+    template_id is given, from the memory caches of this process.
+    """
+    if template_id:
+        names, cached_id = ["SerialisedTemplate.from_id_and_service_id"], str(template_id)
+    else:
+        names, cached_id = list(caches.keys() | long_lived_caches.keys()), str(service_id)
+
+    with cache_invalidation_listener.lock:
+        cache_invalidation_listener.generation += 1
+
+    for name in names:
+        with locks[name]:
+            for cache in (caches[name], long_lived_caches[name]):
+                stale_keys = [key for key in list(cache.keys()) if cached_id in (str(part) for part in key)]
+                for key in stale_keys:
+                    cache.pop(key, None)
+                if stale_keys:
+                    SERIALISED_MODEL_CACHE_EVICTIONS.labels(name, "invalidated").inc(len(stale_keys))
+
+
+def invalidate_serialised_models(service_id, template_id=None):
+    """
+    Call once a change to a service, its API keys or one of its templates has been committed. This clears the
+    cached copies in redis and in the memory of every process listening for invalidations.
+    """
+    if template_id:
+        redis_store.delete(f"service-{service_id}-template-{template_id}-version-None")
+    else:
+        redis_store.delete(f"service-{service_id}")
+
+    evict_from_memory_caches(service_id, template_id)
+
+    if current_app.config["REDIS_ENABLED"]:
+        redis_store.redis_store.publish(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"service_id": str(service_id), "template_id": str(template_id) if template_id else None}),
+        )
+
+
 class SerialisedTemplate(SerialisedModel):
     archived: bool
     content: str
@@ -116,6 +292,18 @@ class SerialisedService(SerialisedModel):
         return permission in self.permissions
 
 
+# decoded API key secrets, keyed by their signed value. A key's signed secret never changes, so entries never go
+# stale; revoking a key sets its expiry_date, which is read fresh from the database rather than from this cache
+_decoded_api_key_secrets = cachetools.LRUCache(maxsize=4096)
+
+
+@cachetools.cached(cache=_decoded_api_key_secrets, lock=RLock())
+def _decode_api_key_secret(signed_secret):
+    if signed_secret:
+        return signing.decode(signed_secret)
+    return None
+
+
 class SerialisedAPIKey(SerialisedModel):
     id: Any
     secret: str
@@ -130,7 +318,9 @@ class SerialisedAPIKeyCollection(SerialisedModelCollection):
     @memory_cache
     def from_service_id(cls, service_id):
         keys = [
-            {k: getattr(key, k) for k in SerialisedAPIKey.__annotations__} for key in get_model_api_keys(service_id)
+            {k: getattr(key, k) for k in SerialisedAPIKey.__annotations__ if k != "secret"}
+            | {"secret": _decode_api_key_secret(key._secret)}
+            for key in get_model_api_keys(service_id)
         ]
         db.session.commit()
         return cls(keys)
@@ -48,6 +48,7 @@ def update_service_callback_api(callback_api_id, service_id):
         data["updated_by_id"],
         data.get("url", None),
         data.get("bearer_token", None),
+        data.get("batch_callbacks", None),
     )
     return jsonify(data=to_update.serialize()), 200
 
@@ -0,0 +1,128 @@
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+from flask import current_app
+from notifications_utils.timezones import convert_utc_to_bst
+
+from app import redis_store
+from app.constants import KEY_TYPE_TEST
+from app.utils import get_london_midnight_in_utc
+
+INTRADAY_STATS_TTL_SECONDS = int(timedelta(days=2).total_seconds())
+
+# when the stats started being recorded. If redis loses its data, this goes with it and is set again by the next
+# change recorded, so a day's stats are never read unless they were recorded for the whole day
+INTRADAY_STATS_RECORDED_SINCE_KEY = "intraday-stats-recorded-since"
+
+IntradayStat = namedtuple("IntradayStat", ["notification_type", "key_type", "template_id", "status", "hour", "count"])
+
+
+def intraday_stats_enabled():
+    return current_app.config["INTRADAY_SERVICE_STATS_ENABLED"] and current_app.config["REDIS_ENABLED"]
+
+
+def intraday_stats_key(service_id, bst_date):
+    return f"service-{service_id}-intraday-stats-{bst_date}"
+
+
+def intraday_stats_services_key(bst_date):
+    return f"intraday-stats-services-{bst_date}"
+
+
+def record_intraday_stats_changes(changes):
+    """
+    Keeps a redis hash for each service and day of notification counts by type, key type, template, status and the
+    hour they were created, so the dashboards can show today's counts without aggregating the notifications table.
+
+    Takes (notification, old_status, new_status) for each notification that was created (with an old_status of None),
+    changed status or was deleted (with a new_status of None). Counts are kept against the day the notification was
+    created.
+    """
+    if not intraday_stats_enabled():
+        return
+
+    counts = _count_intraday_stats_changes(changes)
+    if not any(counts.values()):
+        return
+
+    try:
+        with redis_store.redis_store.pipeline() as pipe:
+            for (service_id, bst_date, stat), count in counts.items():
+                if count:
+                    pipe.hincrby(intraday_stats_key(service_id, bst_date), ":".join(map(str, stat)), count)
+            for service_id, bst_date in {(service_id, bst_date) for service_id, bst_date, _ in counts}:
+                pipe.expire(intraday_stats_key(service_id, bst_date), INTRADAY_STATS_TTL_SECONDS)
+                pipe.sadd(intraday_stats_services_key(bst_date), service_id)
+                pipe.expire(intraday_stats_services_key(bst_date), INTRADAY_STATS_TTL_SECONDS)
+            pipe.set(INTRADAY_STATS_RECORDED_SINCE_KEY, datetime.utcnow().isoformat(), nx=True)
+            pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to record intraday stats changes")
+
+
+def _count_intraday_stats_changes(changes):
+    counts = Counter()
+    for notification, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        created_at = convert_utc_to_bst(notification.created_at or datetime.utcnow())
+        stat = (notification.notification_type, notification.key_type, notification.template_id)
+        if old_status is not None:
+            counts[(str(notification.service_id), created_at.date(), (*stat, old_status, created_at.hour))] -= 1
+        if new_status is not None:
+            counts[(str(notification.service_id), created_at.date(), (*stat, new_status, created_at.hour))] += 1
+    return counts
+
+
+def get_intraday_stats(bst_date, service_ids=None):
+    """
+    Returns {service_id: [IntradayStat, ...]} for the notifications created on bst_date, for the given services or
+    every service with any. Returns None if the stats weren't being recorded for the whole of that day, in which case
+    they need to come from the notifications table instead.
+    """
+    if not intraday_stats_enabled():
+        return None
+
+    try:
+        recorded_since = redis_store.redis_store.get(INTRADAY_STATS_RECORDED_SINCE_KEY)
+        if recorded_since is None or datetime.fromisoformat(recorded_since.decode()) > get_london_midnight_in_utc(
+            bst_date
+        ):
+            return None
+
+        if service_ids is None:
+            service_ids = redis_store.redis_store.smembers(intraday_stats_services_key(bst_date))
+        service_ids = [
+            service_id.decode() if isinstance(service_id, bytes) else str(service_id) for service_id in service_ids
+        ]
+
+        with redis_store.redis_store.pipeline() as pipe:
+            for service_id in service_ids:
+                pipe.hgetall(intraday_stats_key(service_id, bst_date))
+            stats = pipe.execute()
+    except Exception:
+        current_app.logger.exception("Failed to get intraday stats for %s", bst_date)
+        return None
+
+    return {
+        service_id: [
+            _parse_intraday_stat(stat, count) for stat, count in sorted(service_stats.items()) if int(count) > 0
+        ]
+        for service_id, service_stats in zip(service_ids, stats, strict=True)
+    }
+
+
+def _parse_intraday_stat(stat, count):
+    notification_type, key_type, template_id, status, hour = stat.decode().split(":")
+    return IntradayStat(notification_type, key_type, template_id, status, int(hour), int(count))
+
+
+def sum_intraday_stats(stats, fields, include_from_test_key=False):
+    """
+    Adds up the counts of IntradayStats by the given fields, returning a Counter keyed by a tuple of those fields.
+    """
+    counts = Counter()
+    for stat in stats:
+        if include_from_test_key or stat.key_type != KEY_TYPE_TEST:
+            counts[tuple(getattr(stat, field) for field in fields)] += stat.count
+    return counts
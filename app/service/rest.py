@@ -131,6 +131,7 @@ from app.letters.utils import adjust_daily_service_limits_for_cancelled_letters,
 from app.models import (
     EmailBranding,
     LetterBranding,
+    Notification,
     Permission,
     ReportRequest,
     Service,
@@ -152,6 +153,7 @@ from app.schemas import (
     notifications_filter_schema,
     service_schema,
 )
+from app.serialised_models import invalidate_serialised_models
 from app.service import statistics
 from app.service.report_request_schema import add_report_request_schema
 from app.service.send_notification import (
@@ -320,6 +322,7 @@ def update_service(service_id):
         service.letter_branding = None if not letter_branding_id else LetterBranding.query.get(letter_branding_id)
 
     dao_update_service(service)
+    invalidate_serialised_models(service_id)
 
     if service_going_live:
         send_notification_to_service_users(
@@ -340,6 +343,7 @@ def create_api_key(service_id=None):
     valid_api_key = api_key_schema.load(request.get_json())
     valid_api_key.service = fetched_service
     save_model_api_key(valid_api_key)
+    invalidate_serialised_models(service_id)
     unsigned_api_key = get_unsigned_secret(valid_api_key.id)
     return jsonify(data=unsigned_api_key), 201
 
@@ -347,6 +351,7 @@ def create_api_key(service_id=None):
 @service_blueprint.route("/<uuid:service_id>/api-key/revoke/<uuid:api_key_id>", methods=["POST"])
 def revoke_api_key(service_id, api_key_id):
     expire_api_key(service_id=service_id, api_key_id=api_key_id)
+    invalidate_serialised_models(service_id)
     return jsonify(), 202
 
 
@@ -449,24 +454,20 @@ def get_all_notifications_for_service_for_csv(service_id):
     page_size = data["page_size"] if "page_size" in data else current_app.config.get("PAGE_SIZE")
     limit_days = data.get("limit_days")
 
-    current_notifications_batch = notifications_dao.get_notifications_for_service(
+    if older_than is not None:
+        older_than = notifications_dao.get_notification_keyset_for_csv(service_id, older_than)
+        if older_than is None:
+            return jsonify(notifications=[], page_size=page_size), 200
+
+    rows = notifications_dao.get_notifications_for_service_for_csv(
         service_id,
-        filter_dict=data,
-        older_than=older_than,
         page_size=page_size,
-        count_pages=False,
+        filter_dict=data,
         limit_days=limit_days,
-        error_out=False,
-        with_personalisation=False,
-        include_jobs=True,
-        include_from_test_key=False,
-        include_one_off=True,
+        older_than=older_than,
     )
 
-    kwargs = request.args.to_dict()
-    kwargs["service_id"] = service_id
-
-    notifications = [notification.serialize_for_csv() for notification in current_notifications_batch.items]
+    notifications = [Notification.serialize_row_for_csv(row) for row in rows]
 
     return (
         jsonify(
@@ -784,6 +785,9 @@ def archive_service(service_id):
 
     if service.active:
         dao_archive_service(service.id)
+        invalidate_serialised_models(service.id)
+        for template in service.templates:
+            invalidate_serialised_models(service.id, template.id)
 
     return "", 204
 
@@ -870,6 +874,7 @@ def add_service_reply_to_email_address(service_id):
     new_reply_to = add_reply_to_email_address_for_service(
         service_id=service_id, email_address=form["email_address"], is_default=form.get("is_default", True)
     )
+    invalidate_serialised_models(service_id)
     return jsonify(data=new_reply_to.serialize()), 201
 
 
@@ -884,12 +889,14 @@ def update_service_reply_to_email_address(service_id, reply_to_email_id):
         email_address=form["email_address"],
         is_default=form.get("is_default", True),
     )
+    invalidate_serialised_models(service_id)
     return jsonify(data=new_reply_to.serialize()), 200
 
 
 @service_blueprint.route("/<uuid:service_id>/email-reply-to/<uuid:reply_to_email_id>/archive", methods=["POST"])
 def delete_service_reply_to_email_address(service_id, reply_to_email_id):
     archived_reply_to = archive_reply_to_email_address(service_id, reply_to_email_id)
+    invalidate_serialised_models(service_id)
 
     return jsonify(data=archived_reply_to.serialize()), 200
 
@@ -914,6 +921,7 @@ def add_service_letter_contact(service_id):
     new_letter_contact = add_letter_contact_for_service(
         service_id=service_id, contact_block=form["contact_block"], is_default=form.get("is_default", True)
     )
+    invalidate_serialised_models(service_id)
     return jsonify(data=new_letter_contact.serialize()), 201
 
 
@@ -928,12 +936,14 @@ def update_service_letter_contact(service_id, letter_contact_id):
         contact_block=form["contact_block"],
         is_default=form.get("is_default", True),
     )
+    invalidate_serialised_models(service_id)
     return jsonify(data=new_reply_to.serialize()), 200
 
 
 @service_blueprint.route("/<uuid:service_id>/letter-contact/<uuid:letter_contact_id>/archive", methods=["POST"])
 def delete_service_letter_contact(service_id, letter_contact_id):
     archived_letter_contact = archive_letter_contact(service_id, letter_contact_id)
+    invalidate_serialised_models(service_id)
 
     return jsonify(data=archived_letter_contact.serialize()), 200
 
@@ -947,6 +957,7 @@ def add_service_sms_sender(service_id):
     new_sms_sender = dao_add_sms_sender_for_service(
         service_id=service_id, sms_sender=sms_sender, is_default=form["is_default"]
     )
+    invalidate_serialised_models(service_id)
     return jsonify(new_sms_sender.serialize()), 201
 
 
@@ -964,12 +975,14 @@ def update_service_sms_sender(service_id, sms_sender_id):
         is_default=form["is_default"],
         sms_sender=form["sms_sender"],
     )
+    invalidate_serialised_models(service_id)
     return jsonify(new_sms_sender.serialize()), 200
 
 
 @service_blueprint.route("/<uuid:service_id>/sms-sender/<uuid:sms_sender_id>/archive", methods=["POST"])
 def delete_service_sms_sender(service_id, sms_sender_id):
     sms_sender = archive_sms_sender(service_id, sms_sender_id)
+    invalidate_serialised_models(service_id)
 
     return jsonify(data=sms_sender.serialize()), 200
 
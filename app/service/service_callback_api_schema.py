@@ -10,6 +10,7 @@ create_service_callback_api_schema = {
         "bearer_token": {"type": "string", "minLength": 10},
         "updated_by_id": uuid,
         "callback_type": {"type": "string"},
+        "batch_callbacks": {"type": "boolean"},
     },
     "required": ["url", "bearer_token", "updated_by_id"],
 }
@@ -24,6 +25,7 @@ update_service_callback_api_schema = {
         "bearer_token": {"type": "string", "minLength": 10},
         "updated_by_id": uuid,
         "callback_type": {"type": "string"},
+        "batch_callbacks": {"type": "boolean"},
     },
     "required": ["updated_by_id"],
 }
@@ -40,6 +40,7 @@ from app.schemas import (
     template_schema,
     template_schema_no_detail,
 )
+from app.serialised_models import invalidate_serialised_models
 from app.template.template_schemas import (
     post_create_template_schema,
     post_update_template_schema,
@@ -131,6 +132,7 @@ def update_template(service_id, template_id):
         check_service_letter_contact_id(service_id, data.get("reply_to"), fetched_template.template_type)
         fetched_template.service_letter_contact_id = data.get("reply_to")
         dao_update_template(fetched_template)
+        invalidate_serialised_models(service_id, template_id)
         return jsonify(data=template_schema.dump(fetched_template)), 200
 
     current_data = template_schema.dump(fetched_template)
@@ -155,6 +157,7 @@ def update_template(service_id, template_id):
     if update_dict.archived:
         update_dict.folder = None
     dao_update_template(update_dict)
+    invalidate_serialised_models(service_id, template_id)
     return jsonify(data=template_schema.dump(update_dict)), 200
 
 
@@ -0,0 +1,243 @@
+"""
+Measures how quickly notifications get through each stage of sending, from the API request to the delivery receipt,
+in one process against the local database, with the providers stubbed out. See the benchmark-throughput command.
+"""
+
+import json
+import statistics
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from time import monotonic
+
+from flask import current_app
+from notifications_python_client.authentication import create_jwt_token
+from sqlalchemy import event
+
+from app import db
+from app.celery import provider_tasks
+from app.celery.nightly_tasks import timeout_notifications
+from app.celery.process_ses_receipts_tasks import process_ses_results
+from app.celery.research_mode_tasks import ses_notification_callback
+from app.constants import EMAIL_TYPE, KEY_TYPE_NORMAL, NOTIFICATION_SENDING, SMS_TYPE
+from app.dao.api_key_dao import save_model_api_key
+from app.delivery import send_to_providers
+from app.models import ApiKey, Notification, Template
+
+
+class StageResult:
+    def __init__(self, stage, notifications, seconds, latencies, queries):
+        self.stage = stage
+        self.notifications = notifications
+        self.seconds = seconds
+        # the time taken by each request or task, in seconds
+        self.latencies = latencies
+        self.queries = queries
+
+    @property
+    def notifications_per_second(self):
+        return self.notifications / self.seconds if self.seconds else 0
+
+    @property
+    def queries_per_notification(self):
+        return self.queries / self.notifications if self.notifications else 0
+
+    def latency_percentiles(self):
+        """
+        Returns the p50, p95 and p99 latencies in milliseconds.
+        """
+        if len(self.latencies) < 2:
+            return (self.latencies[0] * 1000,) * 3 if self.latencies else (0, 0, 0)
+        percentiles = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return tuple(percentiles[p - 1] * 1000 for p in (50, 95, 99))
+
+    def serialize(self):
+        return {
+            "notifications": self.notifications,
+            "notifications_per_second": round(self.notifications_per_second, 2),
+            "queries_per_notification": round(self.queries_per_notification, 2),
+            **dict(zip(("p50_ms", "p95_ms", "p99_ms"), (round(p, 2) for p in self.latency_percentiles()), strict=True)),
+        }
+
+
+_MISSING = object()
+
+
+class _StubProvider:
+    """
+    Stands in for a provider client, as if every request to it succeeded immediately.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def send_sms(self, to, content, reference, international, sender):
+        pass
+
+    def send_email(self, **kwargs):
+        return str(uuid.uuid4())
+
+
+@contextmanager
+def _count_queries(counter):
+    def before_cursor_execute(*args):
+        counter[0] += 1
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def _replace_attribute(obj, name, value):
+    # restores a method shadowed on an instance (eg a task's apply_async) by removing the shadow again
+    original = vars(obj).get(name, _MISSING)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        if original is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
+
+
+@contextmanager
+def _replace_config(name, value):
+    original = current_app.config[name]
+    current_app.config[name] = value
+    try:
+        yield
+    finally:
+        current_app.config[name] = original
+
+
+def _run_stage(stage, items, run_one, notifications=None):
+    latencies = []
+    queries = [0]
+    with _count_queries(queries):
+        start = monotonic()
+        for item in items:
+            item_start = monotonic()
+            run_one(item)
+            latencies.append(monotonic() - item_start)
+        seconds = monotonic() - start
+
+    return StageResult(
+        stage,
+        len(items) if notifications is None else notifications,
+        seconds,
+        latencies,
+        queries[0],
+    )
+
+
+def _benchmark_recipient(notification_type, i):
+    if notification_type == EMAIL_TYPE:
+        return f"benchmark-{i}@notify.works"
+    # steering clear of the simulated numbers, which aren't saved or sent
+    return f"07700900{300 + i % 700}"
+
+
+def run_throughput_benchmark(service, notification_type, count):
+    """
+    Posts `count` notifications to the v2 API for the service, then sends them with the deliver tasks. Emails then
+    get a delivery receipt each from SES, and text messages are timed out by the nightly task instead, which times
+    out every notification that's still sending, not just the ones posted here.
+
+    Returns a StageResult for each stage.
+    """
+    template = Template.query.filter_by(service_id=service.id, template_type=notification_type, archived=False).first()
+    if not template:
+        raise ValueError(f"Service {service.id} has no {notification_type} template")
+
+    api_key = ApiKey(
+        service=service, name=f"benchmark {uuid.uuid4()}", created_by=service.created_by, key_type=KEY_TYPE_NORMAL
+    )
+    save_model_api_key(api_key)
+    client = current_app.test_client()
+    recipient_field = "email_address" if notification_type == EMAIL_TYPE else "phone_number"
+    deliver_task = provider_tasks.deliver_email if notification_type == EMAIL_TYPE else provider_tasks.deliver_sms
+    get_real_provider = send_to_providers.provider_to_use
+
+    def post_notification(i):
+        response = client.post(
+            f"/v2/notifications/{notification_type}",
+            data=json.dumps({recipient_field: _benchmark_recipient(notification_type, i), "template_id": template.id}),
+            headers=[
+                ("Content-Type", "application/json"),
+                ("Authorization", f"Bearer {create_jwt_token(secret=api_key.secret, client_id=str(service.id))}"),
+            ],
+        )
+        if response.status_code != 201:
+            raise ValueError(f"Posting a notification failed: {response.status_code} {response.get_data(as_text=True)}")
+
+    notification_ids = []
+
+    def queue_deliver_task(args, **kwargs):
+        # rather than queueing them, the deliver stage runs the tasks itself
+        notification_ids.append(args[0])
+
+    with (
+        _replace_attribute(deliver_task, "apply_async", queue_deliver_task),
+        _replace_attribute(
+            send_to_providers,
+            "provider_to_use",
+            lambda notification_type, international=False: _StubProvider(
+                get_real_provider(notification_type, international).name
+            ),
+        ),
+    ):
+        results = [_run_stage("post-notification", range(count), post_notification)]
+        results.append(_run_stage("deliver", notification_ids, deliver_task))
+
+    if notification_type == EMAIL_TYPE:
+        references = [
+            reference
+            for (reference,) in db.session.query(Notification.reference).filter(Notification.id.in_(notification_ids))
+        ]
+        results.append(
+            _run_stage(
+                "ses-receipt",
+                [ses_notification_callback(reference) for reference in references],
+                process_ses_results,
+            )
+        )
+    elif notification_type == SMS_TYPE:
+        sending = Notification.query.filter_by(status=NOTIFICATION_SENDING).count()
+        with _replace_config("SENDING_NOTIFICATIONS_TIMEOUT_PERIOD", 0):
+            results.append(_run_stage("timeout-notifications", [None], lambda _: timeout_notifications(), sending))
+
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Returns a description of each way the results are worse than the baseline by more than the tolerance (a
+    fraction), either getting through fewer notifications a second or making more queries for each one.
+    """
+    regressions = []
+    for result in results:
+        if result.stage not in baseline:
+            continue
+        expected = baseline[result.stage]
+        if result.notifications_per_second < expected["notifications_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result.stage}: {result.notifications_per_second:.2f} notifications/sec, "
+                f"down from {expected['notifications_per_second']:.2f}"
+            )
+        if result.queries_per_notification > expected["queries_per_notification"] * (1 + tolerance):
+            regressions.append(
+                f"{result.stage}: {result.queries_per_notification:.2f} queries/notification, "
+                f"up from {expected['queries_per_notification']:.2f}"
+            )
+    return regressions
+
+
+def serialize_results(results):
+    return {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "stages": {result.stage: result.serialize() for result in results},
+    }
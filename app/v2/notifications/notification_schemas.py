@@ -173,6 +173,20 @@ sms_content = {
     "required": ["body", "from_number"],
 }
 
+post_bulk_sms_item = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "description": "sms notification in a POST bulk notifications request",
+    "type": "object",
+    "title": "POST v2/notifications/bulk sms notification",
+    "properties": {
+        "reference": {"type": "string", "maxLength": 1_000},
+        "phone_number": {"type": "string", "format": "phone_number"},
+        "personalisation": personalisation,
+    },
+    "required": ["phone_number"],
+    "additionalProperties": False,
+}
+
 post_sms_response = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "description": "POST sms notification response schema",
@@ -208,6 +222,38 @@ post_email_request = {
     "additionalProperties": False,
 }
 
+post_bulk_email_item = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "description": "email notification in a POST bulk notifications request",
+    "type": "object",
+    "title": "POST v2/notifications/bulk email notification",
+    "properties": {
+        "reference": {"type": "string", "maxLength": 1_000},
+        "email_address": {"type": "string", "format": "email_address"},
+        "personalisation": personalisation,
+        "one_click_unsubscribe_url": https_url,
+    },
+    "required": ["email_address"],
+    "additionalProperties": False,
+}
+
+# each notification is validated against post_bulk_sms_item or post_bulk_email_item on its own, depending on the
+# template, so that one bad notification doesn't fail the whole request
+post_bulk_request = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "description": "POST bulk notifications schema",
+    "type": "object",
+    "title": "POST v2/notifications/bulk",
+    "properties": {
+        "template_id": uuid,
+        "sms_sender_id": uuid,
+        "email_reply_to_id": uuid,
+        "notifications": {"type": "array", "items": {"type": "object"}, "minItems": 1, "maxItems": 1_000},
+    },
+    "required": ["template_id", "notifications"],
+    "additionalProperties": False,
+}
+
 email_content = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "description": "Email content for POST email notification",
@@ -0,0 +1,191 @@
+import json
+import uuid
+
+from flask import current_app, jsonify
+from gds_metrics import Histogram
+from jsonschema import ValidationError as JsonSchemaValidationError
+from notifications_utils.recipient_validation.errors import InvalidPhoneError, InvalidRecipientError
+from sqlalchemy.orm.exc import NoResultFound
+
+from app import api_user, authenticated_service
+from app.constants import EMAIL_TYPE, INTERNATIONAL_SMS_TYPE, SMS_TYPE
+from app.errors import InvalidRequest
+from app.notifications.process_notifications import (
+    build_notification,
+    create_content_for_notification,
+    persist_notifications_in_bulk,
+    send_notifications_to_queue_in_bulk,
+    simulated_recipient,
+)
+from app.notifications.service_limits import reserve_service_limits
+from app.notifications.validators import (
+    check_is_message_too_long,
+    check_notification_content_is_not_empty,
+    check_rate_limiting,
+    check_service_has_permission,
+    check_service_over_daily_message_limit,
+    check_template_is_active,
+    validate_and_format_recipient,
+)
+from app.schema_validation import validate
+from app.serialised_models import SerialisedTemplate
+from app.v2.errors import BadRequestError
+from app.v2.notifications import v2_notification_blueprint
+from app.v2.notifications.notification_schemas import (
+    post_bulk_email_item,
+    post_bulk_request,
+    post_bulk_sms_item,
+)
+from app.v2.notifications.post_notifications import (
+    create_response_for_post_notification,
+    get_reply_to_text,
+)
+from app.v2.utils import get_valid_json
+
+POST_BULK_NOTIFICATIONS_JSON_PARSE_DURATION_SECONDS = Histogram(
+    "post_bulk_notifications_json_parse_duration_seconds",
+    "Time taken to parse and validate post bulk request json",
+)
+
+
+@v2_notification_blueprint.route("/bulk", methods=["POST"])
+def post_bulk_notifications():
+    """
+    Sends up to 1,000 sms or email notifications for one template. Each notification is validated on its own, and
+    the response lists either the created notification or its errors, in the same order as the request.
+    """
+    with POST_BULK_NOTIFICATIONS_JSON_PARSE_DURATION_SECONDS.time():
+        form = validate(get_valid_json(), post_bulk_request)
+
+    try:
+        template = SerialisedTemplate.from_id_and_service_id(form["template_id"], authenticated_service.id)
+    except NoResultFound as e:
+        message = "Template not found"
+        raise BadRequestError(message=message, fields=[{"template": message}]) from e
+
+    notification_type = template.template_type
+    if notification_type not in (SMS_TYPE, EMAIL_TYPE):
+        raise BadRequestError(message=f"Cannot send {notification_type} notifications in bulk")
+
+    check_rate_limiting(
+        authenticated_service,
+        api_user,
+        notification_type=notification_type,
+        num_notifications=len(form["notifications"]),
+    )
+    check_service_has_permission(authenticated_service, notification_type)
+    check_template_is_active(template)
+
+    reply_to_text = get_reply_to_text(notification_type, form, template)
+
+    results = []
+    notifications = []
+    for item in form["notifications"]:
+        try:
+            notification, template_with_content, simulated = _build_bulk_notification(
+                item, notification_type, template, reply_to_text
+            )
+        except (InvalidRequest, InvalidRecipientError, JsonSchemaValidationError) as e:
+            results.append({"errors": _get_errors(e)})
+            continue
+
+        if not simulated:
+            notifications.append(notification)
+
+        results.append(
+            create_response_for_post_notification(
+                notification_id=notification.id,
+                client_reference=notification.client_reference,
+                template_id=template.id,
+                template_version=template.version,
+                service_id=authenticated_service.id,
+                notification_type=notification_type,
+                reply_to=reply_to_text,
+                template_with_content=template_with_content,
+                unsubscribe_link=notification.unsubscribe_link,
+            )
+        )
+
+    _check_international_sms_limit(notifications)
+
+    saved_notifications = persist_notifications_in_bulk(notifications, authenticated_service, api_user.key_type)
+    send_notifications_to_queue_in_bulk(
+        api_user.key_type, notification_type, [notification.id for notification in saved_notifications]
+    )
+
+    return jsonify(data=results), 201
+
+
+def _build_bulk_notification(item, notification_type, template, reply_to_text):
+    item = validate(item, post_bulk_sms_item if notification_type == SMS_TYPE else post_bulk_email_item)
+    personalisation = item.get("personalisation", {})
+
+    if any(isinstance(value, dict) for value in personalisation.values()):
+        raise BadRequestError(message="Files can't be sent with the bulk endpoint")
+
+    template_with_content = create_content_for_notification(template, personalisation)
+    check_notification_content_is_not_empty(template_with_content)
+    check_is_message_too_long(template_with_content)
+
+    form_send_to = item["phone_number"] if notification_type == SMS_TYPE else item["email_address"]
+    # the international sms limit is checked once for the whole batch instead
+    recipient_data = validate_and_format_recipient(
+        send_to=form_send_to,
+        key_type=api_user.key_type,
+        service=authenticated_service,
+        notification_type=notification_type,
+        check_intl_sms_limit=False,
+    )
+    send_to = recipient_data["normalised_to"] if type(recipient_data) is dict else recipient_data
+
+    notification = build_notification(
+        notification_id=uuid.uuid4(),
+        template_id=template.id,
+        template_version=template.version,
+        recipient=recipient_data if type(recipient_data) is dict else form_send_to,
+        service=authenticated_service,
+        personalisation=personalisation,
+        notification_type=notification_type,
+        api_key_id=api_user.id,
+        key_type=api_user.key_type,
+        client_reference=item.get("reference"),
+        reply_to_text=reply_to_text,
+        unsubscribe_link=item.get("one_click_unsubscribe_url"),
+    )
+
+    return notification, template_with_content, simulated_recipient(send_to, notification_type)
+
+
+def _check_international_sms_limit(notifications):
+    international_count = sum(1 for notification in notifications if notification.international)
+    if not international_count:
+        return
+
+    if current_app.config["ATOMIC_SERVICE_LIMITS_ENABLED"]:
+        reserve_service_limits(
+            authenticated_service,
+            api_user.key_type,
+            [INTERNATIONAL_SMS_TYPE],
+            num_notifications=international_count,
+            check_api_rate_limit=False,
+        )
+    else:
+        check_service_over_daily_message_limit(
+            authenticated_service,
+            api_user.key_type,
+            notification_type=INTERNATIONAL_SMS_TYPE,
+            num_notifications=international_count,
+        )
+
+
+def _get_errors(error):
+    if isinstance(error, JsonSchemaValidationError):
+        return json.loads(error.message)["errors"]
+
+    if isinstance(error, InvalidPhoneError):
+        return [{"error": error.__class__.__name__, "message": error.get_legacy_v2_api_error_message()}]
+
+    if isinstance(error, InvalidRecipientError):
+        return [{"error": error.__class__.__name__, "message": str(error)}]
+
+    return error.to_dict_v2()["errors"]
@@ -42,6 +42,16 @@ case "$1" in
   api-worker-sender)
     exec $COMMON_CMD send-sms-tasks,send-email-tasks
     ;;
+  api-worker-sender-eventlet)
+    # sending to providers is almost all waiting on the network, so run deliveries on green threads to keep many
+    # provider requests in flight per process. the tasks, retries and metrics are the same as api-worker-sender.
+    # every green thread needs a database connection to update its notification, so give the pool one per green
+    # thread rather than leaving most of them queueing on pool_timeout
+    SENDER_EVENTLET_CONCURRENCY=${SENDER_EVENTLET_CONCURRENCY:-20}
+    export SQLALCHEMY_POOL_SIZE=${SQLALCHEMY_POOL_SIZE:-$SENDER_EVENTLET_CONCURRENCY}
+    exec celery --quiet -A run_celery.notify_celery worker --logfile=/dev/null --pool=eventlet \
+      --concurrency=$SENDER_EVENTLET_CONCURRENCY -Q send-sms-tasks,send-email-tasks
+    ;;
   api-worker-sender-letters)
     exec $COMMON_CMD send-letter-tasks
     ;;
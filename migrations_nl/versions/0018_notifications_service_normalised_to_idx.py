@@ -0,0 +1,37 @@
+"""add notifications service_id normalised_to index
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-18 10:02:41.318402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0018'
+down_revision = '0017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_service_id_normalised_to",
+            "notifications",
+            ["service_id", "normalised_to"],
+            if_not_exists=True,
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_service_id_normalised_to",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,35 @@
+"""add service callback api batch_callbacks
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-18 14:12:07.524180
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0019'
+down_revision = '0018'
+branch_labels = None
+depends_on = None
+
+
+BATCH_CALLBACKS_COLUMN = "batch_callbacks"
+
+
+def upgrade():
+    op.add_column(
+        "service_callback_api",
+        sa.Column(BATCH_CALLBACKS_COLUMN, sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column(
+        "service_callback_api_history",
+        sa.Column(BATCH_CALLBACKS_COLUMN, sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade():
+    op.drop_column("service_callback_api", BATCH_CALLBACKS_COLUMN)
+    op.drop_column("service_callback_api_history", BATCH_CALLBACKS_COLUMN)
@@ -0,0 +1,37 @@
+"""add notifications updated_at index
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-18 16:41:53.207614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0020'
+down_revision = '0019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_updated_at",
+            "notifications",
+            ["updated_at"],
+            if_not_exists=True,
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_updated_at",
+            table_name="notifications",
+            postgresql_concurrently=True,
+        )
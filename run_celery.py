@@ -21,6 +21,16 @@ import prometheus_client  # noqa
 # See https://github.com/alphagov/notifications-api/pull/3687 for a little more of the investigation/notes
 import pycurl  # noqa
 
+# celery has already monkey patched the standard library by now if the worker runs on the eventlet pool (like
+# api-worker-sender-eventlet), but psycopg2 talks to postgres in C, so it needs its own patch to wait for queries on
+# green threads rather than blocking every other delivery in the process
+import eventlet.patcher  # noqa
+
+if eventlet.patcher.is_monkey_patched("socket"):
+    from psycogreen.eventlet import patch_psycopg
+
+    patch_psycopg()
+
 # notify_celery is referenced from manifest_delivery_base.yml, and cannot be removed
 from app import create_app, notify_celery  # noqa
 from app.notify_api_flask_app import NotifyApiFlaskApp  # noqa
@@ -4,7 +4,7 @@ import uuid
 import jwt
 import pytest
 from flask import g, request
-from notifications_python_client.authentication import create_jwt_token
+from notifications_python_client.authentication import create_jwt_token, decode_jwt_token
 
 from app import db
 from app.authentication.auth import (
@@ -204,6 +204,48 @@ def test_decode_jwt_token_should_allow_some_expired_keys(
     _decode_jwt_token(token, [sample_api_key, sample_test_api_key])
 
 
+def test_decode_jwt_token_tries_most_recently_used_api_key_first(
+    client,
+    mocker,
+    sample_api_key,
+    sample_test_api_key,
+):
+    mock_decode = mocker.patch("app.authentication.auth.decode_jwt_token", wraps=decode_jwt_token)
+    token = create_jwt_token(
+        secret=sample_test_api_key.secret,
+        client_id=str(sample_test_api_key.service_id),
+    )
+
+    _decode_jwt_token(token, [sample_api_key, sample_test_api_key], service_id=sample_test_api_key.service_id)
+    assert [mock_call.args[1] for mock_call in mock_decode.call_args_list] == [
+        sample_api_key.secret,
+        sample_test_api_key.secret,
+    ]
+
+    mock_decode.reset_mock()
+    _decode_jwt_token(token, [sample_api_key, sample_test_api_key], service_id=sample_test_api_key.service_id)
+    assert [mock_call.args[1] for mock_call in mock_decode.call_args_list] == [sample_test_api_key.secret]
+
+
+def test_decode_jwt_token_rejects_most_recently_used_api_key_once_revoked(
+    client,
+    sample_api_key,
+    sample_test_api_key,
+):
+    token = create_jwt_token(
+        secret=sample_test_api_key.secret,
+        client_id=str(sample_test_api_key.service_id),
+    )
+    _decode_jwt_token(token, [sample_api_key, sample_test_api_key], service_id=sample_test_api_key.service_id)
+
+    expire_api_key(sample_test_api_key.service_id, sample_test_api_key.id)
+
+    with pytest.raises(AuthError) as exc:
+        _decode_jwt_token(token, [sample_api_key, sample_test_api_key], service_id=sample_test_api_key.service_id)
+
+    assert exc.value.short_message == "Invalid token: API key revoked"
+
+
 def test_decode_jwt_token_errors_when_all_api_keys_are_expired(
     client,
     sample_api_key,
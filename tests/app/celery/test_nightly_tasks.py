@@ -292,18 +292,26 @@ def test_should_not_update_status_of_letter_notifications(client, sample_letter_
 
 @freeze_time("2021-12-13T10:00")
 def test_timeout_notifications(mocker, sample_notification):
-    mock_update = mocker.patch("app.celery.nightly_tasks.check_and_queue_callback_task")
+    mock_update = mocker.patch("app.celery.nightly_tasks.check_and_queue_callback_tasks")
     mock_dao = mocker.patch("app.celery.nightly_tasks.dao_timeout_notifications")
+    mock_statsd = mocker.patch("app.celery.nightly_tasks.statsd_client.incr")
 
     mock_dao.side_effect = [
-        [sample_notification],  # first batch to time out
+        [sample_notification, sample_notification],  # first batch to time out
         [sample_notification],  # second batch
         [],  # nothing left to time out
     ]
 
     timeout_notifications()
     mock_dao.assert_called_with(datetime.fromisoformat("2021-12-10T10:00"))
-    assert mock_update.mock_calls == [call(sample_notification), call(sample_notification)]
+    assert mock_update.mock_calls == [
+        call([sample_notification, sample_notification]),
+        call([sample_notification]),
+    ]
+    assert mock_statsd.mock_calls == [
+        call(f"timeout-sending.{sample_notification.sent_by}", 2),
+        call(f"timeout-sending.{sample_notification.sent_by}", 1),
+    ]
 
 
 def test_delete_inbound_sms_calls_child_task(notify_api, mocker):
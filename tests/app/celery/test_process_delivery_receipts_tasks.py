@@ -0,0 +1,166 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.celery.process_delivery_receipts_tasks import (
+    MAX_DELIVERY_RECEIPT_ATTEMPTS,
+    apply_buffered_delivery_receipts,
+    apply_email_delivery_receipts,
+    apply_sms_delivery_receipts,
+)
+from app.celery.process_ses_receipts_tasks import process_ses_results
+from app.celery.research_mode_tasks import ses_notification_callback
+from app.models import Notification
+from tests.app.db import create_notification
+from tests.conftest import set_config
+
+
+def _sms_receipt(notification_id, status="10", client_name="Spryng", detailed_status_code="0"):
+    return {
+        "notification_type": "sms",
+        "status": status,
+        "reference": str(notification_id),
+        "client_name": client_name,
+        "detailed_status_code": detailed_status_code,
+    }
+
+
+def _email_receipt(reference, status="delivered"):
+    return {
+        "notification_type": "email",
+        "status": status,
+        "reference": reference,
+        "response": ses_notification_callback(reference=reference),
+    }
+
+
+def test_apply_sms_delivery_receipts_updates_notifications_and_queues_callbacks(sample_template, mocker):
+    mock_record = mocker.patch("app.celery.process_delivery_receipts_tasks.record_sms_status_update")
+    delivered = [create_notification(sample_template, status="sending", sent_at=datetime.utcnow()) for _ in range(2)]
+    failed = create_notification(sample_template, status="sending", sent_at=datetime.utcnow())
+    already_delivered = create_notification(sample_template, status="delivered")
+
+    apply_sms_delivery_receipts(
+        [_sms_receipt(notification.id) for notification in delivered]
+        + [_sms_receipt(failed.id, status="20", detailed_status_code="21")]
+        + [_sms_receipt(already_delivered.id, status="20", detailed_status_code="21")]
+    )
+
+    assert [Notification.query.get(notification.id).status for notification in delivered] == ["delivered"] * 2
+    assert Notification.query.get(failed.id).status == "permanent-failure"
+    assert Notification.query.get(already_delivered.id).status == "delivered"
+    assert sorted(
+        (str(mock_call.args[0].id), mock_call.args[1], mock_call.args[2]) for mock_call in mock_record.call_args_list
+    ) == sorted(
+        [(str(notification.id), "delivered", "Spryng") for notification in delivered]
+        + [(str(failed.id), "permanent-failure", "Spryng")]
+    )
+
+
+def test_apply_sms_delivery_receipts_sets_sent_by_if_missing(sample_template, mocker):
+    mocker.patch("app.celery.process_delivery_receipts_tasks.record_sms_status_update")
+    notification = create_notification(sample_template, status="sending", sent_by=None)
+
+    apply_sms_delivery_receipts(
+        [_sms_receipt(notification.id, status="3", client_name="MMG", detailed_status_code="5")]
+    )
+
+    updated = Notification.query.get(notification.id)
+    assert updated.status == "delivered"
+    assert updated.sent_by == "mmg"
+
+
+def test_apply_sms_delivery_receipts_skips_invalid_references(sample_template, mocker):
+    mock_update = mocker.patch(
+        "app.celery.process_delivery_receipts_tasks.notifications_dao.dao_update_notification_statuses_by_id"
+    )
+
+    apply_sms_delivery_receipts([_sms_receipt("something-bad")])
+
+    assert mock_update.call_count == 0
+
+
+def test_apply_sms_delivery_receipts_sets_technical_failure_for_unknown_status(sample_template, mocker):
+    mocker.patch("app.celery.process_delivery_receipts_tasks.record_sms_status_update")
+    notification = create_notification(sample_template, status="sending")
+
+    apply_sms_delivery_receipts([_sms_receipt(notification.id, status="000")])
+
+    assert Notification.query.get(notification.id).status == "technical-failure"
+
+
+def test_apply_email_delivery_receipts_updates_notifications(sample_email_template, mocker, mock_celery_task):
+    mock_record = mocker.patch("app.celery.process_delivery_receipts_tasks.record_ses_status_update")
+    mock_process_ses_results = mock_celery_task(process_ses_results)
+    notification = create_notification(sample_email_template, status="sending", reference="ref1")
+
+    apply_email_delivery_receipts([_email_receipt("ref1")])
+
+    assert Notification.query.get(notification.id).status == "delivered"
+    mock_record.assert_called_once_with(notification, "delivered")
+    assert mock_process_ses_results.call_count == 0
+
+
+def test_apply_email_delivery_receipts_hands_unmatched_receipts_to_process_ses_results(
+    sample_email_template, mock_celery_task
+):
+    mock_process_ses_results = mock_celery_task(process_ses_results)
+    create_notification(sample_email_template, status="delivered", reference="ref1")
+    receipts = [_email_receipt("ref1"), _email_receipt("unknown-ref")]
+
+    apply_email_delivery_receipts(receipts)
+
+    assert [mock_call.args for mock_call in mock_process_ses_results.call_args_list] == [
+        ([receipt["response"]], {"allow_buffering": False}) for receipt in receipts
+    ]
+    assert all(mock_call.kwargs == {"queue": "retry-tasks"} for mock_call in mock_process_ses_results.call_args_list)
+
+
+def test_apply_buffered_delivery_receipts_applies_receipts_by_type(notify_api, mocker):
+    sms_receipt = _sms_receipt(uuid.uuid4())
+    email_receipt = _email_receipt("ref1")
+    mocker.patch(
+        "app.celery.process_delivery_receipts_tasks.pop_buffered_delivery_receipts",
+        side_effect=[[sms_receipt, email_receipt], []],
+    )
+    mock_apply_sms = mocker.patch("app.celery.process_delivery_receipts_tasks.apply_sms_delivery_receipts")
+    mock_apply_email = mocker.patch("app.celery.process_delivery_receipts_tasks.apply_email_delivery_receipts")
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        apply_buffered_delivery_receipts()
+
+    mock_apply_sms.assert_called_once_with([sms_receipt])
+    mock_apply_email.assert_called_once_with([email_receipt])
+
+
+@pytest.mark.parametrize("exception", [SQLAlchemyError, ValueError])
+def test_apply_buffered_delivery_receipts_puts_receipts_back_if_update_fails(notify_api, mocker, exception):
+    receipt = _sms_receipt(uuid.uuid4())
+    mocker.patch("app.celery.process_delivery_receipts_tasks.pop_buffered_delivery_receipts", return_value=[receipt])
+    mocker.patch("app.celery.process_delivery_receipts_tasks.apply_sms_delivery_receipts", side_effect=exception())
+    mock_buffer = mocker.patch("app.celery.process_delivery_receipts_tasks.buffer_delivery_receipts")
+
+    with set_config(notify_api, "REDIS_ENABLED", True), pytest.raises(exception):
+        apply_buffered_delivery_receipts()
+
+    mock_buffer.assert_called_once_with([{**receipt, "attempts": 1}])
+
+
+def test_apply_buffered_delivery_receipts_drops_receipts_that_keep_failing(notify_api, mocker):
+    retried_receipt = {**_sms_receipt(uuid.uuid4()), "attempts": MAX_DELIVERY_RECEIPT_ATTEMPTS - 2}
+    failing_receipt = {**_sms_receipt(uuid.uuid4()), "attempts": MAX_DELIVERY_RECEIPT_ATTEMPTS - 1}
+    mocker.patch(
+        "app.celery.process_delivery_receipts_tasks.pop_buffered_delivery_receipts",
+        return_value=[retried_receipt, failing_receipt],
+    )
+    mocker.patch(
+        "app.celery.process_delivery_receipts_tasks.apply_sms_delivery_receipts", side_effect=SQLAlchemyError()
+    )
+    mock_buffer = mocker.patch("app.celery.process_delivery_receipts_tasks.buffer_delivery_receipts")
+
+    with set_config(notify_api, "REDIS_ENABLED", True), pytest.raises(SQLAlchemyError):
+        apply_buffered_delivery_receipts()
+
+    mock_buffer.assert_called_once_with([{**retried_receipt, "attempts": MAX_DELIVERY_RECEIPT_ATTEMPTS - 1}])
@@ -12,7 +12,7 @@ from app.celery.research_mode_tasks import (
 )
 from app.celery.service_callback_tasks import send_complaint_to_service
 from app.dao.notifications_dao import get_notification_by_id
-from app.models import Complaint, Notification
+from app.models import Complaint, NotificationHistory
 from app.notifications.notifications_ses_callback import (
     remove_emails_from_bounce,
     remove_emails_from_complaint,
@@ -22,6 +22,7 @@ from tests.app.db import (
     create_service_callback_api,
     ses_complaint_callback,
 )
+from tests.conftest import set_config
 
 
 def test_process_ses_results(sample_email_template):
@@ -33,12 +34,48 @@ def test_process_ses_results(sample_email_template):
 def test_process_ses_results_retry_called(sample_email_template, mocker):
     create_notification(sample_email_template, reference="ref1", sent_at=datetime.utcnow(), status="sending")
 
-    mocker.patch("app.dao.notifications_dao.dao_update_notifications_by_reference", side_effect=Exception("EXPECTED"))
+    mocker.patch(
+        "app.dao.notifications_dao.dao_update_sending_notification_status_by_reference",
+        side_effect=Exception("EXPECTED"),
+    )
     mocked = mocker.patch("app.celery.process_ses_receipts_tasks.process_ses_results.retry")
     process_ses_results(response=ses_notification_callback(reference="ref1"))
     assert mocked.call_count != 0
 
 
+def test_process_ses_results_buffers_receipt_if_enabled(notify_api, sample_email_template, mocker):
+    mock_buffer = mocker.patch("app.celery.process_ses_receipts_tasks.buffer_delivery_receipts")
+    mock_update = mocker.patch(
+        "app.celery.process_ses_receipts_tasks.notifications_dao.dao_update_notifications_by_reference"
+    )
+    response = ses_notification_callback(reference="ref1")
+
+    with (
+        set_config(notify_api, "BUFFER_DELIVERY_RECEIPTS_ENABLED", True),
+        set_config(notify_api, "REDIS_ENABLED", True),
+    ):
+        assert process_ses_results(response=response)
+
+    mock_buffer.assert_called_once_with(
+        [{"notification_type": "email", "status": "delivered", "reference": "ref1", "response": response}]
+    )
+    assert mock_update.call_count == 0
+
+
+def test_process_ses_results_does_not_buffer_receipt_if_not_allowed(notify_api, sample_email_template, mocker):
+    mock_buffer = mocker.patch("app.celery.process_ses_receipts_tasks.buffer_delivery_receipts")
+    notification = create_notification(sample_email_template, reference="ref1", status="sending")
+
+    with (
+        set_config(notify_api, "BUFFER_DELIVERY_RECEIPTS_ENABLED", True),
+        set_config(notify_api, "REDIS_ENABLED", True),
+    ):
+        assert process_ses_results(response=ses_notification_callback(reference="ref1"), allow_buffering=False)
+
+    assert mock_buffer.call_count == 0
+    assert get_notification_by_id(notification.id).status == "delivered"
+
+
 def test_process_ses_results_in_complaint(sample_email_template, mocker):
     notification = create_notification(template=sample_email_template, reference="ref1")
     old_updated_at = notification.updated_at
@@ -80,8 +117,9 @@ def test_ses_callback_should_update_notification_status(client, notify_db_sessio
             "callback.ses.delivered.elapsed-time", datetime.utcnow(), notification.sent_at
         )
         statsd_client.incr.assert_any_call("callback.ses.delivered")
-        updated_notification = Notification.query.get(notification.id)
-        send_mock.assert_called_once_with(updated_notification)
+        send_mock.assert_called_once()
+        assert send_mock.call_args[0][0].id == notification.id
+        assert send_mock.call_args[0][0].status == "delivered"
 
 
 def test_ses_callback_should_not_update_notification_status_if_already_delivered(sample_email_template, mocker):
@@ -98,6 +136,21 @@ def test_ses_callback_should_not_update_notification_status_if_already_delivered
     assert mock_upd.call_count == 0
 
 
+def test_ses_callback_should_update_notification_history_if_not_in_notifications(
+    sample_email_template, notify_db_session, mocker
+):
+    send_mock = mocker.patch("app.celery.process_ses_receipts_tasks.check_and_queue_callback_task")
+    notification = create_notification(template=sample_email_template, reference="ref", status="sending")
+    notify_db_session.session.add(NotificationHistory.from_original(notification))
+    notify_db_session.session.delete(notification)
+    notify_db_session.session.commit()
+
+    assert process_ses_results(ses_notification_callback(reference="ref"))
+
+    assert NotificationHistory.query.get(notification.id).status == "delivered"
+    assert send_mock.call_args[0][0].id == notification.id
+
+
 def test_ses_callback_should_retry_if_notification_is_new(client, notify_db_session, mocker, caplog):
     mock_retry = mocker.patch("app.celery.process_ses_receipts_tasks.process_ses_results.retry")
 
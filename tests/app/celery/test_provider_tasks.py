@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import ANY, call
 from uuid import UUID
 
 import boto3
@@ -16,7 +17,9 @@ from app.celery.provider_tasks import (
     _get_callback_url,
     deliver_email,
     deliver_letter,
+    deliver_letters_batch,
     deliver_sms,
+    deliver_sms_batch,
     update_letter_to_sending,
 )
 from app.clients.email import EmailClientNonRetryableException
@@ -38,6 +41,7 @@ from app.constants import (
     NOTIFICATION_TECHNICAL_FAILURE,
 )
 from app.exceptions import NotificationTechnicalFailureException
+from app.letters.utils import LetterPDFNotFound
 from tests.app.db import create_notification
 
 
@@ -122,6 +126,39 @@ def test_should_go_into_technical_error_if_exceeds_retries_on_deliver_sms_task(s
     assert f"SMS notification delivery for id: {sample_notification.id} failed" in caplog.messages
 
 
+def test_deliver_sms_batch_sends_unbatched_notifications_individually(sample_template, mocker, mock_celery_task):
+    mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    mock_deliver_sms = mock_celery_task(deliver_sms)
+    notifications = [create_notification(template=sample_template) for _ in range(3)]
+    mock_send_batch = mocker.patch(
+        "app.delivery.send_to_providers.send_sms_batch_to_provider", return_value=notifications[:2]
+    )
+
+    deliver_sms_batch([str(notification.id) for notification in notifications])
+
+    assert set(mock_send_batch.call_args.args[0]) == set(notifications)
+    assert mock_deliver_sms.call_args_list == [
+        call([str(notifications[2].id)], queue="send-sms-tasks", producer=ANY),
+    ]
+
+
+def test_deliver_sms_batch_sends_all_notifications_individually_if_batch_fails(
+    sample_template, mocker, mock_celery_task
+):
+    mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    mock_deliver_sms = mock_celery_task(deliver_sms)
+    notifications = [create_notification(template=sample_template) for _ in range(2)]
+    mocker.patch(
+        "app.delivery.send_to_providers.send_sms_batch_to_provider", side_effect=SmsClientResponseException("x")
+    )
+
+    deliver_sms_batch([str(notification.id) for notification in notifications])
+
+    assert mock_deliver_sms.call_args_list == [
+        call([str(notification.id)], queue="send-sms-tasks", producer=ANY) for notification in notifications
+    ]
+
+
 # end of deliver_sms task tests, now deliver_email task tests
 
 
@@ -212,6 +249,93 @@ def test_if_ses_send_rate_throttle_then_should_retry_and_log_warning(sample_noti
     assert f"RETRY: Email notification {sample_notification.id} was rate limited by SES" in caplog.messages
 
 
+@freeze_time("2020-02-17 16:00:00")
+def test_deliver_letters_batch_records_each_outcome_together(
+    mocker, sample_letter_template, sample_organisation, mock_celery_task
+):
+    mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    mocker.patch("app.celery.provider_tasks.boto3.client")
+    mocker.patch("app.celery.provider_tasks._get_callback_url", return_value="example.com?token=1")
+    mocker.patch("app.celery.provider_tasks.get_letter_pdf_from_s3", return_value=b"file")
+    mock_deliver_letter = mock_celery_task(deliver_letter)
+    sample_letter_template.service.organisation = sample_organisation
+    sent, duplicate, throttled, rejected = (
+        create_notification(template=sample_letter_template, to_field="A. User\nMy Street\nLondon\nSW1 1AA")
+        for _ in range(4)
+    )
+    errors = {
+        str(duplicate.id): DvlaDuplicatePrintRequestException(),
+        str(throttled.id): DvlaThrottlingException(),
+        str(rejected.id): DvlaNonRetryableException(),
+    }
+
+    def send_letter(*, notification_id, **kwargs):
+        if notification_id in errors:
+            raise errors[notification_id]
+
+    mock_client = mocker.patch("app.celery.provider_tasks.get_dvla_client").return_value
+    mock_client.send_letter.side_effect = send_letter
+
+    deliver_letters_batch([str(notification.id) for notification in (sent, duplicate, throttled, rejected)])
+
+    assert mock_client.send_letter.call_count == 4
+    assert mock_client.send_letter.call_args_list[0].kwargs["pdf_file"] == b"file"
+    assert mock_client.send_letter.call_args_list[0].kwargs["organisation_id"] == str(sample_organisation.id)
+    for notification in (sent, duplicate):
+        assert notification.status == NOTIFICATION_SENDING
+        assert notification.sent_by == "dvla"
+        assert notification.sent_at == datetime.utcnow()
+    assert throttled.status == NOTIFICATION_CREATED
+    assert rejected.status == NOTIFICATION_TECHNICAL_FAILURE
+    assert mock_deliver_letter.call_args_list == [
+        call(kwargs={"notification_id": str(throttled.id)}, queue="send-letter-tasks", producer=ANY)
+    ]
+
+
+def test_deliver_letters_batch_marks_letters_without_pdfs_as_technical_failure(
+    mocker, sample_letter_template, mock_celery_task
+):
+    mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    mocker.patch("app.celery.provider_tasks.boto3.client")
+    mocker.patch("app.celery.provider_tasks.get_letter_pdf_from_s3", side_effect=LetterPDFNotFound())
+    mock_client = mocker.patch("app.celery.provider_tasks.get_dvla_client").return_value
+    mock_deliver_letter = mock_celery_task(deliver_letter)
+    letter = create_notification(template=sample_letter_template, to_field="A. User\nMy Street\nLondon\nSW1 1AA")
+
+    deliver_letters_batch([str(letter.id)])
+
+    assert letter.status == NOTIFICATION_TECHNICAL_FAILURE
+    assert mock_client.send_letter.called is False
+    assert mock_deliver_letter.called is False
+
+
+def test_deliver_letters_batch_sends_letters_individually_if_dvla_authentication_fails(
+    mocker, sample_letter_template, mock_celery_task
+):
+    mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    mock_client = mocker.patch("app.celery.provider_tasks.get_dvla_client").return_value
+    type(mock_client).jwt_token = mocker.PropertyMock(side_effect=DvlaRetryableException())
+    mock_deliver_letter = mock_celery_task(deliver_letter)
+    letter = create_notification(template=sample_letter_template, to_field="A. User\nMy Street\nLondon\nSW1 1AA")
+
+    deliver_letters_batch([str(letter.id)])
+
+    assert letter.status == NOTIFICATION_CREATED
+    assert mock_client.send_letter.called is False
+    assert mock_deliver_letter.call_args_list == [
+        call(kwargs={"notification_id": str(letter.id)}, queue="send-letter-tasks", producer=ANY)
+    ]
+
+
+def test_deliver_letters_batch_ignores_letters_that_have_already_been_sent(mocker, sample_letter_template):
+    mock_get_dvla_client = mocker.patch("app.celery.provider_tasks.get_dvla_client")
+    letter = create_notification(template=sample_letter_template, status=NOTIFICATION_SENDING)
+
+    deliver_letters_batch([str(letter.id)])
+
+    assert mock_get_dvla_client.called is False
+
+
 @freeze_time("2020-02-17 16:00:00")
 def test_update_letter_to_sending(sample_letter_template):
     letter = create_notification(
@@ -11,6 +11,8 @@ from app.celery.reporting_tasks import (
     create_nightly_notification_status_for_service_and_day,
     create_or_update_ft_billing_for_day,
     create_or_update_ft_billing_letter_despatch_for_day,
+    update_ft_billing_for_day_incrementally,
+    update_ft_billing_for_today,
 )
 from app.config import QueueNames
 from app.constants import (
@@ -32,6 +34,7 @@ from tests.app.db import (
     create_service,
     create_template,
 )
+from tests.conftest import set_config
 
 
 def mocker_get_rate(
@@ -521,6 +524,56 @@ def test_create_or_update_ft_billing_for_day_update_when_record_exists(sample_se
     assert records[0].updated_at
 
 
+@freeze_time("2018-01-15T12:00:00")
+def test_update_ft_billing_for_day_incrementally_aggregates_every_service_on_first_run(notify_api, mocker):
+    mocker.patch("app.celery.reporting_tasks.redis_store.get", return_value=None)
+    mock_set = mocker.patch("app.celery.reporting_tasks.redis_store.set")
+    mock_create_or_update = mocker.patch("app.celery.reporting_tasks.create_or_update_ft_billing_for_day")
+
+    update_ft_billing_for_day_incrementally("2018-01-15")
+
+    mock_create_or_update.assert_called_once_with(process_day="2018-01-15")
+    mock_set.assert_called_once_with(
+        "update_ft_billing_for_today:2018-01-15:aggregated-up-to-utc-isoformat", "2018-01-15T12:00:00", ex=172800
+    )
+
+
+@freeze_time("2018-01-15T12:00:00")
+def test_update_ft_billing_for_day_incrementally_only_aggregates_changed_services(notify_db_session, mocker):
+    mocker.patch("app.dao.fact_billing_dao.get_rate", side_effect=mocker_get_rate)
+    mocker.patch("app.celery.reporting_tasks.redis_store.get", return_value=b"2018-01-15T11:00:00")
+    mocker.patch("app.celery.reporting_tasks.redis_store.set")
+    unchanged_template = create_template(create_service(service_name="unchanged"))
+    changed_template = create_template(create_service(service_name="changed"))
+    for template, updated_at in (
+        (unchanged_template, datetime(2018, 1, 15, 10, 30)),
+        (changed_template, datetime(2018, 1, 15, 10, 30)),
+        (changed_template, datetime(2018, 1, 15, 11, 30)),
+    ):
+        create_notification(
+            template, status="delivered", created_at=datetime(2018, 1, 15, 10, 0), updated_at=updated_at
+        )
+
+    update_ft_billing_for_day_incrementally("2018-01-15")
+
+    records = FactBilling.query.all()
+    assert len(records) == 1
+    assert records[0].service_id == changed_template.service_id
+    assert records[0].notifications_sent == 2
+
+
+def test_update_ft_billing_for_today_aggregates_incrementally_if_enabled(notify_api, mocker):
+    mocker.patch("app.celery.reporting_tasks.redis_store.set")
+    mock_incrementally = mocker.patch("app.celery.reporting_tasks.update_ft_billing_for_day_incrementally")
+    mock_create_or_update = mocker.patch("app.celery.reporting_tasks.create_or_update_ft_billing_for_day")
+
+    with set_config(notify_api, "INCREMENTAL_FT_BILLING_ENABLED", True):
+        update_ft_billing_for_today()
+
+    assert mock_incrementally.call_count == 1
+    assert mock_create_or_update.call_count == 0
+
+
 def test_create_nightly_notification_status_for_service_and_day(notify_db_session):
     first_service = create_service(service_name="First Service")
     first_template = create_template(service=first_service)
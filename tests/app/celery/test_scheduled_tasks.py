@@ -52,6 +52,7 @@ from app.config import Config, QueueNames, TaskNames
 from app.constants import (
     JOB_STATUS_ERROR,
     JOB_STATUS_FINISHED,
+    JOB_STATUS_FINISHED_ALL_NOTIFICATIONS_CREATED,
     JOB_STATUS_IN_PROGRESS,
     JOB_STATUS_PENDING,
     NOTIFICATION_DELIVERED,
@@ -770,6 +771,80 @@ def test_check_for_missing_rows_in_completed_jobs_uses_sender_id(
     ]
 
 
+@pytest.mark.parametrize("rows_not_created", (set(), None))
+def test_check_for_missing_rows_in_completed_jobs_from_bitmaps_marks_complete_jobs(
+    notify_api, mocker, sample_email_template, rows_not_created
+):
+    job = create_job(
+        template=sample_email_template,
+        notification_count=2,
+        job_status=JOB_STATUS_FINISHED,
+        processing_finished=datetime.utcnow() - timedelta(minutes=20),
+    )
+    for i in range(2):
+        create_notification(job=job, job_row_number=i)
+    mock_get_rows = mocker.patch("app.celery.scheduled_tasks.get_job_rows_not_created", return_value=rows_not_created)
+    process_job_row = mocker.patch("app.celery.scheduled_tasks.process_job_row")
+
+    with set_config_values(notify_api, {"JOB_CREATED_ROWS_BITMAP_ENABLED": True, "REDIS_ENABLED": True}):
+        check_for_missing_rows_in_completed_jobs()
+
+    mock_get_rows.assert_called_once_with(job.id, 2)
+    assert dao_get_job_by_id(job.id).job_status == JOB_STATUS_FINISHED_ALL_NOTIFICATIONS_CREATED
+    assert process_job_row.called is False
+
+
+def test_check_for_missing_rows_in_completed_jobs_from_bitmaps_confirms_gaps(
+    notify_api, mocker, sample_email_template, mock_celery_task
+):
+    job = create_job(
+        template=sample_email_template,
+        notification_count=5,
+        job_status=JOB_STATUS_FINISHED,
+        processing_finished=datetime.utcnow() - timedelta(minutes=20),
+    )
+    for i in range(4):
+        create_notification(job=job, job_row_number=i)
+    # row 2 has a notification even though its bit was never set
+    mocker.patch("app.celery.scheduled_tasks.get_job_rows_not_created", return_value={2, 4})
+    mocker.patch(
+        "app.celery.tasks.s3.get_job_and_metadata_from_s3",
+        return_value=(load_example_csv("multiple_email"), {"sender_id": None}),
+    )
+    mock_encode = mocker.patch("app.signing.encode", return_value="something_encoded")
+    mocker.patch("app.celery.tasks.create_uuid", return_value="some-uuid")
+    mock_save_email = mock_celery_task(save_email)
+
+    with set_config_values(notify_api, {"JOB_CREATED_ROWS_BITMAP_ENABLED": True, "REDIS_ENABLED": True}):
+        check_for_missing_rows_in_completed_jobs()
+
+    assert [mock_call.args[0]["row_number"] for mock_call in mock_encode.call_args_list] == [4]
+    assert mock_save_email.call_count == 1
+    assert dao_get_job_by_id(job.id).job_status == JOB_STATUS_FINISHED
+
+
+def test_check_for_missing_rows_in_completed_jobs_from_bitmaps_marks_complete_jobs_with_gaps_only_in_the_bitmap(
+    notify_api, mocker, sample_email_template
+):
+    job = create_job(
+        template=sample_email_template,
+        notification_count=2,
+        job_status=JOB_STATUS_FINISHED,
+        processing_finished=datetime.utcnow() - timedelta(minutes=20),
+    )
+    for i in range(2):
+        create_notification(job=job, job_row_number=i)
+    # both rows have notifications even though row 1's bit was never set
+    mocker.patch("app.celery.scheduled_tasks.get_job_rows_not_created", return_value={1})
+    process_job_row = mocker.patch("app.celery.scheduled_tasks.process_job_row")
+
+    with set_config_values(notify_api, {"JOB_CREATED_ROWS_BITMAP_ENABLED": True, "REDIS_ENABLED": True}):
+        check_for_missing_rows_in_completed_jobs()
+
+    assert dao_get_job_by_id(job.id).job_status == JOB_STATUS_FINISHED_ALL_NOTIFICATIONS_CREATED
+    assert process_job_row.called is False
+
+
 MockServicesSendingToTVNumbers = namedtuple(
     "ServicesSendingToTVNumbers",
     [
@@ -13,8 +13,11 @@ from app import signing
 from app.celery.service_callback_tasks import (
     _send_data_to_service_callback_api,
     create_returned_letter_callback_data,
+    queue_delivery_status_callback,
+    send_buffered_delivery_status_callbacks,
     send_complaint_to_service,
     send_delivery_status_to_service,
+    send_delivery_statuses_to_service,
     send_inbound_sms_to_service,
     send_returned_letter_to_service,
 )
@@ -23,6 +26,7 @@ from app.constants import (
     NOTIFICATION_RETURNED_LETTER,
     ServiceCallbackTypes,
 )
+from app.notifications.service_callbacks_buffer import service_callbacks_buffer_key
 from app.utils import DATETIME_FORMAT
 from tests.app.db import (
     create_api_key,
@@ -37,6 +41,7 @@ from tests.app.db import (
     create_service_contact_list,
     create_template,
 )
+from tests.conftest import set_config
 
 
 def _set_up_test_data(notification_type, callback_type):
@@ -343,3 +348,125 @@ def test__send_data_to_service_callback_api_doesnt_retry_if_non_retry_status_cod
         _send_data_to_service_callback_api(celery_task_mock, data, callback_url, "my-token", "my_function_name")
 
     celery_task_mock.retry.assert_not_called()
+
+
+def test__send_data_to_service_callback_api_looks_up_client_certificate_once_per_host(notify_api, mocker):
+    mocker.patch.dict("app.celery.service_callback_tasks._client_certificate_paths", clear=True)
+    mock_exists = mocker.patch("app.celery.service_callback_tasks.os.path.exists", return_value=True)
+    callback_url = "https://callbacks.example.com/callback"
+
+    with requests_mock.Mocker() as request_mock:
+        request_mock.post(callback_url, json={}, status_code=200)
+        for _ in range(2):
+            _send_data_to_service_callback_api(mock.MagicMock(), {"id": "hello"}, callback_url, "token", "my_function")
+
+    mock_exists.assert_called_once_with(f"{notify_api.config['SSL_CERT_DIR']}/callbacks-example-com.pem")
+    assert request_mock.request_history[1].cert == f"{notify_api.config['SSL_CERT_DIR']}/callbacks-example-com.pem"
+
+
+def test_queue_delivery_status_callback_buffers_callback_if_endpoint_takes_batches(
+    notify_api, mocker, mock_celery_task
+):
+    mock_send = mock_celery_task(send_delivery_status_to_service)
+    mock_buffer = mocker.patch("app.celery.service_callback_tasks.buffer_delivery_status_callback")
+    callback_api = mock.Mock(url="https://some.service.gov.uk/", bearer_token="something_unique", batch_callbacks=True)
+    notification_id = uuid.uuid4()
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        queue_delivery_status_callback(notification_id, "encoded_status_update", callback_api)
+
+    mock_buffer.assert_called_once_with(callback_api, "encoded_status_update")
+    assert mock_send.called is False
+
+
+@pytest.mark.parametrize("batch_callbacks, redis_enabled", [(False, True), (True, False)])
+def test_queue_delivery_status_callback_queues_callback_on_its_own_unless_endpoint_takes_batches(
+    notify_api, mocker, mock_celery_task, batch_callbacks, redis_enabled
+):
+    mock_send = mock_celery_task(send_delivery_status_to_service)
+    mock_buffer = mocker.patch("app.celery.service_callback_tasks.buffer_delivery_status_callback")
+    callback_api = mock.Mock(
+        url="https://some.service.gov.uk/", bearer_token="something_unique", batch_callbacks=batch_callbacks
+    )
+    notification_id = uuid.uuid4()
+
+    with set_config(notify_api, "REDIS_ENABLED", redis_enabled):
+        queue_delivery_status_callback(notification_id, "encoded_status_update", callback_api)
+
+    assert mock_buffer.called is False
+    mock_send.assert_called_once_with(
+        [str(notification_id), "encoded_status_update"], queue="service-callbacks", producer=None
+    )
+
+
+def test_send_buffered_delivery_status_callbacks_queues_batches_for_each_endpoint(notify_api, mocker, mock_celery_task):
+    mock_send = mock_celery_task(send_delivery_statuses_to_service)
+    mocker.patch("app.celery.service_callback_tasks.SERVICE_CALLBACK_BATCH_SIZE", 2)
+    mocker.patch(
+        "app.celery.service_callback_tasks.get_service_callbacks_buffer_keys", return_value=["buffer-1", "buffer-2"]
+    )
+    mock_pop = mocker.patch(
+        "app.celery.service_callback_tasks.pop_buffered_delivery_status_callbacks",
+        side_effect=[["a", "b"], ["c"], ["d", "e"], []],
+    )
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        send_buffered_delivery_status_callbacks()
+
+    assert mock_pop.call_args_list == [
+        mock.call("buffer-1", 2),
+        mock.call("buffer-1", 2),
+        mock.call("buffer-2", 2),
+        mock.call("buffer-2", 2),
+    ]
+    assert mock_send.call_args_list == [
+        mock.call([["a", "b"]], queue="service-callbacks"),
+        mock.call([["c"]], queue="service-callbacks"),
+        mock.call([["d", "e"]], queue="service-callbacks"),
+    ]
+
+
+def test_send_delivery_statuses_to_service_sends_callbacks_as_one_request(notify_db_session, mocker):
+    callback_api, template = _set_up_test_data("sms", "delivery_status")
+    notifications = [create_notification(template=template, status="delivered") for _ in range(2)]
+    mock_acquire = mocker.patch(
+        "app.celery.service_callback_tasks.acquire_service_callback_slot", return_value="buffer-key-slot-0"
+    )
+    mock_release = mocker.patch("app.celery.service_callback_tasks.release_service_callback_slot")
+    send_callback_mock = mocker.patch("app.celery.service_callback_tasks._send_data_to_service_callback_api")
+
+    send_delivery_statuses_to_service(
+        [_set_up_data_for_status_update(callback_api, notification) for notification in notifications]
+    )
+
+    buffer_key = service_callbacks_buffer_key(callback_api.url, callback_api.bearer_token)
+    mock_acquire.assert_called_once_with(buffer_key)
+    mock_release.assert_called_once_with("buffer-key-slot-0")
+    send_callback_mock.assert_called_once_with(
+        mock.ANY,
+        [mock.ANY, mock.ANY],
+        callback_api.url,
+        callback_api.bearer_token,
+        "send_delivery_statuses_to_service",
+    )
+    assert [data["id"] for data in send_callback_mock.call_args[0][1]] == [
+        str(notification.id) for notification in notifications
+    ]
+    assert send_callback_mock.call_args[0][1][0]["status"] == "delivered"
+
+
+def test_send_delivery_statuses_to_service_buffers_callbacks_again_if_endpoint_is_busy(notify_db_session, mocker):
+    callback_api, template = _set_up_test_data("sms", "delivery_status")
+    encoded_status_updates = [_set_up_data_for_status_update(callback_api, create_notification(template=template))]
+    mocker.patch("app.celery.service_callback_tasks.acquire_service_callback_slot", return_value=None)
+    mock_release = mocker.patch("app.celery.service_callback_tasks.release_service_callback_slot")
+    mock_buffer = mocker.patch("app.celery.service_callback_tasks.return_delivery_status_callbacks_to_buffer")
+    send_callback_mock = mocker.patch("app.celery.service_callback_tasks._send_data_to_service_callback_api")
+
+    send_delivery_statuses_to_service(encoded_status_updates)
+
+    mock_buffer.assert_called_once_with(
+        service_callbacks_buffer_key(callback_api.url, callback_api.bearer_token), encoded_status_updates
+    )
+    assert send_callback_mock.called is False
+    assert mock_release.called is False
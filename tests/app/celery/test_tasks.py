@@ -15,7 +15,7 @@ from notifications_utils.template import (
 )
 from sqlalchemy.exc import SQLAlchemyError
 
-from app import signing
+from app import notify_celery, signing
 from app.celery import provider_tasks, tasks
 from app.celery.letters_pdf_tasks import get_pdf_for_templated_letter
 from app.celery.service_callback_tasks import send_returned_letter_to_service
@@ -25,6 +25,7 @@ from app.celery.tasks import (
     UnprocessableJobRow,
     _check_and_queue_returned_letter_callback_task,
     get_id_task_args_kwargs_for_job_row,
+    get_job_rows_and_template_and_sender_id,
     get_recipient_csv_and_template_and_sender_id,
     process_incomplete_job,
     process_incomplete_jobs,
@@ -33,6 +34,7 @@ from app.celery.tasks import (
     process_returned_letters_list,
     s3,
     save_email,
+    save_job_rows,
     save_letter,
     save_sms,
     shatter_job_rows,
@@ -51,6 +53,7 @@ from app.constants import (
     SMS_TYPE,
 )
 from app.dao import jobs_dao, report_requests_dao, service_email_reply_to_dao, service_sms_sender_dao
+from app.job.recipient_csv_stream import UnstreamableJobFile
 from app.models import Job, Notification, NotificationHistory, ReturnedLetter
 from app.serialised_models import SerialisedService, SerialisedTemplate
 from app.v2.errors import TooManyRequestsError
@@ -70,6 +73,7 @@ from tests.app.db import (
     create_template,
     create_user,
 )
+from tests.conftest import set_config
 
 
 class AnyStringWith(str):
@@ -99,6 +103,7 @@ def test_should_have_decorated_tasks_functions():
     assert save_sms.__wrapped__.__name__ == "save_sms"
     assert save_email.__wrapped__.__name__ == "save_email"
     assert save_letter.__wrapped__.__name__ == "save_letter"
+    assert save_job_rows.__wrapped__.__name__ == "save_job_rows"
     assert process_returned_letters_list.__wrapped__.__name__ == "process_returned_letters_list"
     assert process_incomplete_jobs.__wrapped__.__name__ == "process_incomplete_jobs"
 
@@ -1110,6 +1115,191 @@ def test_shatter_job_rows(template_type, send_fn, mock_celery_task, mocker):
     ]
 
 
+@pytest.mark.parametrize("template_type", [SMS_TYPE, EMAIL_TYPE])
+def test_shatter_job_rows_sends_whole_batch_to_save_job_rows_if_enabled(
+    notify_api, template_type, mock_celery_task, mocker
+):
+    mock_save_job_rows = mock_celery_task(save_job_rows)
+    mock_send_fn = mock_celery_task(save_sms if template_type == SMS_TYPE else save_email)
+    args_kwargs_seq = [
+        (("service-id-0", "notification-id-0", "encoded-0"), {}),
+        (("service-id-0", "notification-id-1", "encoded-1"), {}),
+    ]
+
+    with set_config(notify_api, "BATCH_SAVE_JOB_ROWS_ENABLED", True):
+        shatter_job_rows(template_type, args_kwargs_seq)
+
+    assert mock_save_job_rows.mock_calls == [call((template_type, args_kwargs_seq), queue="database-tasks")]
+    assert mock_send_fn.called is False
+
+
+def test_shatter_job_rows_does_not_batch_letters(notify_api, mock_celery_task, mocker):
+    mock_save_job_rows = mock_celery_task(save_job_rows)
+    mock_save_letter = mock_celery_task(save_letter)
+
+    with set_config(notify_api, "BATCH_SAVE_JOB_ROWS_ENABLED", True):
+        shatter_job_rows(LETTER_TYPE, [(("service-id-0", "notification-id-0", "encoded-0"), {})])
+
+    assert mock_save_job_rows.called is False
+    assert mock_save_letter.mock_calls == [
+        call(("service-id-0", "notification-id-0", "encoded-0"), {}, queue="database-tasks")
+    ]
+
+
+@pytest.fixture
+def mock_producer_or_acquire(mocker):
+    return mocker.patch.object(notify_celery, "producer_or_acquire")
+
+
+def test_save_job_rows_persists_sms_batch_and_queues_deliveries(sample_job, mock_celery_task, mock_producer_or_acquire):
+    mock_deliver_sms = mock_celery_task(provider_tasks.deliver_sms)
+    notification_ids = [str(uuid.uuid4()) for _ in range(3)]
+    args_kwargs_seq = [
+        (
+            (
+                str(sample_job.service_id),
+                notification_id,
+                signing.encode(
+                    _notification_json(sample_job.template, to="+447234123123", job_id=sample_job.id, row_number=i)
+                ),
+            ),
+            {},
+        )
+        for i, notification_id in enumerate(notification_ids)
+    ]
+
+    save_job_rows(SMS_TYPE, args_kwargs_seq)
+
+    persisted_notifications = Notification.query.order_by(Notification.job_row_number).all()
+    assert [str(n.id) for n in persisted_notifications] == notification_ids
+    assert [n.job_row_number for n in persisted_notifications] == [0, 1, 2]
+    assert all(n.job_id == sample_job.id for n in persisted_notifications)
+    assert all(n.status == "created" for n in persisted_notifications)
+    assert all(n.billable_units == 0 for n in persisted_notifications)
+    assert mock_deliver_sms.mock_calls == [
+        call([notification_id], queue="send-sms-tasks", producer=ANY) for notification_id in notification_ids
+    ]
+    assert mock_producer_or_acquire.call_count == 1
+
+
+def test_save_job_rows_does_not_queue_rows_that_already_exist(sample_job, mock_celery_task, mock_producer_or_acquire):
+    mock_deliver_sms = mock_celery_task(provider_tasks.deliver_sms)
+    existing = create_notification(template=sample_job.template, job=sample_job, job_row_number=0)
+    new_notification_id = str(uuid.uuid4())
+    args_kwargs_seq = [
+        (
+            (
+                str(sample_job.service_id),
+                notification_id,
+                signing.encode(
+                    _notification_json(sample_job.template, to="+447234123123", job_id=sample_job.id, row_number=i)
+                ),
+            ),
+            {},
+        )
+        for i, notification_id in enumerate([str(existing.id), new_notification_id])
+    ]
+
+    save_job_rows(SMS_TYPE, args_kwargs_seq)
+
+    assert Notification.query.count() == 2
+    assert mock_deliver_sms.mock_calls == [call([new_notification_id], queue="send-sms-tasks", producer=ANY)]
+
+
+def test_save_job_rows_saves_invalid_numbers_as_validation_failed_and_does_not_send_them(
+    sample_job, mock_celery_task, mock_producer_or_acquire
+):
+    mock_deliver_sms = mock_celery_task(provider_tasks.deliver_sms)
+    notification_id = str(uuid.uuid4())
+    encoded = signing.encode(
+        _notification_json(
+            sample_job.template, to="+447234123122343253243425324233", job_id=sample_job.id, row_number=0
+        )
+    )
+
+    save_job_rows(SMS_TYPE, [((str(sample_job.service_id), notification_id, encoded), {})])
+
+    persisted_notification = Notification.query.one()
+    assert persisted_notification.status == NOTIFICATION_VALIDATION_FAILED
+    assert persisted_notification.rate_multiplier == 0
+    mock_deliver_sms.assert_not_called()
+
+
+def test_save_job_rows_persists_email_batch_with_reply_to_from_sender_id(
+    notify_db_session, mock_celery_task, mock_producer_or_acquire
+):
+    service = create_service()
+    reply_to = create_reply_to_email(service=service, email_address="reply_to@digital.gov.uk", is_default=False)
+    template = create_template(service=service, template_type=EMAIL_TYPE, subject="Hello")
+    job = create_job(template=template, notification_count=2)
+    mock_deliver_email = mock_celery_task(provider_tasks.deliver_email)
+    args_kwargs_seq = [
+        (
+            (
+                str(service.id),
+                str(uuid.uuid4()),
+                signing.encode(_notification_json(template, to=f"test-{i}@example.com", job_id=job.id, row_number=i)),
+            ),
+            {"sender_id": str(reply_to.id)},
+        )
+        for i in range(2)
+    ]
+
+    save_job_rows(EMAIL_TYPE, args_kwargs_seq)
+
+    persisted_notifications = Notification.query.order_by(Notification.job_row_number).all()
+    assert [n.to for n in persisted_notifications] == ["test-0@example.com", "test-1@example.com"]
+    assert [n.normalised_to for n in persisted_notifications] == ["test-0@example.com", "test-1@example.com"]
+    assert all(n.reply_to_text == "reply_to@digital.gov.uk" for n in persisted_notifications)
+    assert mock_deliver_email.call_count == 2
+
+
+def test_save_job_rows_queues_sms_with_the_same_content_as_one_batch(
+    notify_api, sample_service, mock_celery_task, mock_producer_or_acquire
+):
+    template = create_template(sample_service, content="Hello ((name))")
+    job = create_job(template)
+    mock_deliver_sms = mock_celery_task(provider_tasks.deliver_sms)
+    mock_deliver_sms_batch = mock_celery_task(provider_tasks.deliver_sms_batch)
+    notification_ids = [str(uuid.uuid4()) for _ in range(3)]
+    args_kwargs_seq = [
+        (
+            (
+                str(job.service_id),
+                notification_id,
+                signing.encode(
+                    _notification_json(
+                        template, to=f"+44723412312{i}", personalisation={"name": name}, job_id=job.id, row_number=i
+                    )
+                ),
+            ),
+            {},
+        )
+        for i, (notification_id, name) in enumerate(zip(notification_ids, ["Jo", "Al", "Jo"], strict=True))
+    ]
+
+    with set_config(notify_api, "BATCH_DELIVER_SMS_ENABLED", True):
+        save_job_rows(SMS_TYPE, args_kwargs_seq)
+
+    assert mock_deliver_sms_batch.mock_calls == [
+        call([[notification_ids[0], notification_ids[2]]], queue="send-sms-tasks", producer=ANY)
+    ]
+    assert mock_deliver_sms.mock_calls == [call([notification_ids[1]], queue="send-sms-tasks", producer=ANY)]
+
+
+def test_save_job_rows_retries_on_database_error(sample_job, mocker, mock_celery_task, mock_producer_or_acquire):
+    mock_deliver_sms = mock_celery_task(provider_tasks.deliver_sms)
+    mocker.patch("app.celery.tasks.persist_notifications_in_bulk", side_effect=SQLAlchemyError("connection lost"))
+    mock_retry = mocker.patch("app.celery.tasks.save_job_rows.retry", side_effect=Retry)
+    encoded = signing.encode(_notification_json(sample_job.template, to="+447234123123", job_id=sample_job.id))
+
+    with pytest.raises(Retry):
+        save_job_rows(SMS_TYPE, [((str(sample_job.service_id), str(uuid.uuid4()), encoded), {})])
+
+    assert mock_retry.call_args.kwargs["queue"] == "retry-tasks"
+    mock_deliver_sms.assert_not_called()
+
+
 # -------- save_sms and save_email tests -------- #
 
 
@@ -2006,6 +2196,64 @@ def test_get_sms_template_instance(mocker, mock_celery_task, sample_template, sa
     assert recipient_csv.placeholders == ["phone number"]
 
 
+@pytest.fixture
+def mock_streamed_job_file(mocker):
+    def _mock_streamed_job_file(contents, metadata):
+        data = contents.encode("utf-8")
+        mocker.patch(
+            "app.job.recipient_csv_stream.s3.get_job_size_and_metadata_from_s3",
+            return_value=(len(data), metadata),
+        )
+        mocker.patch(
+            "app.job.recipient_csv_stream.s3.get_job_byte_range_from_s3",
+            side_effect=lambda service_id, job_id, first_byte, last_byte: data[first_byte : last_byte + 1],
+        )
+
+    return _mock_streamed_job_file
+
+
+def test_get_job_rows_streams_job_file_if_enabled(notify_api, mocker, sample_job, mock_streamed_job_file):
+    mock_streamed_job_file(load_example_csv("multiple_sms"), {"sender_id": "1234"})
+    mock_get_whole_file = mocker.patch("app.celery.tasks.s3.get_job_and_metadata_from_s3")
+
+    with set_config(notify_api, "STREAM_JOB_FILES_FROM_S3", True):
+        rows, template, sender_id = get_job_rows_and_template_and_sender_id(sample_job, start_row=8)
+
+        assert [(row.index, row.recipient) for row in rows] == [(8, "+441234123129"), (9, "+441234123120")]
+
+    assert isinstance(template, SMSMessageTemplate)
+    assert sender_id == "1234"
+    assert mock_get_whole_file.called is False
+
+
+def test_get_job_rows_reads_whole_file_if_it_cannot_be_streamed(notify_api, mocker, sample_job):
+    mocker.patch("app.celery.tasks.StreamingRecipientCSV", side_effect=UnstreamableJobFile)
+    mocker.patch(
+        "app.celery.tasks.s3.get_job_and_metadata_from_s3",
+        return_value=(load_example_csv("multiple_sms"), {"sender_id": None}),
+    )
+
+    with set_config(notify_api, "STREAM_JOB_FILES_FROM_S3", True):
+        rows, _template, sender_id = get_job_rows_and_template_and_sender_id(sample_job, start_row=9)
+
+        assert [row.index for row in rows] == [9]
+
+    assert sender_id is None
+
+
+def test_process_job_streams_job_file_if_enabled(
+    notify_api, mocker, sample_job, mock_celery_task, mock_streamed_job_file
+):
+    mock_streamed_job_file(load_example_csv("multiple_sms"), {"sender_id": None})
+    mock_shatter_job_rows = mock_celery_task(shatter_job_rows)
+
+    with set_config(notify_api, "STREAM_JOB_FILES_FROM_S3", True):
+        process_job(sample_job.id, shatter_batch_size=4)
+
+    assert [len(mock_call.args[0][1]) for mock_call in mock_shatter_job_rows.mock_calls] == [4, 4, 2]
+    assert Job.query.get(sample_job.id).job_status == JOB_STATUS_FINISHED
+
+
 @pytest.mark.skip(reason="[NOTIFYNL] Dutch postal address implementation - less lines that uk")
 def test_get_letter_template_instance(mocker, mock_celery_task, sample_job):
     mocker.patch(
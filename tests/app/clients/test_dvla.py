@@ -4,6 +4,7 @@ import string
 import sys
 import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import Mock
 
@@ -185,6 +186,23 @@ def test_jwt_token_calls_authenticate_if_expiry_time_passed(dvla_client, rmock):
     assert mock_authenticate.called_once
 
 
+def test_jwt_token_authenticates_once_for_threads_sharing_the_client(dvla_client, mocker):
+    sample_token = jwt.encode(payload={"exp": int(time.time()) + 3600}, key="foo")
+
+    def authenticate():
+        # give the other threads time to find the token missing too
+        time.sleep(0.05)
+        return sample_token
+
+    mock_authenticate = mocker.patch.object(dvla_client, "authenticate", side_effect=authenticate)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        tokens = list(executor.map(lambda _: dvla_client.jwt_token, range(5)))
+
+    assert tokens == [sample_token] * 5
+    assert mock_authenticate.call_count == 1
+
+
 def test_authenticate_raises_retryable_exception_if_credentials_are_invalid(dvla_client, rmock):
     assert dvla_client.dvla_password.get() == "some password"
 
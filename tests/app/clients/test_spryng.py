@@ -0,0 +1,71 @@
+import json
+
+import pytest
+import requests_mock
+from requests.exceptions import ConnectTimeout
+
+from app.clients.sms import SmsClientResponseException
+from app.clients.sms.spryng import get_spryng_responses
+
+
+def test_get_spryng_responses_should_return_correct_details_for_delivery():
+    assert get_spryng_responses("10", "0") == ("delivered", "No error")
+
+
+def test_try_send_sms_posts_message_for_one_recipient(notify_api, mock_spryng_client):
+    with requests_mock.Mocker() as request_mock:
+        request_mock.post("https://example.com/spryng", json={"id": "1234"}, status_code=200)
+        mock_spryng_client.try_send_sms("+31612345678", "my message", "my-reference", False, "sender")
+
+    assert request_mock.call_count == 1
+    assert request_mock.request_history[0].headers["Authorization"] == "Bearer foo"
+    assert json.loads(request_mock.request_history[0].text) == {
+        "originator": "sender",
+        "recipients": ["31612345678"],
+        "body": "my message",
+        "reference": "my-reference",
+        "route": "business",
+        "encoding": "unicode",
+    }
+
+
+def test_try_send_sms_uses_keep_alive_session(notify_api, mock_spryng_client, mocker):
+    mock_request = mocker.patch.object(mock_spryng_client.requests_session, "request")
+    mock_request.return_value.text = "{}"
+    mock_request.return_value.status_code = 200
+
+    mock_spryng_client.try_send_sms("+31612345678", "my message", "my-reference", False, "sender")
+
+    assert mock_request.call_count == 1
+
+
+def test_try_send_sms_batch_posts_one_message_for_all_recipients(notify_api, mock_spryng_client):
+    with requests_mock.Mocker() as request_mock:
+        request_mock.post("https://example.com/spryng", json={"id": "1234"}, status_code=200)
+        mock_spryng_client.try_send_sms_batch(
+            ["+31612345678", "+31612345679", "+31612345670"], "my message", "batch-reference", "sender"
+        )
+
+    assert request_mock.call_count == 1
+    request_args = json.loads(request_mock.request_history[0].text)
+    assert request_args["recipients"] == ["31612345678", "31612345679", "31612345670"]
+    assert request_args["reference"] == "batch-reference"
+
+
+def test_send_sms_batch_records_outcome(notify_api, mock_spryng_client):
+    with requests_mock.Mocker() as request_mock:
+        request_mock.post("https://example.com/spryng", json={"id": "1234"}, status_code=200)
+        mock_spryng_client.send_sms_batch(["+31612345678", "+31612345679"], "my message", "batch-reference", "sender")
+
+    mock_spryng_client.statsd_client.incr.assert_called_once_with("clients.spryng.success")
+    assert mock_spryng_client.statsd_client.timing.call_args.args[0] == "clients.spryng.batch-request-time"
+
+
+def test_send_sms_batch_raises_if_request_fails(notify_api, mock_spryng_client):
+    with pytest.raises(SmsClientResponseException) as exc:
+        with requests_mock.Mocker() as request_mock:
+            request_mock.register_uri("POST", "https://example.com/spryng", exc=ConnectTimeout)
+            mock_spryng_client.send_sms_batch(["+31612345678"], "my message", "batch-reference", "sender")
+
+    assert "Request failed" in str(exc.value)
+    mock_spryng_client.statsd_client.incr.assert_called_once_with("clients.spryng.error")
@@ -7,6 +7,7 @@ from freezegun import freeze_time
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 
+from app import db
 from app.constants import (
     JOB_STATUS_IN_PROGRESS,
     KEY_TYPE_NORMAL,
@@ -23,6 +24,7 @@ from app.constants import (
 )
 from app.dao.notifications_dao import (
     dao_create_notification,
+    dao_create_notifications_in_bulk,
     dao_delete_notifications_by_id,
     dao_get_last_notification_added_for_job_id,
     dao_get_letters_and_sheets_volume_by_postage,
@@ -35,14 +37,20 @@ from app.dao.notifications_dao import (
     dao_record_letter_despatched_on_by_id,
     dao_timeout_notifications,
     dao_update_notification,
+    dao_update_notification_statuses_by_id,
+    dao_update_notification_statuses_by_reference,
     dao_update_notifications_by_reference,
+    dao_update_sending_notification_status_by_reference,
     get_notification_by_id,
+    get_notification_keyset_for_csv,
     get_notification_with_personalisation,
     get_notifications_for_job,
     get_notifications_for_service,
+    get_notifications_for_service_for_csv,
     get_service_ids_with_notifications_on_date,
     is_delivery_slow_for_providers,
     notifications_not_yet_sent,
+    record_notification_status_changes,
     update_notification_status_by_id,
 )
 from app.models import Job, LetterCostThreshold, Notification, NotificationHistory, NotificationLetterDespatch
@@ -214,6 +222,129 @@ def test_create_notification_creates_notification_with_personalisation(sample_te
     assert {"name": "Jo"} == notification_from_db.personalisation
 
 
+def test_dao_create_notifications_in_bulk_inserts_all_rows(sample_template, sample_job):
+    notifications = [
+        Notification(id=uuid.uuid4(), job_row_number=i, **_notification_json(sample_template, job_id=sample_job.id))
+        for i in range(3)
+    ]
+    for notification in notifications:
+        notification.personalisation = {"row": notification.job_row_number}
+
+    inserted_ids = dao_create_notifications_in_bulk(notifications)
+
+    assert inserted_ids == {str(notification.id) for notification in notifications}
+    notifications_from_db = Notification.query.order_by(Notification.job_row_number).all()
+    assert [n.job_row_number for n in notifications_from_db] == [0, 1, 2]
+    assert [n.personalisation for n in notifications_from_db] == [{"row": 0}, {"row": 1}, {"row": 2}]
+    assert all(n.status == "created" for n in notifications_from_db)
+    assert all(n.international is False for n in notifications_from_db)
+
+
+def test_dao_create_notifications_in_bulk_skips_existing_rows(sample_template, sample_job):
+    existing = create_notification(template=sample_template, job=sample_job, job_row_number=0)
+    notifications = [
+        Notification(id=uuid.uuid4(), job_row_number=i, **_notification_json(sample_template, job_id=sample_job.id))
+        for i in range(2)
+    ]
+
+    inserted_ids = dao_create_notifications_in_bulk(notifications)
+
+    assert inserted_ids == {str(notifications[1].id)}
+    assert Notification.query.count() == 2
+    assert Notification.query.filter_by(job_row_number=0).one().id == existing.id
+
+
+def test_dao_create_notifications_in_bulk_does_nothing_for_empty_list(notify_db_session):
+    assert dao_create_notifications_in_bulk([]) == set()
+    assert Notification.query.count() == 0
+
+
+def test_dao_update_notification_statuses_by_id_only_updates_notifications_awaiting_a_status(sample_template):
+    sending = create_notification(sample_template, status="sending", sent_by="spryng")
+    no_sent_by = create_notification(sample_template, status="pending", sent_by=None)
+    already_failed = create_notification(sample_template, status="permanent-failure")
+    no_receipts = create_notification(sample_template, status=NOTIFICATION_SENT, international=True, phone_prefix="249")
+
+    updated_ids = dao_update_notification_statuses_by_id(
+        "delivered",
+        [(notification.id, "mmg") for notification in (sending, no_sent_by, already_failed, no_receipts)]
+        + [(uuid.uuid4(), "mmg")],
+    )
+
+    assert set(updated_ids) == {sending.id, no_sent_by.id}
+    assert [
+        (notification.status, notification.sent_by)
+        for notification in (Notification.query.get(n.id) for n in (sending, no_sent_by, already_failed, no_receipts))
+    ] == [
+        ("delivered", "spryng"),
+        ("delivered", "mmg"),
+        ("permanent-failure", None),
+        (NOTIFICATION_SENT, None),
+    ]
+    assert Notification.query.get(sending.id).updated_at is not None
+
+
+def test_dao_update_notification_statuses_by_id_does_nothing_for_empty_list(notify_db_session):
+    assert dao_update_notification_statuses_by_id("delivered", []) == []
+
+
+def test_dao_update_notification_statuses_by_reference(sample_email_template):
+    sending = create_notification(sample_email_template, status="sending", reference="ref1")
+    pending = create_notification(sample_email_template, status="pending", reference="ref2")
+    delivered = create_notification(sample_email_template, status="delivered", reference="ref3")
+
+    updated = dao_update_notification_statuses_by_reference("permanent-failure", ["ref1", "ref2", "ref3", "ref4"])
+
+    assert sorted(updated, key=lambda row: row[1]) == [(sending.id, "ref1"), (pending.id, "ref2")]
+    assert Notification.query.get(sending.id).status == "permanent-failure"
+    assert Notification.query.get(pending.id).status == "permanent-failure"
+    assert Notification.query.get(delivered.id).status == "delivered"
+
+
+def test_dao_update_notification_statuses_by_id_records_job_status_changes(sample_job, mocker):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+    sending = create_notification(job=sample_job, status="sending")
+    pending = create_notification(job=sample_job, status="pending")
+
+    dao_update_notification_statuses_by_id("delivered", [(sending.id, "mmg"), (pending.id, "mmg")])
+
+    assert sorted(mock_record.call_args.args[0]) == sorted(
+        [(sample_job.id, "sending", "delivered"), (sample_job.id, "pending", "delivered")]
+    )
+
+
+def test_dao_update_notification_records_job_status_change(sample_job, mocker):
+    notification = create_notification(job=sample_job, status="created")
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+
+    notification.status = "sending"
+    dao_update_notification(notification)
+
+    mock_record.assert_called_once_with([(sample_job.id, "created", "sending")])
+
+
+def test_record_notification_status_changes_waits_for_the_transaction_to_commit(sample_job, mocker):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+    notification = create_notification(job=sample_job, status="created")
+
+    record_notification_status_changes([(notification, "created", "sending")])
+    assert mock_record.call_count == 0
+
+    db.session.commit()
+    mock_record.assert_called_once_with([(sample_job.id, "created", "sending")])
+
+
+def test_record_notification_status_changes_ignores_rolled_back_changes(sample_job, mocker):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+    notification = create_notification(job=sample_job, status="created")
+
+    record_notification_status_changes([(notification, "created", "sending")])
+    db.session.rollback()
+    db.session.commit()
+
+    assert mock_record.call_count == 0
+
+
 def test_save_notification_creates_sms(sample_template, sample_job):
     assert Notification.query.count() == 0
 
@@ -552,6 +683,15 @@ def test_should_delete_no_notifications_if_no_matching_ids(sample_template):
     assert Notification.query.count() == 1
 
 
+def test_dao_delete_notifications_by_id_records_status_change(sample_job, mocker):
+    notification = create_notification(job=sample_job, status="created")
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+
+    dao_delete_notifications_by_id(notification.id)
+
+    mock_record.assert_called_once_with([(sample_job.id, "created", None)])
+
+
 def _notification_json(sample_template, job_id=None, id=None, status=None):
     data = {
         "to": "+44709123456",
@@ -613,6 +753,31 @@ def test_dao_timeout_notifications_doesnt_affect_letters(sample_letter_template)
     assert Notification.query.get(pending.id).status == "pending"
 
 
+def test_dao_timeout_notifications_times_out_up_to_limit_and_returns_callback_columns(sample_template, mocker):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_notification_status_changes")
+    with freeze_time(datetime.utcnow() - timedelta(minutes=2)):
+        sending = create_notification(sample_template, status="sending", client_reference="ref", sent_by="mmg")
+        create_notification(sample_template, status="pending")
+
+    first_batch = dao_timeout_notifications(datetime.utcnow(), limit=1)
+    second_batch = dao_timeout_notifications(datetime.utcnow(), limit=1)
+
+    assert len(first_batch) == len(second_batch) == 1
+    assert dao_timeout_notifications(datetime.utcnow(), limit=1) == []
+    timed_out = next(row for row in first_batch + second_batch if row.id == sending.id)
+    assert timed_out.status == "temporary-failure"
+    assert timed_out.old_status == "sending"
+    assert timed_out.client_reference == "ref"
+    assert timed_out.sent_by == "mmg"
+    assert timed_out.template_version == sample_template.version
+    assert timed_out.updated_at is not None
+    assert {
+        (change.id, old_status, new_status)
+        for args, _ in mock_record.call_args_list
+        for change, old_status, new_status in args[0]
+    } == {(row.id, row.old_status, "temporary-failure") for row in first_batch + second_batch}
+
+
 def test_should_return_notifications_excluding_jobs_by_default(sample_template, sample_job, sample_api_key):
     create_notification(sample_template, job=sample_job)
     without_job = create_notification(sample_template, api_key=sample_api_key)
@@ -900,6 +1065,45 @@ def test_get_notifications_for_service_optional_loading(
     assert len(notify_db_session_log) == 0  # api_key always joinedload
 
 
+def test_get_notifications_for_service_for_csv_serializes_like_notifications(
+    sample_job, sample_api_key, sample_test_api_key
+):
+    create_notification(template=sample_job.template, job=sample_job, job_row_number=3, status="delivered")
+    create_notification(
+        template=sample_job.template,
+        api_key=sample_api_key,
+        key_type=sample_api_key.key_type,
+        client_reference="ref",
+        created_by_id=sample_job.created_by_id,
+    )
+    create_notification(template=sample_job.template, api_key=sample_test_api_key, key_type=KEY_TYPE_TEST)
+
+    rows = get_notifications_for_service_for_csv(sample_job.service_id, page_size=10)
+
+    notifications = get_notifications_for_service(
+        sample_job.service_id, count_pages=False, include_jobs=True, with_template=True
+    ).items
+    assert [Notification.serialize_row_for_csv(row) for row in rows] == [
+        notification.serialize_for_csv() for notification in notifications
+    ]
+
+
+def test_get_notifications_for_service_for_csv_pages_on_created_at_and_id(sample_template):
+    created_at = datetime.utcnow()
+    notifications = [create_notification(template=sample_template, created_at=created_at) for _ in range(3)]
+    newest = create_notification(template=sample_template, created_at=created_at + timedelta(seconds=1))
+    same_time_ids = sorted((notification.id for notification in notifications), reverse=True)
+
+    first_page = get_notifications_for_service_for_csv(sample_template.service_id, page_size=2)
+    second_page = get_notifications_for_service_for_csv(
+        sample_template.service_id, page_size=2, older_than=(first_page[-1].created_at, first_page[-1].id)
+    )
+    assert [row.id for row in first_page + second_page] == [newest.id, *same_time_ids]
+
+    assert get_notification_keyset_for_csv(sample_template.service_id, newest.id) == (newest.created_at, newest.id)
+    assert get_notification_keyset_for_csv(uuid.uuid4(), newest.id) is None
+
+
 def test_should_exclude_test_key_notifications_by_default(
     sample_job, sample_api_key, sample_team_api_key, sample_test_api_key
 ):
@@ -1082,6 +1286,44 @@ def test_dao_get_notifications_by_recipient_matches_partial_emails(sample_email_
     assert notification_2.id not in notification_ids
 
 
+@pytest.mark.parametrize(
+    "search_term, expected_recipients",
+    [
+        ("jack@gmail.com", ["jack@gmail.com"]),
+        ("Jack@Gmail.com", ["jack@gmail.com"]),
+        ("jack@gmail", ["jack@gmail.com", "hijack@gmail.com"]),
+    ],
+)
+def test_dao_get_notifications_by_recipient_matches_complete_email_addresses_exactly(
+    sample_email_template, search_term, expected_recipients
+):
+    for email_address in ("hijack@gmail.com", "jack@gmail.com"):
+        create_notification(template=sample_email_template, to_field=email_address, normalised_to=email_address)
+
+    results = dao_get_notifications_by_recipient_or_reference(
+        sample_email_template.service_id, search_term, notification_type="email"
+    )
+
+    assert [notification.normalised_to for notification in results.items] == expected_recipients
+
+
+def test_dao_get_notifications_by_recipient_matches_complete_reference_when_searching_for_email_address(
+    sample_email_template,
+):
+    notification = create_notification(
+        template=sample_email_template,
+        to_field="jack@gmail.com",
+        normalised_to="jack@gmail.com",
+        client_reference="jane@gmail.com",
+    )
+
+    results = dao_get_notifications_by_recipient_or_reference(
+        notification.service_id, "jane@gmail.com", notification_type="email"
+    )
+
+    assert [result.id for result in results.items] == [notification.id]
+
+
 @pytest.mark.parametrize(
     "search_term, expected_result_count",
     [
@@ -1477,6 +1719,37 @@ def test_dao_get_last_notification_added_for_job_id_no_job(fake_uuid):
     assert dao_get_last_notification_added_for_job_id(fake_uuid) is None
 
 
+@pytest.mark.parametrize("status", ["sending", "pending"])
+def test_dao_update_sending_notification_status_by_reference(sample_email_template, mocker, status):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_notification_status_changes")
+    notification = create_notification(sample_email_template, reference="ref1", status=status, sent_by="ses")
+    other = create_notification(sample_email_template, reference="ref2", status=status)
+
+    updated = dao_update_sending_notification_status_by_reference("ref1", "delivered")
+
+    assert updated.id == notification.id
+    assert updated.status == "delivered"
+    assert updated.old_status == status
+    assert updated.sent_by == "ses"
+    assert Notification.query.get(notification.id).status == "delivered"
+    assert Notification.query.get(other.id).status == status
+    mock_record.assert_called_once_with([(updated, status, "delivered")])
+
+
+@pytest.mark.parametrize("status", ["created", "delivered", "permanent-failure"])
+def test_dao_update_sending_notification_status_by_reference_ignores_notifications_not_sending(
+    sample_email_template, mocker, status
+):
+    mock_record = mocker.patch("app.dao.notifications_dao.record_notification_status_changes")
+    notification = create_notification(sample_email_template, reference="ref1", status=status)
+    create_notification_history(sample_email_template, reference="ref2", status="sending")
+
+    assert dao_update_sending_notification_status_by_reference("ref1", "temporary-failure") is None
+    assert dao_update_sending_notification_status_by_reference("ref2", "temporary-failure") is None
+    assert Notification.query.get(notification.id).status == status
+    assert mock_record.call_count == 0
+
+
 def test_dao_update_notifications_by_reference_updated_notifications(sample_template):
     notification_1 = create_notification(template=sample_template, reference="ref1")
     notification_2 = create_notification(template=sample_template, reference="ref2")
@@ -1517,6 +1790,18 @@ def test_dao_update_notifications_by_reference_updates_history_no_notifications_
     assert updated_history_count == 2
 
 
+def test_dao_update_notifications_by_reference_records_status_changes(sample_job, mocker):
+    create_notification(job=sample_job, reference="ref1", status="sending")
+    create_notification_history(job=sample_job, reference="ref2", status="created")
+    mock_record = mocker.patch("app.dao.notifications_dao.record_job_status_changes")
+
+    dao_update_notifications_by_reference(references=["ref1", "ref2"], update_dict={"status": "delivered"})
+
+    mock_record.assert_called_once_with(
+        [(sample_job.id, "sending", "delivered"), (sample_job.id, "created", "delivered")]
+    )
+
+
 def test_dao_update_notifications_by_reference_returns_zero_when_no_notifications_to_update(notify_db_session):
     updated_count, updated_history_count = dao_update_notifications_by_reference(
         references=["ref"], update_dict={"status": "delivered", "billable_units": 2}
@@ -13,6 +13,7 @@ from app.dao.fact_billing_dao import (
     fetch_billing_data_for_day,
     fetch_daily_sms_provider_volumes_for_platform,
     fetch_daily_volumes_for_platform,
+    fetch_service_ids_with_billing_changes_since,
     fetch_usage_for_all_services_letter,
     fetch_usage_for_all_services_letter_breakdown,
     fetch_usage_for_all_services_sms,
@@ -111,6 +112,23 @@ def test_fetch_billing_data_for_today_includes_data_with_the_right_key_type(noti
     assert results[0].notifications_sent == 2
 
 
+@freeze_time("2018-04-02 12:00:00")
+def test_fetch_service_ids_with_billing_changes_since(notify_db_session):
+    created_since = create_template(create_service(service_name="created since"))
+    updated_since = create_template(create_service(service_name="updated since"))
+    unchanged = create_template(create_service(service_name="unchanged"))
+    test_key_only = create_template(create_service(service_name="test key only"))
+    create_notification(created_since, created_at=datetime(2018, 4, 2, 11, 30))
+    create_notification(updated_since, created_at=datetime(2018, 4, 2, 9), updated_at=datetime(2018, 4, 2, 11, 30))
+    create_notification(unchanged, created_at=datetime(2018, 4, 2, 9), updated_at=datetime(2018, 4, 2, 10))
+    create_notification(test_key_only, created_at=datetime(2018, 4, 2, 11, 30), key_type="test")
+
+    assert fetch_service_ids_with_billing_changes_since(date(2018, 4, 2), datetime(2018, 4, 2, 11)) == {
+        created_since.service_id,
+        updated_since.service_id,
+    }
+
+
 @pytest.mark.parametrize("notification_type", ["email", "sms", "letter"])
 def test_fetch_billing_data_for_day_only_calls_query_for_permission_type(notify_db_session, notification_type):
     service = create_service(service_permissions=[notification_type])
@@ -7,6 +7,7 @@ from freezegun import freeze_time
 
 from app.constants import (
     EMAIL_TYPE,
+    KEY_TYPE_NORMAL,
     KEY_TYPE_TEAM,
     KEY_TYPE_TEST,
     LETTER_TYPE,
@@ -34,6 +35,7 @@ from app.dao.fact_notification_status_dao import (
     update_fact_notification_status,
 )
 from app.models import FactNotificationStatus
+from app.service.intraday_stats import IntradayStat
 from tests.app.db import (
     create_ft_notification_status,
     create_job,
@@ -219,6 +221,56 @@ def test_fetch_notification_status_by_template_for_service_for_today_and_7_previ
     ] == sorted(results, key=lambda x: (x.notification_type, x.status, x.template_name, x.count))
 
 
+@freeze_time("2018-10-31T18:00:00")
+@pytest.mark.parametrize("by_template", (False, True))
+def test_fetch_notification_status_for_service_for_today_and_7_previous_days_reads_intraday_stats(
+    notify_db_session, mocker, by_template
+):
+    service = create_service()
+    sms_template = create_template(template_name="sms Template 1", service=service, template_type=SMS_TYPE)
+    email_template = create_template(template_name="email Template 1", service=service, template_type=EMAIL_TYPE)
+    create_ft_notification_status(date(2018, 10, 29), "sms", service, template=sms_template, count=10)
+    # ignored, as today's stats come from redis
+    create_notification(sms_template, created_at=datetime(2018, 10, 31, 11, 0, 0), status="delivered")
+    mock_get_intraday_stats = mocker.patch(
+        "app.dao.fact_notification_status_dao.get_intraday_stats",
+        return_value={
+            str(service.id): [
+                IntradayStat(SMS_TYPE, KEY_TYPE_NORMAL, str(sms_template.id), "delivered", 9, 2),
+                IntradayStat(SMS_TYPE, KEY_TYPE_TEST, str(sms_template.id), "delivered", 9, 5),
+                IntradayStat(EMAIL_TYPE, KEY_TYPE_NORMAL, str(email_template.id), "created", 17, 1),
+            ]
+        },
+    )
+
+    results = fetch_notification_status_for_service_for_today_and_7_previous_days(service.id, by_template=by_template)
+
+    mock_get_intraday_stats.assert_called_once_with(date(2018, 10, 31), service_ids=[service.id])
+    if by_template:
+        assert sorted(results, key=lambda x: (x.notification_type, x.status)) == [
+            ("email Template 1", False, email_template.id, "email", "created", 1),
+            ("sms Template 1", False, sms_template.id, "sms", "delivered", 12),
+        ]
+    else:
+        assert sorted(results, key=lambda x: (x.notification_type, x.status)) == [
+            ("email", "created", 1),
+            ("sms", "delivered", 12),
+        ]
+
+
+@freeze_time("2018-10-31T18:00:00")
+def test_fetch_notification_status_for_service_for_today_and_7_previous_days_with_no_intraday_stats(
+    notify_db_session, mocker
+):
+    service = create_service()
+    create_ft_notification_status(date(2018, 10, 29), "sms", service, count=10)
+    mocker.patch("app.dao.fact_notification_status_dao.get_intraday_stats", return_value={str(service.id): []})
+
+    results = fetch_notification_status_for_service_for_today_and_7_previous_days(service.id)
+
+    assert results == [("sms", "delivered", 10)]
+
+
 @pytest.mark.parametrize(
     "start_date, end_date, expected_email, expected_letters, expected_sms, expected_created_sms",
     [
@@ -22,6 +22,7 @@ from app.dao.jobs_dao import (
     dao_update_job,
     find_jobs_with_missing_rows,
     find_missing_row_for_job,
+    get_live_notification_outcomes_for_job,
     get_possibly_cached_notification_outcomes_for_job,
 )
 from app.models import Job
@@ -362,6 +363,19 @@ def test_dao_cancel_letter_job_cancels_job_and_returns_number_of_cancelled_notif
     assert job.job_status == "cancelled"
 
 
+def test_dao_cancel_letter_job_records_status_changes(sample_letter_template, mocker):
+    mock_record = mocker.patch("app.dao.jobs_dao.record_notification_status_changes")
+    job = create_job(template=sample_letter_template, notification_count=1, job_status="finished")
+    notification = create_notification(template=job.template, job=job, status="created")
+
+    dao_cancel_letter_job(job)
+
+    assert [
+        (row.job_id, row.service_id, row.template_id, old_status, new_status)
+        for row, old_status, new_status in mock_record.call_args.args[0]
+    ] == [(job.id, job.service_id, notification.template_id, "created", "cancelled")]
+
+
 @freeze_time("2019-06-13 13:00")
 def test_can_letter_job_be_cancelled_returns_true_if_job_can_be_cancelled(sample_letter_template):
     job = create_job(
@@ -777,3 +791,41 @@ def test_get_possibly_cached_notification_outcomes_for_job_present_cache(
     assert mock_redis_get.mock_calls == [
         mocker.call(f"job-{fake_uuid}-notification-outcomes"),
     ]
+
+
+@freeze_time("2020-02-10T10:00:00")
+def test_get_possibly_cached_notification_outcomes_for_job_uses_live_counts_while_job_in_flight(fake_uuid, mocker):
+    mocker.patch(
+        "app.dao.jobs_dao.dao_get_notification_outcomes_for_job",
+        side_effect=AssertionError("dao_get_notification_outcomes_for_job call not expected"),
+    )
+    mocker.patch(
+        "app.dao.jobs_dao.get_job_status_counts",
+        return_value=[{"status": "delivered", "count": 12}, {"status": "sending", "count": 34}],
+    )
+    mocker.patch("app.redis_store.get", return_value=None)
+    mock_redis_set = mocker.patch("app.redis_store.set")
+
+    retval = get_possibly_cached_notification_outcomes_for_job(fake_uuid, 100, datetime(2020, 2, 10, 9))
+
+    assert retval == [{"status": "delivered", "count": 12}, {"status": "sending", "count": 34}]
+    assert not mock_redis_set.mock_calls
+
+
+@freeze_time("2020-02-10T10:00:00")
+@pytest.mark.parametrize(
+    "job_status_counts, processing_started",
+    (
+        # every notification is in a final state, so count them to check and cache the result
+        ([{"status": "delivered", "count": 3}], datetime(2020, 2, 10, 9)),
+        # too long ago to rely on the counts
+        ([{"status": "sending", "count": 3}], datetime(2020, 2, 9, 9)),
+        (None, datetime(2020, 2, 10, 9)),
+    ),
+)
+def test_get_live_notification_outcomes_for_job_returns_none_if_counts_cannot_be_used(
+    fake_uuid, mocker, job_status_counts, processing_started
+):
+    mocker.patch("app.dao.jobs_dao.get_job_status_counts", return_value=job_status_counts)
+
+    assert get_live_notification_outcomes_for_job(fake_uuid, 3, processing_started) is None
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from unittest import mock
 
 import pytest
@@ -70,6 +70,7 @@ from app.models import (
     VerifyCode,
     user_folder_permissions,
 )
+from app.service.intraday_stats import IntradayStat
 from tests.app.db import (
     create_annual_billing,
     create_api_key,
@@ -1099,6 +1100,72 @@ def test_dao_fetch_todays_stats_for_all_services_can_exclude_from_test_key(notif
     assert stats[0].count == 2
 
 
+def test_dao_fetch_todays_stats_for_service_reads_intraday_stats(notify_db_session, mocker):
+    service = create_service()
+    create_notification(template=create_template(service=service), status="created")
+    template_id = str(uuid.uuid4())
+    mock_get_intraday_stats = mocker.patch(
+        "app.dao.services_dao.get_intraday_stats",
+        return_value={
+            str(service.id): [
+                IntradayStat("email", KEY_TYPE_NORMAL, template_id, "delivered", 9, 2),
+                IntradayStat("email", KEY_TYPE_TEAM, template_id, "delivered", 10, 1),
+                IntradayStat("email", KEY_TYPE_TEST, template_id, "delivered", 10, 5),
+                IntradayStat("sms", KEY_TYPE_NORMAL, template_id, "sending", 10, 4),
+            ]
+        },
+    )
+
+    stats = dao_fetch_todays_stats_for_service(service.id)
+
+    mock_get_intraday_stats.assert_called_once_with(date.today(), service_ids=[service.id])
+    assert stats == [("email", "delivered", 3), ("sms", "sending", 4)]
+
+
+@pytest.mark.parametrize("include_from_test_key, expected_count", ((True, 6), (False, 2)))
+def test_dao_fetch_todays_stats_for_all_services_reads_intraday_stats(
+    notify_db_session, mocker, include_from_test_key, expected_count
+):
+    service_1 = create_service(service_name="service 1")
+    service_2 = create_service(service_name="service 2")
+    create_service(service_name="inactive", active=False)
+    mocker.patch(
+        "app.dao.services_dao.get_intraday_stats",
+        return_value={
+            str(service_1.id): [
+                IntradayStat("sms", KEY_TYPE_NORMAL, str(uuid.uuid4()), "delivered", 9, 2),
+                IntradayStat("sms", KEY_TYPE_TEST, str(uuid.uuid4()), "delivered", 9, 4),
+            ]
+        },
+    )
+
+    stats = dao_fetch_todays_stats_for_all_services(include_from_test_key=include_from_test_key)
+
+    assert sorted(stats, key=lambda row: row.name) == [
+        (
+            service_1.id,
+            service_1.name,
+            service_1.restricted,
+            service_1.active,
+            service_1.created_at,
+            "sms",
+            "delivered",
+            expected_count,
+        ),
+        (
+            service_2.id,
+            service_2.name,
+            service_2.restricted,
+            service_2.active,
+            service_2.created_at,
+            None,
+            None,
+            None,
+        ),
+    ]
+    assert stats == sorted(stats, key=lambda row: row.service_id)
+
+
 def test_dao_fetch_active_users_for_service_returns_active_only(notify_db_session):
     active_user = create_user(email="active@foo.com", state="active")
     pending_user = create_user(email="pending@foo.com", state="pending")
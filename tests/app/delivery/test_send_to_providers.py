@@ -8,6 +8,7 @@ import pytest
 from flask import current_app
 from freezegun import freeze_time
 from requests import HTTPError
+from sqlalchemy.exc import SQLAlchemyError
 
 import app
 from app import firetext_client, mmg_client, notification_provider_clients
@@ -38,12 +39,15 @@ from tests.app.db import (
     create_service_with_defined_sms_sender,
     create_template,
 )
+from tests.conftest import set_config
 
 
 def setup_function(_function):
     # pytest will run this function before each test. It makes sure the
     # state of the cache is not shared between tests.
     send_to_providers.provider_cache.clear()
+    send_to_providers.email_branding_options_cache.clear()
+    send_to_providers.rendered_email_cache.clear()
 
 
 def test_provider_to_use_should_return_random_provider(mocker, notify_db_session):
@@ -397,6 +401,48 @@ def test_send_email_should_use_service_reply_to_email(sample_service, sample_ema
     )
 
 
+def test_send_email_to_provider_closes_db_session_before_calling_provider(sample_email_template, mocker):
+    db_notification = create_notification(template=sample_email_template)
+    manager = mocker.Mock()
+    manager.attach_mock(mocker.patch("app.delivery.send_to_providers.db.session.close"), "close")
+    manager.attach_mock(mocker.patch("app.aws_ses_client.send_email", return_value="reference"), "send_email")
+
+    send_to_providers.send_email_to_provider(db_notification)
+
+    assert [mock_call[0] for mock_call in manager.mock_calls] == ["close", "send_email"]
+    notification = Notification.query.filter_by(id=db_notification.id).one()
+    assert notification.status == "sending"
+    assert notification.reference == "reference"
+
+
+def test_send_email_to_provider_renders_template_without_placeholders_once(sample_email_template, mocker):
+    mock_send_email = mocker.patch("app.aws_ses_client.send_email", return_value="reference")
+    mock_html_email = mocker.patch(
+        "app.delivery.send_to_providers.HTMLEmailTemplate", wraps=send_to_providers.HTMLEmailTemplate
+    )
+
+    for _ in range(2):
+        send_to_providers.send_email_to_provider(create_notification(template=sample_email_template))
+
+    assert mock_html_email.call_count == 1
+    first_call, second_call = mock_send_email.call_args_list
+    assert first_call.kwargs["html_body"] == second_call.kwargs["html_body"]
+    assert first_call.kwargs["body"] == second_call.kwargs["body"] == "This is a template"
+
+
+def test_send_email_to_provider_renders_personalised_template_for_each_email(
+    sample_email_template_with_placeholders, mocker
+):
+    mock_send_email = mocker.patch("app.aws_ses_client.send_email", return_value="reference")
+
+    for name in ("Jo", "Sam"):
+        send_to_providers.send_email_to_provider(
+            create_notification(template=sample_email_template_with_placeholders, personalisation={"name": name})
+        )
+
+    assert [mock_call.kwargs["subject"] for mock_call in mock_send_email.call_args_list] == ["Jo", "Sam"]
+
+
 @pytest.mark.parametrize("service_fixture", ["sample_service", "sample_service_with_email_branding"])
 def test_send_email_works_with_and_without_email_branding(request, service_fixture, sample_email_template, mocker):
     request.getfixturevalue(service_fixture)  # Creates and loads the relevant service fixture into the DB
@@ -868,6 +914,18 @@ def test_get_html_email_options_return_email_branding_from_serialised_service(sa
     }
 
 
+def test_get_html_email_options_caches_email_branding_for_serialised_service(sample_service, mocker):
+    sample_service.email_branding = create_email_branding()
+    service = SerialisedService.from_id(sample_service.id)
+    mock_get_branding = mocker.patch(
+        "app.delivery.send_to_providers.dao_get_email_branding_by_id",
+        wraps=send_to_providers.dao_get_email_branding_by_id,
+    )
+
+    assert get_html_email_options(service) == get_html_email_options(service)
+    mock_get_branding.assert_called_once_with(service.email_branding)
+
+
 def test_get_html_email_options_add_email_branding_from_service(sample_service):
     branding = create_email_branding()
     sample_service.email_branding = branding
@@ -963,3 +1021,131 @@ def test_send_email_to_provider_sends_unsubscribe_link_if_template_is_unsubscrib
 
     assert mock_html_email.call_args[1]["unsubscribe_link"] == "https://www.notify.example.com"
     assert mock_plain_text_email.call_args[1]["unsubscribe_link"] == "https://www.notify.example.com"
+
+
+@pytest.fixture
+def mock_batch_sms_provider(notify_api, mocker, mock_spryng_client):
+    mocker.patch("app.delivery.send_to_providers.provider_to_use", return_value=mock_spryng_client)
+    mocker.patch.object(mock_spryng_client, "send_sms_batch")
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        yield mock_spryng_client
+
+
+def test_send_sms_batch_to_provider_sends_one_request_for_all_recipients(
+    sample_sms_template_with_html, mock_batch_sms_provider, mocker
+):
+    mock_redis_set = mocker.patch("app.delivery.send_to_providers.redis_store.set")
+    notifications = [
+        create_notification(
+            template=sample_sms_template_with_html,
+            personalisation={"name": "Jo"},
+            reply_to_text="testing",
+            normalised_to=to,
+        )
+        for to in ("+31612345678", "+31612345679")
+    ]
+
+    sent = send_to_providers.send_sms_batch_to_provider(notifications)
+
+    assert sent == notifications
+    mock_batch_sms_provider.send_sms_batch.assert_called_once_with(
+        recipients=["+31612345678", "+31612345679"],
+        content="Hello Jo\nHere is <em>some HTML</em> & entities",
+        reference=ANY,
+        sender="testing",
+    )
+    reference = mock_batch_sms_provider.send_sms_batch.call_args.kwargs["reference"]
+    mock_redis_set.assert_called_once_with(
+        f"sms-batch-{reference}",
+        json.dumps({"31612345678": str(notifications[0].id), "31612345679": str(notifications[1].id)}),
+        ex=send_to_providers.SMS_BATCH_REFERENCE_TTL_SECONDS,
+    )
+    for notification in notifications:
+        persisted = Notification.query.filter_by(id=notification.id).one()
+        assert persisted.status == "sending"
+        assert persisted.sent_by == "spryng"
+        assert persisted.billable_units == 1
+
+
+def test_send_sms_batch_to_provider_leaves_out_notifications_that_cannot_be_batched(
+    sample_sms_template_with_html, mock_batch_sms_provider, mocker
+):
+    mocker.patch("app.delivery.send_to_providers.redis_store.set")
+    batched = [
+        create_notification(template=sample_sms_template_with_html, personalisation={"name": "Jo"}, normalised_to=to)
+        for to in ("+31612345678", "+31612345679")
+    ]
+    not_batched = [
+        create_notification(
+            template=sample_sms_template_with_html, personalisation={"name": "Al"}, normalised_to="+31612345670"
+        ),
+        create_notification(
+            template=sample_sms_template_with_html, personalisation={"name": "Jo"}, normalised_to="+31612345678"
+        ),
+        create_notification(
+            template=sample_sms_template_with_html,
+            personalisation={"name": "Jo"},
+            normalised_to="+31612345671",
+            key_type=KEY_TYPE_TEST,
+        ),
+        create_notification(
+            template=sample_sms_template_with_html,
+            personalisation={"name": "Jo"},
+            normalised_to="+31612345672",
+            status="sending",
+        ),
+    ]
+
+    sent = send_to_providers.send_sms_batch_to_provider(batched + not_batched)
+
+    assert sent == batched
+    assert mock_batch_sms_provider.send_sms_batch.call_args.kwargs["recipients"] == ["+31612345678", "+31612345679"]
+    for notification in not_batched[:3]:
+        assert Notification.query.filter_by(id=notification.id).one().status == "created"
+
+
+def test_send_sms_batch_to_provider_does_nothing_if_provider_cannot_send_batches(sample_template, mocker):
+    mocker.patch("app.delivery.send_to_providers.provider_to_use", return_value=mmg_client)
+    notifications = [create_notification(template=sample_template, normalised_to=f"+3161234567{i}") for i in range(2)]
+
+    assert send_to_providers.send_sms_batch_to_provider(notifications) == []
+
+
+def test_send_sms_batch_to_provider_records_provider_error(sample_template, mock_batch_sms_provider, mocker):
+    mocker.patch("app.delivery.send_to_providers.redis_store.set")
+    mock_batch_sms_provider.send_sms_batch.side_effect = Exception()
+    mock_redis = mocker.patch("app.delivery.send_to_providers.redis_store.exceeded_rate_limit", return_value=False)
+    notifications = [create_notification(template=sample_template, normalised_to=f"+3161234567{i}") for i in range(2)]
+
+    with pytest.raises(Exception):  # noqa
+        send_to_providers.send_sms_batch_to_provider(notifications)
+
+    mock_redis.assert_called_once_with("spryng-error-rate", SMS_PROVIDER_ERROR_THRESHOLD, SMS_PROVIDER_ERROR_INTERVAL)
+    for notification in notifications:
+        assert Notification.query.filter_by(id=notification.id).one().status == "created"
+
+
+def test_send_sms_batch_to_provider_returns_the_batch_if_updating_it_to_sending_fails(
+    sample_template, mock_batch_sms_provider, mocker
+):
+    mocker.patch("app.delivery.send_to_providers.redis_store.set")
+    mocker.patch("app.delivery.send_to_providers.dao_update_notification_statuses_by_id", side_effect=SQLAlchemyError())
+    notifications = [create_notification(template=sample_template, normalised_to=f"+3161234567{i}") for i in range(2)]
+
+    # the provider has the messages, so the batch mustn't be sent again
+    assert send_to_providers.send_sms_batch_to_provider(notifications) == notifications
+    mock_batch_sms_provider.send_sms_batch.assert_called_once()
+
+
+def test_get_notification_id_for_sms_batch_recipient(mocker):
+    mock_redis_get = mocker.patch(
+        "app.delivery.send_to_providers.redis_store.get",
+        return_value=json.dumps({"31612345678": "notification-id"}).encode(),
+    )
+
+    assert (
+        send_to_providers.get_notification_id_for_sms_batch_recipient("batch-reference", "31612345678")
+        == "notification-id"
+    )
+    assert send_to_providers.get_notification_id_for_sms_batch_recipient("batch-reference", "31600000000") is None
+    mock_redis_get.assert_called_with("sms-batch-batch-reference")
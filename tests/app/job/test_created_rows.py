@@ -0,0 +1,76 @@
+import uuid
+from unittest.mock import call
+
+import pytest
+
+from app.job.created_rows import get_job_rows_not_created, record_job_rows_created
+from tests.conftest import set_config_values
+
+
+@pytest.fixture
+def job_created_rows_enabled(notify_api):
+    with set_config_values(notify_api, {"JOB_CREATED_ROWS_BITMAP_ENABLED": True, "REDIS_ENABLED": True}):
+        yield
+
+
+def test_record_job_rows_created_sets_bits_in_one_pipeline(job_created_rows_enabled, mocker):
+    mock_pipeline = mocker.patch("app.job.created_rows.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    job_id = uuid.uuid4()
+
+    record_job_rows_created(job_id, [0, 3])
+
+    assert pipe.setbit.call_args_list == [
+        call(f"job-{job_id}-created-rows", 0, 1),
+        call(f"job-{job_id}-created-rows", 3, 1),
+    ]
+    pipe.expire.assert_called_once_with(f"job-{job_id}-created-rows", 172800)
+    pipe.execute.assert_called_once_with()
+
+
+@pytest.mark.parametrize("job_id, row_numbers", ((None, [0]), (uuid.uuid4(), [])))
+def test_record_job_rows_created_ignores_notifications_without_rows(
+    job_created_rows_enabled, mocker, job_id, row_numbers
+):
+    mock_pipeline = mocker.patch("app.job.created_rows.redis_store.redis_store.pipeline")
+
+    record_job_rows_created(job_id, row_numbers)
+
+    assert mock_pipeline.called is False
+
+
+def test_record_job_rows_created_does_nothing_if_not_enabled(notify_api, mocker):
+    mock_pipeline = mocker.patch("app.job.created_rows.redis_store.redis_store.pipeline")
+
+    record_job_rows_created(uuid.uuid4(), [0])
+
+    assert mock_pipeline.called is False
+
+
+@pytest.mark.parametrize(
+    "bitmap, job_size, expected_rows",
+    (
+        (b"\xf8", 5, set()),
+        (b"\xf0", 5, {4}),
+        (b"\xb0", 4, {1}),
+        (b"\xf0", 10, {4, 5, 6, 7, 8, 9}),
+        (b"\xff\x80", 9, set()),
+    ),
+)
+def test_get_job_rows_not_created(job_created_rows_enabled, mocker, bitmap, job_size, expected_rows):
+    mocker.patch("app.job.created_rows.redis_store.redis_store.get", return_value=bitmap)
+
+    assert get_job_rows_not_created(uuid.uuid4(), job_size) == expected_rows
+
+
+def test_get_job_rows_not_created_returns_none_if_no_bitmap(job_created_rows_enabled, mocker):
+    mocker.patch("app.job.created_rows.redis_store.redis_store.get", return_value=None)
+
+    assert get_job_rows_not_created(uuid.uuid4(), 5) is None
+
+
+def test_get_job_rows_not_created_returns_none_if_not_enabled(notify_api, mocker):
+    mock_get = mocker.patch("app.job.created_rows.redis_store.redis_store.get")
+
+    assert get_job_rows_not_created(uuid.uuid4(), 5) is None
+    assert mock_get.called is False
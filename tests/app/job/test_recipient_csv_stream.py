@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from notifications_utils.recipients import RecipientCSV
+from notifications_utils.template import SMSMessageTemplate
+
+from app.job.recipient_csv_stream import StreamingRecipientCSV, UnstreamableJobFile
+from tests.app import load_example_csv
+
+TEMPLATE = SMSMessageTemplate({"content": "Hello ((name))", "template_type": "sms"})
+
+
+@pytest.fixture
+def mock_job_file(mocker):
+    def _mock_job_file(contents, metadata=None):
+        data = contents.encode("utf-8")
+        mocker.patch(
+            "app.job.recipient_csv_stream.s3.get_job_size_and_metadata_from_s3",
+            return_value=(len(data), metadata or {}),
+        )
+        return mocker.patch(
+            "app.job.recipient_csv_stream.s3.get_job_byte_range_from_s3",
+            side_effect=lambda service_id, job_id, first_byte, last_byte: data[first_byte : last_byte + 1],
+        )
+
+    return _mock_job_file
+
+
+def _summarise(rows):
+    return [(row.index, row.recipient, dict(row.personalisation)) for row in rows]
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        load_example_csv("multiple_sms"),
+        "phone number,name\r\n07700900001,Ada\r\n07700900002,Grace\r\n07700900003,Mary\r\n",
+        'phone number,name\n07700900001,"Ada\nLovelace"\n\n07700900002,Grace\n07700900003,Mary\n\n\n',
+        "\n\nphone number,name\n07700900001,Zoë\n07700900002,Ñoño",
+    ],
+)
+@pytest.mark.parametrize("range_size, rows_per_chunk", [(7, 1), (16, 2), (1024, 1000)])
+def test_get_rows_matches_reading_whole_file(notify_api, mock_job_file, contents, range_size, rows_per_chunk):
+    mock_job_file(contents)
+
+    streamed = StreamingRecipientCSV(
+        "service-id", "job-id", TEMPLATE, range_size=range_size, rows_per_chunk=rows_per_chunk
+    ).get_rows()
+
+    assert _summarise(streamed) == _summarise(RecipientCSV(contents, template=TEMPLATE).get_rows())
+
+
+def test_get_rows_from_start_row(notify_api, mock_job_file):
+    mock_job_file(load_example_csv("multiple_sms"))
+
+    rows = list(StreamingRecipientCSV("service-id", "job-id", TEMPLATE, rows_per_chunk=3).get_rows(start_row=7))
+
+    assert [row.index for row in rows] == [7, 8, 9]
+    assert rows[0].recipient == "+441234123128"
+
+
+def test_metadata_is_read_without_downloading_the_whole_file(notify_api, mock_job_file):
+    mock_get_range = mock_job_file(load_example_csv("multiple_sms"), metadata={"sender_id": "1234"})
+
+    recipient_csv = StreamingRecipientCSV("service-id", "job-id", TEMPLATE, range_size=32)
+
+    assert recipient_csv.metadata == {"sender_id": "1234"}
+    assert recipient_csv.header == ["PhoneNumber", "Name"]
+    assert mock_get_range.call_count == 1
+
+
+def test_get_rows_saves_chunk_offsets_after_reading_whole_file(notify_api, mock_job_file, mocker):
+    contents = "phone number,name\n07700900001,Ada\n07700900002,Grace\n07700900003,Mary\n07700900004,Joan\n"
+    mock_job_file(contents)
+    mock_redis_set = mocker.patch("app.job.recipient_csv_stream.redis_store.set")
+
+    list(StreamingRecipientCSV("service-id", "job-id", TEMPLATE, rows_per_chunk=2).get_rows())
+
+    offset_of_row_2 = contents.index("07700900003")
+    offset_of_row_4 = len(contents)
+    mock_redis_set.assert_called_once_with(
+        "job-job-id-row-byte-offsets",
+        json.dumps({2: offset_of_row_2, 4: offset_of_row_4}),
+        ex=3 * 24 * 60 * 60,
+    )
+
+
+def test_get_rows_starts_downloading_from_nearest_cached_offset(notify_api, mock_job_file, mocker):
+    contents = "phone number,name\n07700900001,Ada\n07700900002,Grace\n07700900003,Mary\n07700900004,Joan\n"
+    mock_get_range = mock_job_file(contents)
+    offset_of_row_2 = contents.index("07700900003")
+    mocker.patch(
+        "app.job.recipient_csv_stream.redis_store.get",
+        return_value=json.dumps({"2": offset_of_row_2, "4": len(contents)}).encode(),
+    )
+    mock_redis_set = mocker.patch("app.job.recipient_csv_stream.redis_store.set")
+
+    recipient_csv = StreamingRecipientCSV("service-id", "job-id", TEMPLATE, rows_per_chunk=2)
+    mock_get_range.reset_mock()
+
+    rows = list(recipient_csv.get_rows(start_row=3))
+
+    assert _summarise(rows) == [(3, "07700900004", {"name": "Joan"})]
+    assert mock_get_range.call_args_list[0].args[2] == offset_of_row_2
+    assert mock_redis_set.called is False
+
+
+def test_get_rows_for_empty_file(notify_api, mock_job_file):
+    mock_job_file("")
+
+    assert list(StreamingRecipientCSV("service-id", "job-id", TEMPLATE).get_rows()) == []
+
+
+def test_raises_unstreamable_job_file_for_carriage_return_line_endings(notify_api, mock_job_file):
+    mock_job_file("phone number,name\r07700900001,Ada\r07700900002,Grace\r")
+
+    with pytest.raises(UnstreamableJobFile):
+        StreamingRecipientCSV("service-id", "job-id", TEMPLATE)
@@ -0,0 +1,73 @@
+import uuid
+from unittest.mock import call
+
+import pytest
+
+from app.job.status_counts import get_job_status_counts, record_job_status_changes
+from tests.conftest import set_config_values
+
+
+@pytest.fixture
+def job_status_counts_enabled(notify_api):
+    with set_config_values(notify_api, {"JOB_STATUS_COUNTS_ENABLED": True, "REDIS_ENABLED": True}):
+        yield
+
+
+def test_record_job_status_changes_updates_counts_in_one_pipeline(job_status_counts_enabled, mocker):
+    mock_pipeline = mocker.patch("app.job.status_counts.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    job_id = uuid.uuid4()
+
+    record_job_status_changes(
+        [
+            (job_id, None, "created"),
+            (job_id, None, "created"),
+            (job_id, "created", "sending"),
+            (job_id, "sending", "sending"),
+            (None, None, "created"),
+        ]
+    )
+
+    assert pipe.hincrby.call_args_list == [
+        call(f"job-{job_id}-status-counts", "created", 1),
+        call(f"job-{job_id}-status-counts", "sending", 1),
+    ]
+    pipe.expire.assert_called_once_with(f"job-{job_id}-status-counts", 259200)
+    pipe.execute.assert_called_once_with()
+
+
+def test_record_job_status_changes_takes_deleted_notifications_off_their_status(job_status_counts_enabled, mocker):
+    mock_pipeline = mocker.patch("app.job.status_counts.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    job_id = uuid.uuid4()
+
+    record_job_status_changes([(job_id, "created", None)])
+
+    pipe.hincrby.assert_called_once_with(f"job-{job_id}-status-counts", "created", -1)
+
+
+def test_record_job_status_changes_does_nothing_if_not_enabled(notify_api, mocker):
+    mock_pipeline = mocker.patch("app.job.status_counts.redis_store.redis_store.pipeline")
+
+    with set_config_values(notify_api, {"JOB_STATUS_COUNTS_ENABLED": False, "REDIS_ENABLED": True}):
+        record_job_status_changes([(uuid.uuid4(), None, "created")])
+
+    assert mock_pipeline.call_count == 0
+
+
+def test_get_job_status_counts_leaves_out_statuses_with_nothing_in(job_status_counts_enabled, mocker):
+    mocker.patch(
+        "app.job.status_counts.redis_store.redis_store.hgetall",
+        return_value={b"sending": b"3", b"created": b"0", b"delivered": b"2"},
+    )
+
+    assert get_job_status_counts(uuid.uuid4()) == [
+        {"status": "delivered", "count": 2},
+        {"status": "sending", "count": 3},
+    ]
+
+
+def test_get_job_status_counts_returns_none_if_nothing_recorded(job_status_counts_enabled, mocker):
+    mocker.patch("app.job.status_counts.redis_store.redis_store.hgetall", return_value={})
+
+    assert get_job_status_counts(uuid.uuid4()) is None
@@ -49,6 +49,21 @@ def test_create_letter_attachment_creates_a_db_entry_and_adds_attachment_id_to_t
     assert str(template.letter_attachment_id) == data["upload_id"]
 
 
+def test_create_letter_attachment_invalidates_cached_template(admin_request, sample_letter_template, mocker):
+    mock_invalidate = mocker.patch("app.letter_attachment.rest.invalidate_serialised_models")
+    data = {
+        "upload_id": str(uuid.uuid4()),
+        "created_by_id": str(sample_letter_template.created_by_id),
+        "original_filename": "securely_attached.pdf",
+        "page_count": 2,
+        "template_id": str(sample_letter_template.id),
+    }
+
+    admin_request.post("letter_attachment.create_letter_attachment", _data=data, _expected_status=201)
+
+    mock_invalidate.assert_called_once_with(sample_letter_template.service_id, sample_letter_template.id)
+
+
 def test_create_letter_attachment_creates_new_version_of_template_history(admin_request, sample_letter_template):
     assert sample_letter_template.version == 1
 
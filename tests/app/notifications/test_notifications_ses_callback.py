@@ -1,18 +1,24 @@
+from unittest.mock import ANY, call
+
 import pytest
 from flask import json
 from sqlalchemy.exc import SQLAlchemyError
 
+import app
 from app.celery.service_callback_tasks import send_delivery_status_to_service
 from app.dao.notifications_dao import get_notification_by_id
 from app.models import Complaint
 from app.notifications.notifications_ses_callback import (
     check_and_queue_callback_task,
+    check_and_queue_callback_tasks,
     handle_complaint,
 )
 from tests.app.db import (
     create_notification,
     create_notification_history,
+    create_service,
     create_service_callback_api,
+    create_template,
     ses_complaint_callback,
     ses_complaint_callback_malformed_message_id,
     ses_complaint_callback_with_missing_complaint_type,
@@ -91,7 +97,7 @@ def test_check_and_queue_callback_task(mocker, mock_celery_task, sample_notifica
     assert mock_create_args[1].id == callback_api.id
 
     mock_send.assert_called_once_with(
-        [str(sample_notification.id), mock_create.return_value], queue="service-callbacks"
+        [str(sample_notification.id), mock_create.return_value], queue="service-callbacks", producer=None
     )
 
 
@@ -100,3 +106,30 @@ def test_check_and_queue_callback_task_no_callback_api(mock_celery_task, sample_
 
     check_and_queue_callback_task(sample_notification)
     mock_send.assert_not_called()
+
+
+def test_check_and_queue_callback_tasks_looks_up_each_services_callback_api_once(
+    mocker, mock_celery_task, sample_template
+):
+    mock_send = mock_celery_task(send_delivery_status_to_service)
+    mock_producer = mocker.patch.object(app.notify_celery, "producer_or_acquire")
+    callback_api = create_service_callback_api(callback_type="delivery_status", service=sample_template.service)
+    other_service = create_service(service_name="no callback api")
+    notifications = [
+        create_notification(template=sample_template),
+        create_notification(template=create_template(service=other_service)),
+        create_notification(template=sample_template),
+    ]
+    mock_get_callback_api = mocker.patch(
+        "app.notifications.notifications_ses_callback.get_delivery_status_callback_api_for_service",
+        side_effect=lambda service_id: callback_api if service_id == sample_template.service_id else None,
+    )
+
+    check_and_queue_callback_tasks(notifications)
+
+    assert mock_get_callback_api.call_count == 2
+    producer = mock_producer.return_value.__enter__.return_value
+    assert mock_send.call_args_list == [
+        call([str(notifications[0].id), ANY], queue="service-callbacks", producer=producer),
+        call([str(notifications[2].id), ANY], queue="service-callbacks", producer=producer),
+    ]
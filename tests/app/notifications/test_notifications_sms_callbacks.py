@@ -2,6 +2,7 @@ from flask import json
 
 from app.celery.process_sms_client_response_tasks import process_sms_client_response
 from app.notifications.notifications_sms_callback import validate_callback_data
+from tests.conftest import set_config
 
 
 def firetext_post(client, data):
@@ -141,6 +142,71 @@ def test_mmg_callback_should_return_200_and_call_task_with_valid_data(client, mo
     )
 
 
+def test_spryng_callback_should_return_200_and_call_task_with_valid_data(client, mock_celery_task):
+    mock_celery = mock_celery_task(process_sms_client_response)
+
+    response = client.get(path="/notifications/sms/spryng?STATUS=10&REASONCODE=0&REFERENCE=notification_id")
+
+    assert response.status_code == 200
+    mock_celery.assert_called_once_with(["10", "notification_id", "Spryng", "0"], queue="sms-callbacks")
+
+
+def test_spryng_callback_for_batch_looks_up_notification_id_for_recipient(client, mocker, mock_celery_task):
+    mock_celery = mock_celery_task(process_sms_client_response)
+    mocker.patch(
+        "app.delivery.send_to_providers.redis_store.get",
+        return_value=json.dumps({"31612345678": "notification_id"}).encode(),
+    )
+
+    response = client.get(
+        path="/notifications/sms/spryng?STATUS=10&REASONCODE=0&REFERENCE=batch_reference&RECIPIENT=31612345678"
+    )
+
+    assert response.status_code == 200
+    mock_celery.assert_called_once_with(["10", "notification_id", "Spryng", "0"], queue="sms-callbacks")
+
+
+def test_spryng_callback_buffers_receipt_if_enabled(notify_api, client, mocker, mock_celery_task):
+    mock_celery = mock_celery_task(process_sms_client_response)
+    mock_buffer = mocker.patch("app.notifications.notifications_sms_callback.buffer_delivery_receipts")
+
+    with (
+        set_config(notify_api, "BUFFER_DELIVERY_RECEIPTS_ENABLED", True),
+        set_config(notify_api, "REDIS_ENABLED", True),
+    ):
+        response = client.get(path="/notifications/sms/spryng?STATUS=10&REASONCODE=0&REFERENCE=notification_id")
+
+    assert response.status_code == 200
+    mock_buffer.assert_called_once_with(
+        [
+            {
+                "notification_type": "sms",
+                "status": "10",
+                "reference": "notification_id",
+                "client_name": "Spryng",
+                "detailed_status_code": "0",
+            }
+        ]
+    )
+    assert mock_celery.call_count == 0
+
+
+def test_firetext_callback_is_not_buffered(notify_api, client, mocker, mock_celery_task):
+    mock_celery = mock_celery_task(process_sms_client_response)
+    mock_buffer = mocker.patch("app.notifications.notifications_sms_callback.buffer_delivery_receipts")
+    data = "mobile=441234123123&status=0&time=2016-03-10 14:17:00&reference=notification_id"
+
+    with (
+        set_config(notify_api, "BUFFER_DELIVERY_RECEIPTS_ENABLED", True),
+        set_config(notify_api, "REDIS_ENABLED", True),
+    ):
+        response = firetext_post(client, data)
+
+    assert response.status_code == 200
+    mock_celery.assert_called_once_with(["0", "notification_id", "Firetext", None], queue="sms-callbacks")
+    assert mock_buffer.call_count == 0
+
+
 def test_validate_callback_data_returns_none_when_valid():
     form = {"status": "good", "reference": "send-sms-code"}
     fields = ["status", "reference"]
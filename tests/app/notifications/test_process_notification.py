@@ -18,15 +18,17 @@ from app.constants import (
 )
 from app.models import Notification, NotificationHistory
 from app.notifications.process_notifications import (
+    build_notification,
     create_content_for_notification,
     persist_notification,
+    persist_notifications_in_bulk,
     send_notification_to_queue,
     simulated_recipient,
 )
 from app.serialised_models import SerialisedTemplate
 from app.utils import parse_and_format_phone_number
 from app.v2.errors import BadRequestError, QrCodeTooLongError
-from tests.app.db import create_api_key, create_job, create_service, create_template
+from tests.app.db import create_api_key, create_job, create_notification, create_service, create_template
 from tests.conftest import set_config
 
 
@@ -801,3 +803,71 @@ def test_persist_notification_when_template_has_unsubscribe_link_is_true(
 
     persisted_notification = Notification.query.first()
     assert persisted_notification.unsubscribe_link == expected_unsubscribe_link
+
+
+@freeze_time("2016-01-01 11:09:00.061258")
+def test_persist_notifications_in_bulk_increments_caches_once_per_batch(notify_api, sample_template, mocker):
+    mocker.patch("app.notifications.process_notifications.redis_store.get", return_value=1)
+    mock_incrby = mocker.patch("app.notifications.process_notifications.redis_store.incrby")
+    notifications = [
+        build_notification(
+            template_id=sample_template.id,
+            template_version=sample_template.version,
+            recipient={
+                "unformatted_recipient": "+447111111111",
+                "normalised_to": "447111111111",
+                "international": True,
+                "phone_prefix": "44",
+                "rate_multiplier": 1,
+            },
+            service=sample_template.service,
+            personalisation={},
+            notification_type=SMS_TYPE,
+            api_key_id=None,
+            key_type=KEY_TYPE_NORMAL,
+        )
+        for _ in range(3)
+    ]
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        saved_notifications = persist_notifications_in_bulk(notifications, sample_template.service, KEY_TYPE_NORMAL)
+
+    assert saved_notifications == notifications
+    assert Notification.query.count() == 3
+    assert mock_incrby.call_args_list == [
+        mocker.call(f"{sample_template.service_id}-sms-2016-01-01-count", 3),
+        mocker.call(f"{sample_template.service_id}-international_sms-2016-01-01-count", 3),
+    ]
+
+
+def test_persist_notifications_in_bulk_only_returns_new_notifications(notify_api, sample_job, mocker):
+    mock_incr = mocker.patch("app.notifications.process_notifications.increment_daily_limit_cache")
+    existing = create_notification(template=sample_job.template, job=sample_job, job_row_number=0)
+    notifications = [
+        build_notification(
+            template_id=sample_job.template.id,
+            template_version=sample_job.template.version,
+            recipient={
+                "unformatted_recipient": "+447111111111",
+                "normalised_to": "447111111111",
+                "international": False,
+                "phone_prefix": "31",
+                "rate_multiplier": 1,
+            },
+            service=sample_job.service,
+            personalisation={},
+            notification_type=SMS_TYPE,
+            api_key_id=None,
+            key_type=KEY_TYPE_NORMAL,
+            job_id=sample_job.id,
+            job_row_number=i,
+            notification_id=notification_id,
+        )
+        for i, notification_id in enumerate([existing.id, uuid.uuid4()])
+    ]
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        saved_notifications = persist_notifications_in_bulk(notifications, sample_job.service, KEY_TYPE_NORMAL)
+
+    assert saved_notifications == [notifications[1]]
+    assert mock_incr.call_args_list == [mocker.call(sample_job.service.id, SMS_TYPE, by=1)]
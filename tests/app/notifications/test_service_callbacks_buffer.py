@@ -0,0 +1,49 @@
+from unittest import mock
+
+from app.notifications.service_callbacks_buffer import (
+    BUFFERED_SERVICE_CALLBACKS_KEY,
+    SERVICE_CALLBACK_SLOT_TTL_SECONDS,
+    acquire_service_callback_slot,
+    release_service_callback_slot,
+    return_delivery_status_callbacks_to_buffer,
+)
+from tests.conftest import set_config
+
+
+def test_acquire_service_callback_slot_takes_the_first_free_slot(notify_api, mocker):
+    mock_set = mocker.patch(
+        "app.notifications.service_callbacks_buffer.redis_store.redis_store.set", side_effect=[None, True]
+    )
+
+    with set_config(notify_api, "SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT", 2):
+        assert acquire_service_callback_slot("buffer") == "buffer-slot-1"
+
+    assert mock_set.call_args_list == [
+        mock.call(f"buffer-slot-{slot}", 1, nx=True, ex=SERVICE_CALLBACK_SLOT_TTL_SECONDS) for slot in range(2)
+    ]
+
+
+def test_acquire_service_callback_slot_returns_none_if_every_slot_is_in_use(notify_api, mocker):
+    mocker.patch("app.notifications.service_callbacks_buffer.redis_store.redis_store.set", return_value=None)
+
+    with set_config(notify_api, "SERVICE_CALLBACK_MAX_CONCURRENCY_PER_ENDPOINT", 2):
+        assert acquire_service_callback_slot("buffer") is None
+
+
+def test_release_service_callback_slot_frees_the_slot(mocker):
+    mock_delete = mocker.patch("app.notifications.service_callbacks_buffer.redis_store.redis_store.delete")
+
+    release_service_callback_slot("buffer-slot-1")
+
+    mock_delete.assert_called_once_with("buffer-slot-1")
+
+
+def test_return_delivery_status_callbacks_to_buffer_puts_them_back_at_the_front_in_order(mocker):
+    mock_pipeline = mocker.patch("app.notifications.service_callbacks_buffer.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+
+    return_delivery_status_callbacks_to_buffer("buffer", ["a", "b", "c"])
+
+    pipe.lpush.assert_called_once_with("buffer", "c", "b", "a")
+    pipe.sadd.assert_called_once_with(BUFFERED_SERVICE_CALLBACKS_KEY, "buffer")
+    pipe.execute.assert_called_once_with()
@@ -0,0 +1,125 @@
+import pytest
+from flask import g
+from freezegun import freeze_time
+from notifications_utils.clients.redis import daily_limit_cache_key, rate_limit_cache_key
+
+from app.notifications.process_notifications import increment_daily_limit_cache
+from app.notifications.service_limits import (
+    RESERVE_SERVICE_LIMITS_SCRIPT,
+    get_reserve_service_limits_script,
+    release_daily_limit_reservations,
+    reserve_service_limits,
+    take_daily_limit_reservation,
+)
+from app.serialised_models import SerialisedService
+from app.v2.errors import RateLimitError, TooManyRequestsError
+from tests.conftest import set_config
+
+
+@pytest.fixture
+def mock_reserve_script(notify_api, mocker):
+    mock_get_script = mocker.patch("app.notifications.service_limits.get_reserve_service_limits_script")
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        yield mock_get_script.return_value
+
+
+@freeze_time("2016-01-01 12:00:00")
+def test_reserve_service_limits_checks_and_counts_in_one_call(sample_service, mock_reserve_script, mocker):
+    mock_reserve_script.return_value = 0
+    mocker.patch("app.notifications.service_limits.uuid.uuid4", return_value="some-nonce")
+    service = SerialisedService.from_id(sample_service.id)
+
+    reserve_service_limits(service, "normal", ["sms", "international_sms"])
+
+    mock_reserve_script.assert_called_once_with(
+        keys=[
+            rate_limit_cache_key(sample_service.id, "normal"),
+            daily_limit_cache_key(sample_service.id, notification_type="sms"),
+            daily_limit_cache_key(sample_service.id, notification_type="international_sms"),
+        ],
+        args=[1451649600.0, 3000, 60, 1, 86400, "some-nonce", 1000, service.international_sms_message_limit],
+    )
+    assert g.daily_limit_reservations == {
+        (str(sample_service.id), "sms"): 1,
+        (str(sample_service.id), "international_sms"): 1,
+    }
+
+
+def test_reserve_service_limits_only_checks_rate_limit_for_test_keys(sample_service, mock_reserve_script):
+    mock_reserve_script.return_value = 0
+
+    reserve_service_limits(SerialisedService.from_id(sample_service.id), "test", ["sms"])
+
+    assert mock_reserve_script.call_args.kwargs["keys"] == [rate_limit_cache_key(sample_service.id, "test")]
+    assert "daily_limit_reservations" not in g
+
+
+def test_reserve_service_limits_raises_if_rate_limit_exceeded(sample_service, mock_reserve_script):
+    mock_reserve_script.return_value = -1
+
+    with pytest.raises(RateLimitError):
+        reserve_service_limits(SerialisedService.from_id(sample_service.id), "normal", ["sms"])
+
+    assert "daily_limit_reservations" not in g
+
+
+def test_reserve_service_limits_raises_for_the_daily_limit_exceeded(sample_service, mock_reserve_script):
+    mock_reserve_script.return_value = 2
+
+    service = SerialisedService.from_id(sample_service.id)
+
+    with pytest.raises(TooManyRequestsError) as e:
+        reserve_service_limits(service, "normal", ["sms", "international_sms"])
+
+    assert e.value.limit_name == "international_sms"
+    assert e.value.sending_limit == service.international_sms_message_limit
+    assert "daily_limit_reservations" not in g
+
+
+def test_reserve_service_limits_does_not_block_sending_if_redis_fails(sample_service, mock_reserve_script):
+    mock_reserve_script.side_effect = ConnectionError
+
+    reserve_service_limits(SerialisedService.from_id(sample_service.id), "normal", ["sms"])
+
+    assert "daily_limit_reservations" not in g
+
+
+def test_increment_daily_limit_cache_uses_up_reservations_first(sample_service, mock_reserve_script, mocker):
+    mock_reserve_script.return_value = 0
+    mock_incrby = mocker.patch("app.notifications.process_notifications.redis_store.incrby")
+    mock_get = mocker.patch("app.notifications.process_notifications.redis_store.get", return_value=5)
+    reserve_service_limits(SerialisedService.from_id(sample_service.id), "normal", ["sms"])
+
+    increment_daily_limit_cache(sample_service.id, "sms")
+
+    assert mock_get.call_count == 0
+
+    increment_daily_limit_cache(sample_service.id, "sms", by=3)
+
+    mock_incrby.assert_called_once_with(daily_limit_cache_key(sample_service.id, notification_type="sms"), 3)
+
+
+def test_release_daily_limit_reservations_hands_back_unused_reservations(sample_service, mock_reserve_script, mocker):
+    mock_pipeline = mocker.patch("app.notifications.service_limits.redis_store.redis_store.pipeline")
+    mock_reserve_script.return_value = 0
+    reserve_service_limits(SerialisedService.from_id(sample_service.id), "normal", ["sms", "international_sms"], 2)
+    take_daily_limit_reservation(sample_service.id, "sms", 2)
+
+    release_daily_limit_reservations()
+
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    pipe.decrby.assert_called_once_with(
+        daily_limit_cache_key(sample_service.id, notification_type="international_sms"), 2
+    )
+    pipe.execute.assert_called_once_with()
+    assert "daily_limit_reservations" not in g
+
+
+def test_get_reserve_service_limits_script_registers_script_once(mocker):
+    mock_register_script = mocker.patch("app.notifications.service_limits.redis_store.redis_store.register_script")
+    get_reserve_service_limits_script.cache_clear()
+
+    assert get_reserve_service_limits_script() is get_reserve_service_limits_script()
+
+    mock_register_script.assert_called_once_with(RESERVE_SERVICE_LIMITS_SCRIPT)
+    get_reserve_service_limits_script.cache_clear()
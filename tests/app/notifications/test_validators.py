@@ -60,7 +60,7 @@ from tests.app.db import (
     create_service_sms_sender,
     create_template,
 )
-from tests.conftest import set_config
+from tests.conftest import set_config, set_config_values
 
 # TODO: [NOTIFYNL] messagebox notification type needs message limits built before this can be reverted
 NOTIFICATION_TYPES = [SMS_TYPE, EMAIL_TYPE, LETTER_TYPE]  # noqa: F811
@@ -510,6 +510,27 @@ def test_check_service_over_api_rate_limit_when_rate_limit_has_not_exceeded_limi
         ]
 
 
+@pytest.mark.parametrize("requests_in_interval, should_raise", [(3000, False), (3001, True)])
+def test_check_service_over_api_rate_limit_counts_each_notification_in_a_bulk_request(
+    notify_api, sample_service, mocker, requests_in_interval, should_raise
+):
+    mock_pipeline = mocker.patch("app.notifications.validators.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [100, 0, requests_in_interval, True]
+    mock_exceeded_rate_limit = mocker.patch("app.redis_store.exceeded_rate_limit")
+    serialised_service = SerialisedService.from_id(sample_service.id)
+
+    with set_config_values(notify_api, {"API_RATE_LIMIT_ENABLED": True, "REDIS_ENABLED": True}):
+        if should_raise:
+            with pytest.raises(RateLimitError):
+                check_service_over_api_rate_limit(serialised_service, "normal", num_notifications=100)
+        else:
+            check_service_over_api_rate_limit(serialised_service, "normal", num_notifications=100)
+
+    assert len(pipe.zadd.call_args[0][1]) == 100
+    assert mock_exceeded_rate_limit.call_count == 0
+
+
 def test_check_service_over_api_rate_limit_should_do_nothing_if_limiting_is_disabled(sample_service, mocker):
     with freeze_time("2016-01-01 12:00:00.000000"):
         current_app.config["API_RATE_LIMIT_ENABLED"] = False
@@ -534,9 +555,9 @@ def test_check_rate_limiting_validates_api_rate_limit_and_daily_limit(notify_db_
 
     check_rate_limiting(service, api_key, notification_type=notification_type)
 
-    mock_rate_limit.assert_called_once_with(service, api_key.key_type)
+    mock_rate_limit.assert_called_once_with(service, api_key.key_type, num_notifications=1)
     assert mock_daily_limit.call_args_list == [
-        mocker.call(service, api_key.key_type, notification_type=notification_type),
+        mocker.call(service, api_key.key_type, notification_type=notification_type, num_notifications=1),
     ]
 
 
@@ -293,12 +293,89 @@ def test_upload_remaining_data_skips_if_empty(mocker, mock_processor):
     mock_s3_upload_part.assert_not_called()
 
 
-def test_fetch_serialized_notifications_empty(mocker, mock_processor):
-    mocker.patch("app.report_requests.process_notifications_report.get_notifications_for_service")
-    result = mock_processor._fetch_serialized_notifications(7, None)
+def test_fetch_notification_rows_empty(mocker, mock_processor):
+    mocker.patch(
+        "app.report_requests.process_notifications_report.get_notifications_for_service_for_csv", return_value=[]
+    )
+    result = mock_processor._fetch_notification_rows(7, None)
     assert result == []
 
 
+def test_fetch_and_upload_notifications_pages_on_created_at_and_id(mocker, mock_processor):
+    mocker.patch.object(mock_processor, "_upload_remaining_data")
+    mock_fetch = mocker.spy(mock_processor, "_fetch_notification_rows")
+    mock_processor.page_size = 15
+
+    mock_processor._fetch_and_upload_notifications()
+
+    first_page = mock_fetch.spy_return_list[0]
+    assert [len(rows) for rows in mock_fetch.spy_return_list] == [15, 15, 10, 0]
+    assert mock_fetch.call_args_list[1] == mocker.call(7, (first_page[-1].created_at, first_page[-1].id))
+    # a line for each of the 40 sms notifications
+    assert mock_processor.csv_buffer.getvalue().count("\r\n") == 40
+
+
+def _uploaded_parts(mock_upload_part):
+    return sorted((call.kwargs["part_number"], call.kwargs["data_bytes"]) for call in mock_upload_part.call_args_list)
+
+
+def test_fetch_and_upload_notifications_in_slices_uploads_the_same_csv_as_a_serial_export(
+    mocker, notify_api, mock_processor
+):
+    mocker.patch("app.report_requests.process_notifications_report.S3_MULTIPART_UPLOAD_MIN_PART_SIZE", 1000)
+    mock_upload_part = mocker.patch(
+        "app.report_requests.process_notifications_report.s3_multipart_upload_part",
+        side_effect=lambda part_number, **kwargs: {"ETag": f"etag-{part_number}"},
+    )
+    mock_processor.page_size = 3
+    mock_processor._initialize_csv()
+    mock_processor._fetch_and_upload_notifications()
+    serial_parts = _uploaded_parts(mock_upload_part)
+
+    mock_upload_part.reset_mock()
+    sliced_processor = ReportRequestProcessor(mock_processor.service_id, mock_processor.report_request_id)
+    sliced_processor.page_size = 3
+    sliced_processor._initialize_csv()
+    with set_config(notify_api, "REPORT_REQUEST_NOTIFICATIONS_SLICES", 3):
+        sliced_processor._fetch_and_upload_notifications()
+    sliced_parts = _uploaded_parts(mock_upload_part)
+
+    assert b"".join(data for _, data in sliced_parts) == b"".join(data for _, data in serial_parts)
+    assert all(len(data) >= 1000 for _, data in sliced_parts[:-1])
+    assert sliced_processor.parts == [
+        {"PartNumber": part_number, "ETag": f"etag-{part_number}"} for part_number, _ in sliced_parts
+    ]
+
+
+def test_fetch_and_upload_notifications_in_slices_keeps_the_tail_of_a_slice_without_parts(
+    mocker, notify_api, mock_processor
+):
+    mock_upload_part = mocker.patch(
+        "app.report_requests.process_notifications_report.s3_multipart_upload_part",
+        side_effect=lambda part_number, **kwargs: {"ETag": f"etag-{part_number}"},
+    )
+
+    def export_slice(app, first_part_number, parts_per_slice, created_from, created_before):
+        # the newest slice has a head and a tail but no full parts in between
+        if created_before is None:
+            return b"newest head,", [], b"newest tail,"
+        return b"oldest head,", [{"PartNumber": first_part_number + 1, "ETag": "etag"}], b"oldest tail"
+
+    mocker.patch.object(mock_processor, "_export_slice", side_effect=export_slice)
+    mock_processor._initialize_csv()
+    headers = mock_processor.csv_buffer.getvalue().encode("utf-8")
+
+    mock_processor._fetch_and_upload_notifications_in_slices(7, 2)
+
+    assert [data for _, data in _uploaded_parts(mock_upload_part)] == [
+        headers + b"newest head,newest tail,oldest head,",
+        b"oldest tail",
+    ]
+    part_numbers = [part["PartNumber"] for part in mock_processor.parts]
+    assert len(part_numbers) == 3
+    assert part_numbers == sorted(part_numbers)
+
+
 @pytest.mark.skip(reason="[NOTIFYNL] CSV report issues")
 @pytest.mark.parametrize(
     (
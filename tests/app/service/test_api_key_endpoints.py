@@ -72,6 +72,19 @@ def test_revoke_should_expire_api_key_for_service(notify_api, sample_api_key):
             assert api_keys_for_service.expiry_date is not None
 
 
+def test_revoke_api_key_invalidates_cached_api_keys(notify_api, sample_api_key, mocker):
+    mock_invalidate = mocker.patch("app.service.rest.invalidate_serialised_models")
+    with notify_api.test_request_context():
+        with notify_api.test_client() as client:
+            response = client.post(
+                url_for("service.revoke_api_key", service_id=sample_api_key.service_id, api_key_id=sample_api_key.id),
+                headers=[create_admin_authorization_header()],
+            )
+
+    assert response.status_code == 202
+    mock_invalidate.assert_called_once_with(sample_api_key.service_id)
+
+
 def test_api_key_should_create_multiple_new_api_key_for_service(notify_api, sample_service):
     with notify_api.test_request_context():
         with notify_api.test_client() as client:
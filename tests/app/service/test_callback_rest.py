@@ -112,6 +112,28 @@ def test_update_service_callback_api_updates_bearer_token(admin_request, sample_
     assert callback_api.bearer_token == f"different_token_{callback_type}"
 
 
+def test_update_service_callback_api_opts_in_to_batch_callbacks(admin_request, sample_service):
+    callback_api = create_service_callback_api(
+        callback_type=ServiceCallbackTypes.delivery_status.value, service=sample_service
+    )
+    assert callback_api.batch_callbacks is False
+    data = {
+        "batch_callbacks": True,
+        "updated_by_id": str(sample_service.users[0].id),
+        "callback_type": ServiceCallbackTypes.delivery_status.value,
+    }
+
+    response = admin_request.post(
+        "service_callback.update_service_callback_api",
+        service_id=sample_service.id,
+        callback_api_id=callback_api.id,
+        _data=data,
+    )
+
+    assert response["data"]["batch_callbacks"] is True
+    assert callback_api.batch_callbacks is True
+
+
 @pytest.mark.parametrize(
     "callback_type, path",
     [
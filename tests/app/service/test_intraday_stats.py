@@ -0,0 +1,154 @@
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import call
+
+import pytest
+from freezegun import freeze_time
+
+from app.service.intraday_stats import (
+    IntradayStat,
+    get_intraday_stats,
+    record_intraday_stats_changes,
+    sum_intraday_stats,
+)
+from tests.conftest import set_config_values
+
+
+@pytest.fixture
+def intraday_stats_enabled(notify_api):
+    with set_config_values(notify_api, {"INTRADAY_SERVICE_STATS_ENABLED": True, "REDIS_ENABLED": True}):
+        yield
+
+
+def _notification(service_id, template_id, created_at, notification_type="sms", key_type="normal"):
+    return SimpleNamespace(
+        service_id=service_id,
+        template_id=template_id,
+        notification_type=notification_type,
+        key_type=key_type,
+        created_at=created_at,
+    )
+
+
+@freeze_time("2018-06-01 10:30")
+def test_record_intraday_stats_changes_updates_counts_in_one_pipeline(intraday_stats_enabled, mocker):
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    service_id, template_id = uuid.uuid4(), uuid.uuid4()
+    today = _notification(service_id, template_id, datetime(2018, 6, 1, 10, 0))
+    yesterday = _notification(service_id, template_id, datetime(2018, 5, 31, 12, 0))
+
+    record_intraday_stats_changes(
+        [
+            (today, None, "created"),
+            (today, None, "created"),
+            (today, "created", "sending"),
+            (yesterday, "sending", "delivered"),
+            (yesterday, "delivered", "delivered"),
+        ]
+    )
+
+    assert pipe.hincrby.call_args_list == [
+        call(f"service-{service_id}-intraday-stats-2018-06-01", f"sms:normal:{template_id}:created:11", 1),
+        call(f"service-{service_id}-intraday-stats-2018-06-01", f"sms:normal:{template_id}:sending:11", 1),
+        call(f"service-{service_id}-intraday-stats-2018-05-31", f"sms:normal:{template_id}:sending:13", -1),
+        call(f"service-{service_id}-intraday-stats-2018-05-31", f"sms:normal:{template_id}:delivered:13", 1),
+    ]
+    assert sorted(pipe.sadd.call_args_list) == [
+        call("intraday-stats-services-2018-05-31", str(service_id)),
+        call("intraday-stats-services-2018-06-01", str(service_id)),
+    ]
+    pipe.set.assert_called_once_with("intraday-stats-recorded-since", "2018-06-01T10:30:00", nx=True)
+    pipe.execute.assert_called_once_with()
+
+
+def test_record_intraday_stats_changes_takes_deleted_notifications_off_their_status(intraday_stats_enabled, mocker):
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    service_id, template_id = uuid.uuid4(), uuid.uuid4()
+
+    record_intraday_stats_changes(
+        [(_notification(service_id, template_id, datetime(2018, 6, 1, 10, 0)), "created", None)]
+    )
+
+    pipe.hincrby.assert_called_once_with(
+        f"service-{service_id}-intraday-stats-2018-06-01", f"sms:normal:{template_id}:created:11", -1
+    )
+
+
+def test_record_intraday_stats_changes_does_nothing_if_not_enabled(notify_api, mocker):
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+
+    record_intraday_stats_changes([(_notification(uuid.uuid4(), uuid.uuid4(), datetime.utcnow()), None, "created")])
+
+    assert mock_pipeline.called is False
+
+
+def test_get_intraday_stats(intraday_stats_enabled, mocker):
+    service_id, template_id = uuid.uuid4(), uuid.uuid4()
+    mocker.patch("app.service.intraday_stats.redis_store.redis_store.get", return_value=b"2018-05-31T12:00:00.123456")
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+    pipe = mock_pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [
+        {
+            f"sms:normal:{template_id}:delivered:9".encode(): b"3",
+            f"sms:test:{template_id}:sending:10".encode(): b"0",
+        }
+    ]
+
+    assert get_intraday_stats(date(2018, 6, 1), service_ids=[service_id]) == {
+        str(service_id): [IntradayStat("sms", "normal", str(template_id), "delivered", 9, 3)]
+    }
+    pipe.hgetall.assert_called_once_with(f"service-{service_id}-intraday-stats-2018-06-01")
+
+
+def test_get_intraday_stats_for_all_services(intraday_stats_enabled, mocker):
+    service_id = uuid.uuid4()
+    mocker.patch("app.service.intraday_stats.redis_store.redis_store.get", return_value=b"2018-05-31T12:00:00")
+    mock_smembers = mocker.patch(
+        "app.service.intraday_stats.redis_store.redis_store.smembers", return_value={str(service_id).encode()}
+    )
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+    mock_pipeline.return_value.__enter__.return_value.execute.return_value = [{}]
+
+    assert get_intraday_stats(date(2018, 6, 1)) == {str(service_id): []}
+    mock_smembers.assert_called_once_with("intraday-stats-services-2018-06-01")
+
+
+@pytest.mark.parametrize("recorded_since", (None, b"2018-05-31T23:00:01"))
+def test_get_intraday_stats_returns_none_if_not_recorded_for_the_whole_day(
+    intraday_stats_enabled, mocker, recorded_since
+):
+    mocker.patch("app.service.intraday_stats.redis_store.redis_store.get", return_value=recorded_since)
+    mock_pipeline = mocker.patch("app.service.intraday_stats.redis_store.redis_store.pipeline")
+
+    # London midnight on 2018-06-01 is 23:00 UTC the day before
+    assert get_intraday_stats(date(2018, 6, 1), service_ids=[uuid.uuid4()]) is None
+    assert mock_pipeline.called is False
+
+
+def test_get_intraday_stats_returns_none_if_not_enabled(notify_api, mocker):
+    mock_get = mocker.patch("app.service.intraday_stats.redis_store.redis_store.get")
+
+    assert get_intraday_stats(date(2018, 6, 1)) is None
+    assert mock_get.called is False
+
+
+def test_sum_intraday_stats_leaves_out_test_key_by_default():
+    stats = [
+        IntradayStat("sms", "normal", "template-1", "delivered", 9, 3),
+        IntradayStat("sms", "team", "template-2", "delivered", 10, 2),
+        IntradayStat("sms", "test", "template-1", "delivered", 10, 7),
+        IntradayStat("email", "normal", "template-3", "created", 11, 1),
+    ]
+
+    assert sum_intraday_stats(stats, ("notification_type", "status")) == {
+        ("sms", "delivered"): 5,
+        ("email", "created"): 1,
+    }
+    assert sum_intraday_stats(stats, ("template_id",), include_from_test_key=True) == {
+        ("template-1",): 10,
+        ("template-2",): 2,
+        ("template-3",): 1,
+    }
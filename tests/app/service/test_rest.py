@@ -1857,6 +1857,32 @@ def test_get_notifications_for_service_for_csv_multipage(
     assert second_response["notifications"][0]["id"] == str(oldest_notification.id)
 
 
+def test_get_notifications_for_service_for_csv_pages_through_notifications_created_at_the_same_time(
+    admin_request,
+    sample_template,
+):
+    created_at = datetime.utcnow() - timedelta(minutes=1)
+    notifications = [create_notification(sample_template, created_at=created_at) for _ in range(3)]
+
+    first_response = admin_request.get(
+        "service.get_all_notifications_for_service_for_csv",
+        service_id=sample_template.service_id,
+        page_size=2,
+    )
+    second_response = admin_request.get(
+        "service.get_all_notifications_for_service_for_csv",
+        service_id=sample_template.service_id,
+        page_size=2,
+        older_than=first_response["notifications"][-1]["id"],
+    )
+
+    assert len(first_response["notifications"]) == 2
+    assert len(second_response["notifications"]) == 1
+    assert sorted(
+        notification["id"] for notification in first_response["notifications"] + second_response["notifications"]
+    ) == sorted(str(notification.id) for notification in notifications)
+
+
 @pytest.mark.parametrize(
     "should_prefix",
     [
@@ -2647,6 +2673,22 @@ def test_add_service_reply_to_email_address(admin_request, sample_service):
     assert response["data"] == results[0].serialize()
 
 
+@pytest.mark.parametrize(
+    "endpoint, data",
+    [
+        ("service.add_service_reply_to_email_address", {"email_address": "new@reply.com", "is_default": True}),
+        ("service.add_service_letter_contact", {"contact_block": "London, E1 8QS", "is_default": True}),
+        ("service.add_service_sms_sender", {"sms_sender": "second", "is_default": True}),
+    ],
+)
+def test_adding_a_sender_invalidates_cached_service(admin_request, sample_service, mocker, endpoint, data):
+    mock_invalidate = mocker.patch("app.service.rest.invalidate_serialised_models")
+
+    admin_request.post(endpoint, service_id=sample_service.id, _data=data, _expected_status=201)
+
+    mock_invalidate.assert_called_once_with(sample_service.id)
+
+
 def test_add_service_reply_to_email_address_doesnt_allow_duplicates(admin_request, notify_db_session, mocker):
     data = {"email_address": "reply-here@example.gov.uk", "is_default": True}
     service = create_service()
@@ -365,6 +365,19 @@ def test_update_should_update_a_template(client, sample_user):
     assert sample_user.id in template_created_by_users
 
 
+def test_update_template_invalidates_cached_template(client, sample_template, mocker):
+    mock_invalidate = mocker.patch("app.template.rest.invalidate_serialised_models")
+
+    response = client.post(
+        f"/service/{sample_template.service_id}/template/{sample_template.id}",
+        headers=[("Content-Type", "application/json"), create_admin_authorization_header()],
+        data=json.dumps({"content": "new content", "created_by": str(sample_template.created_by_id)}),
+    )
+
+    assert response.status_code == 200
+    mock_invalidate.assert_called_once_with(sample_template.service_id, sample_template.id)
+
+
 @pytest.mark.parametrize(
     "post_data",
     (
@@ -0,0 +1,72 @@
+import time
+from unittest import mock
+
+import pytest
+from flask import g
+
+from app.db_statement_stats import DbStatementStats, _record_db_statement_stats, after_cursor_execute
+from tests.conftest import set_config_values
+
+
+def test_records_db_statement_stats_for_requests(client, notify_db_session, mocker):
+    mock_count = mocker.patch("app.db_statement_stats.DB_STATEMENTS_COUNT")
+
+    response = client.get("/_status")
+
+    assert response.status_code == 200
+    mock_count.labels.assert_called_once_with("GET", "/_status")
+    assert mock_count.labels.return_value.observe.call_args[0][0] >= 1
+
+
+def _stats(statement_counts):
+    stats = DbStatementStats()
+    for statement, count in statement_counts.items():
+        stats.statements += count
+        stats.statement_counts[statement] = count
+        stats.last_parameters[statement] = {}
+    return stats
+
+
+def test_logs_most_repeated_statements_if_over_budget(notify_api, mocker):
+    mock_warning = mocker.patch.object(notify_api.logger, "warning")
+    g.db_statement_stats = _stats({"SELECT templates": 8, "SELECT services": 1, "UPDATE notifications": 2})
+
+    with set_config_values(notify_api, {"DATABASE_STATEMENT_BUDGET": 10, "DATABASE_STATEMENT_BUDGETS": {}}):
+        _record_db_statement_stats("celery", "deliver_email")
+
+    assert "db_statement_stats" not in g
+    mock_warning.assert_called_once()
+    assert mock_warning.call_args[0][1:5] == ("celery", "deliver_email", 11, 10)
+    assert mock_warning.call_args[1]["extra"]["db_most_repeated_statements"] == [
+        {"statement": "SELECT templates", "count": 8},
+        {"statement": "UPDATE notifications", "count": 2},
+        {"statement": "SELECT services", "count": 1},
+    ]
+
+
+def test_does_not_log_statements_within_budget(notify_api, mocker):
+    mock_warning = mocker.patch.object(notify_api.logger, "warning")
+    g.db_statement_stats = _stats({"SELECT templates": 11})
+
+    with set_config_values(
+        notify_api, {"DATABASE_STATEMENT_BUDGET": 10, "DATABASE_STATEMENT_BUDGETS": {"deliver_email": 20}}
+    ):
+        _record_db_statement_stats("celery", "deliver_email")
+
+    assert mock_warning.call_count == 0
+
+
+@pytest.mark.parametrize("budgets, expected_statement_counts", [({}, {}), ({"deliver_email": 20}, {"SELECT 1": 2})])
+def test_only_collects_statements_if_the_task_has_a_budget(notify_api, mocker, budgets, expected_statement_counts):
+    mocker.patch("app.db_statement_stats.current_task").name = "deliver_email"
+    connection = mock.Mock(info={"statement_start_time": time.monotonic()})
+    g.pop("db_statement_stats", None)
+
+    with set_config_values(notify_api, {"DATABASE_STATEMENT_BUDGET": 0, "DATABASE_STATEMENT_BUDGETS": budgets}):
+        for _ in range(2):
+            after_cursor_execute(connection, mock.Mock(rowcount=1), "SELECT 1", {}, None, False)
+
+    stats = g.pop("db_statement_stats")
+    assert stats.statements == 2
+    assert stats.rows == 2
+    assert stats.statement_counts == expected_statement_counts
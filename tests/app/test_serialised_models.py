@@ -1,10 +1,24 @@
 import json
 from unittest.mock import ANY
 
+import pytest
 from freezegun import freeze_time
 
-from app.serialised_models import SerialisedTemplate
+from app import signing
+from app.serialised_models import (
+    CacheInvalidationListener,
+    SerialisedAPIKeyCollection,
+    SerialisedService,
+    SerialisedTemplate,
+    cache_invalidation_listener,
+    caches,
+    clear_long_lived_caches,
+    evict_from_memory_caches,
+    invalidate_serialised_models,
+    long_lived_caches,
+)
 from tests.app.db import create_template
+from tests.conftest import set_config, set_config_values
 
 EXPECTED_TEMPLATE_ATTRIBUTES = {
     "archived",
@@ -124,3 +138,126 @@ def test_template_version_caches_in_redis_with_correct_keys(
     }
 
     assert {attr for attr in dir(template) if not attr.startswith("_")} == EXPECTED_TEMPLATE_ATTRIBUTES
+
+
+def test_api_key_collection_decodes_each_secret_once(sample_api_key, mocker):
+    expected_secret = sample_api_key.secret
+    mock_decode = mocker.patch("app.serialised_models.signing.decode", wraps=signing.decode)
+
+    for _ in range(3):
+        # empty the short-lived cache of the whole collection, as if it had expired
+        caches["SerialisedAPIKeyCollection.from_service_id"].clear()
+        api_keys = SerialisedAPIKeyCollection.from_service_id(sample_api_key.service_id)
+        assert [api_key.secret for api_key in api_keys] == [expected_secret]
+
+    mock_decode.assert_called_once()
+
+
+@pytest.fixture
+def listening_for_invalidations(mocker):
+    clear_long_lived_caches()
+    mocker.patch.object(cache_invalidation_listener, "is_listening", return_value=True)
+    yield
+    clear_long_lived_caches()
+
+
+def test_memory_cache_uses_long_lived_cache_while_listening_for_invalidations(
+    sample_service, mocker, listening_for_invalidations
+):
+    mock_get_dict = mocker.patch.object(SerialisedService, "get_dict", wraps=SerialisedService.get_dict)
+
+    SerialisedService.from_id(sample_service.id)
+    SerialisedService.from_id(sample_service.id)
+
+    mock_get_dict.assert_called_once_with(sample_service.id)
+    assert (sample_service.id,) in long_lived_caches["SerialisedService.from_id"]
+    assert (sample_service.id,) not in caches["SerialisedService.from_id"]
+
+
+def test_evict_from_memory_caches_removes_entries_for_service(sample_template, listening_for_invalidations):
+    other_template = create_template(sample_template.service, template_name="other")
+    SerialisedService.from_id(sample_template.service_id)
+    SerialisedTemplate.from_id_and_service_id(sample_template.id, sample_template.service_id)
+    SerialisedTemplate.from_id_and_service_id(other_template.id, sample_template.service_id)
+
+    evict_from_memory_caches(sample_template.service_id, sample_template.id)
+
+    assert list(long_lived_caches["SerialisedTemplate.from_id_and_service_id"]) == [
+        (other_template.id, sample_template.service_id)
+    ]
+    assert (sample_template.service_id,) in long_lived_caches["SerialisedService.from_id"]
+
+    evict_from_memory_caches(sample_template.service_id)
+
+    assert not long_lived_caches["SerialisedTemplate.from_id_and_service_id"]
+    assert not long_lived_caches["SerialisedService.from_id"]
+
+
+def test_memory_cache_does_not_store_value_fetched_during_an_invalidation(
+    sample_service, mocker, listening_for_invalidations
+):
+    def get_dict_racing_an_invalidation(service_id):
+        evict_from_memory_caches(service_id)
+        return {"data": {"id": service_id}}
+
+    mocker.patch.object(SerialisedService, "get_dict", side_effect=get_dict_racing_an_invalidation)
+
+    SerialisedService.from_id(sample_service.id)
+
+    assert (sample_service.id,) not in long_lived_caches["SerialisedService.from_id"]
+
+
+@pytest.mark.parametrize(
+    "template_id, expected_redis_key",
+    (
+        (None, "service-{service_id}"),
+        ("6ce466d0-fd6a-11e5-82f5-e0accb9d11a6", "service-{service_id}-template-{template_id}-version-None"),
+    ),
+)
+def test_invalidate_serialised_models_clears_redis_and_publishes_invalidation(
+    notify_api, sample_service, mocker, template_id, expected_redis_key
+):
+    mock_delete = mocker.patch("app.serialised_models.redis_store.delete")
+    mock_publish = mocker.patch("app.serialised_models.redis_store.redis_store.publish")
+    mock_evict = mocker.patch("app.serialised_models.evict_from_memory_caches")
+
+    with set_config(notify_api, "REDIS_ENABLED", True):
+        invalidate_serialised_models(sample_service.id, template_id)
+
+    mock_delete.assert_called_once_with(
+        expected_redis_key.format(service_id=sample_service.id, template_id=template_id)
+    )
+    mock_evict.assert_called_once_with(sample_service.id, template_id)
+    mock_publish.assert_called_once_with(
+        "serialised-model-cache-invalidation",
+        json.dumps({"service_id": str(sample_service.id), "template_id": template_id}),
+    )
+
+
+def test_cache_invalidation_listener_evicts_on_message(mocker):
+    mock_evict = mocker.patch("app.serialised_models.evict_from_memory_caches")
+
+    CacheInvalidationListener()._handle_message({"data": json.dumps({"service_id": "1234", "template_id": None})})
+
+    mock_evict.assert_called_once_with("1234", None)
+
+
+def test_cache_invalidation_listener_is_not_listening_if_subscribing_fails(notify_api, mocker):
+    mocker.patch("app.serialised_models.redis_store.redis_store.pubsub", side_effect=ConnectionError)
+    listener = CacheInvalidationListener()
+
+    with set_config_values(notify_api, {"LONG_LIVED_MODEL_CACHE_ENABLED": True, "REDIS_ENABLED": True}):
+        assert listener.is_listening() is False
+        # doesn't try again straight away
+        assert listener.is_listening() is False
+
+    assert listener.next_attempt > 0
+
+
+def test_cache_invalidation_listener_is_not_listening_if_disabled(notify_api, mocker):
+    mock_pubsub = mocker.patch("app.serialised_models.redis_store.redis_store.pubsub")
+
+    with set_config_values(notify_api, {"LONG_LIVED_MODEL_CACHE_ENABLED": False, "REDIS_ENABLED": True}):
+        assert CacheInvalidationListener().is_listening() is False
+
+    assert mock_pubsub.call_count == 0
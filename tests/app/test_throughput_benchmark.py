@@ -0,0 +1,53 @@
+import pytest
+
+from app.models import Notification
+from app.throughput_benchmark import StageResult, compare_with_baseline, run_throughput_benchmark
+
+
+def test_stage_result_latency_percentiles():
+    result = StageResult("deliver", 100, 2, [i / 1000 for i in range(1, 101)], 300)
+
+    assert result.notifications_per_second == 50
+    assert result.queries_per_notification == 3
+    assert result.latency_percentiles() == pytest.approx((50.5, 95.05, 99.01))
+
+
+def test_stage_result_latency_percentiles_for_a_single_run():
+    assert StageResult("timeout-notifications", 10, 1, [0.5], 4).latency_percentiles() == (500, 500, 500)
+
+
+@pytest.mark.parametrize(
+    "notifications_per_second, queries_per_notification, expected_regressions",
+    [
+        (90, 3.5, []),
+        (
+            70,
+            3,
+            ["deliver: 70.00 notifications/sec, down from 100.00"],
+        ),
+        (
+            100,
+            4,
+            ["deliver: 4.00 queries/notification, up from 3.00"],
+        ),
+    ],
+)
+def test_compare_with_baseline(notifications_per_second, queries_per_notification, expected_regressions):
+    results = [
+        StageResult("deliver", 100, 100 / notifications_per_second, [0.01], 100 * queries_per_notification),
+        StageResult("ses-receipt", 100, 1, [0.01], 100),
+    ]
+    baseline = {"deliver": {"notifications_per_second": 100, "queries_per_notification": 3}}
+
+    assert compare_with_baseline(results, baseline, tolerance=0.2) == expected_regressions
+
+
+def test_run_throughput_benchmark_for_emails(sample_email_template, mocker):
+    mocker.patch("app.celery.process_ses_receipts_tasks.check_and_queue_callback_task")
+
+    results = run_throughput_benchmark(sample_email_template.service, "email", 3)
+
+    assert [result.stage for result in results] == ["post-notification", "deliver", "ses-receipt"]
+    assert [result.notifications for result in results] == [3, 3, 3]
+    assert all(result.queries for result in results)
+    assert {notification.status for notification in Notification.query.all()} == {"delivered"}
@@ -51,7 +51,7 @@ def test_service_messagebox_rate_limiting(mocker):
 
     check_rate_limiting(service, api_key, notification_type=MESSAGEBOX_TYPE)
 
-    mock_rate_limit.assert_called_once_with(service, api_key.key_type)
+    mock_rate_limit.assert_called_once_with(service, api_key.key_type, num_notifications=1)
     assert mock_daily_limit.call_args_list == [
-        mocker.call(service, api_key.key_type, notification_type=MESSAGEBOX_TYPE),
+        mocker.call(service, api_key.key_type, notification_type=MESSAGEBOX_TYPE, num_notifications=1),
     ]
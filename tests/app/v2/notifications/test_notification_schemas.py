@@ -6,7 +6,7 @@ from freezegun import freeze_time
 from jsonschema import ValidationError
 
 from app.constants import EMAIL_TYPE, NOTIFICATION_CREATED
-from app.schema_validation import validate
+from app.schema_validation import get_validator, validate
 from app.v2.notifications.notification_schemas import get_notifications_request
 from app.v2.notifications.notification_schemas import (
     post_email_request as post_email_request_schema,
@@ -351,3 +351,23 @@ def test_scheduled_for_raises_validation_error_when_more_than_24_hours_in_the_fu
     assert error["errors"] == [
         {"error": "ValidationError", "message": "scheduled_for datetime can only be 24 hours in the future"}
     ]
+
+
+def test_get_validator_builds_one_validator_for_each_schema():
+    validator = get_validator(post_email_request_schema)
+
+    assert get_validator(post_email_request_schema) is validator
+    assert get_validator(post_sms_request_schema) is not validator
+    # an equal schema that isn't the same dict gets a validator of its own
+    assert get_validator(dict(post_email_request_schema)) is not validator
+
+
+def test_validate_reports_errors_each_time_with_the_same_validator():
+    j = {"template_id": str(uuid.uuid4()), "email_address": "not an email"}
+
+    for _ in range(2):
+        with pytest.raises(ValidationError) as e:
+            validate(j, post_email_request_schema)
+        assert json.loads(str(e.value))["errors"] == [
+            {"error": "ValidationError", "message": "email_address Not a valid email address"}
+        ]
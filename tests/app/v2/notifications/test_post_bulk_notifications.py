@@ -0,0 +1,152 @@
+import pytest
+
+from app.models import Notification
+from app.schema_validation import validate
+from app.v2.notifications.notification_schemas import post_email_response, post_sms_response
+from tests.app.db import create_service, create_template
+
+
+def test_post_bulk_notifications_sends_email_notifications(api_client_request, sample_email_template, mocker):
+    mock_deliver = mocker.patch("app.celery.provider_tasks.deliver_email.apply_async")
+
+    resp_json = api_client_request.post(
+        sample_email_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={
+            "template_id": str(sample_email_template.id),
+            "notifications": [
+                {"email_address": "one@example.com", "reference": "ref-1"},
+                {"email_address": "two@example.com"},
+            ],
+        },
+    )
+
+    notifications = Notification.query.order_by(Notification.to).all()
+    assert [notification.to for notification in notifications] == ["one@example.com", "two@example.com"]
+    assert [validate(result, post_email_response) for result in resp_json["data"]] == resp_json["data"]
+    assert [result["reference"] for result in resp_json["data"]] == ["ref-1", None]
+    assert {result["id"] for result in resp_json["data"]} == {str(notification.id) for notification in notifications}
+    assert sorted(mock_call.args[0] for mock_call in mock_deliver.call_args_list) == sorted(
+        [str(notification.id)] for notification in notifications
+    )
+    assert all(mock_call.kwargs["queue"] == "send-email-tasks" for mock_call in mock_deliver.call_args_list)
+
+
+def test_post_bulk_notifications_sends_sms_notifications(api_client_request, sample_template, mocker):
+    mock_deliver = mocker.patch("app.celery.provider_tasks.deliver_sms.apply_async")
+
+    resp_json = api_client_request.post(
+        sample_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={
+            "template_id": str(sample_template.id),
+            "notifications": [{"phone_number": "+31612345678"}, {"phone_number": "+31612345679"}],
+        },
+    )
+
+    assert [validate(result, post_sms_response) for result in resp_json["data"]] == resp_json["data"]
+    assert Notification.query.count() == 2
+    assert mock_deliver.call_count == 2
+
+
+def test_post_bulk_notifications_returns_errors_for_each_invalid_notification(
+    api_client_request, sample_email_template_with_placeholders, mocker
+):
+    mock_deliver = mocker.patch("app.celery.provider_tasks.deliver_email.apply_async")
+    template = sample_email_template_with_placeholders
+
+    resp_json = api_client_request.post(
+        template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={
+            "template_id": str(template.id),
+            "notifications": [
+                {"email_address": "not-an-email"},
+                {"email_address": "ok@example.com", "personalisation": {"name": "Jo"}},
+                {"email_address": "ok@example.com"},
+            ],
+        },
+    )
+
+    assert resp_json["data"][0] == {
+        "errors": [{"error": "ValidationError", "message": "email_address Not a valid email address"}]
+    }
+    assert resp_json["data"][1]["id"] == str(Notification.query.one().id)
+    assert resp_json["data"][2] == {
+        "errors": [{"error": "BadRequestError", "message": "Missing personalisation: name"}]
+    }
+    mock_deliver.assert_called_once()
+
+
+def test_post_bulk_notifications_checks_limits_once_for_the_whole_batch(
+    api_client_request, sample_email_template, mocker
+):
+    mocker.patch("app.celery.provider_tasks.deliver_email.apply_async")
+    mock_check_rate_limiting = mocker.patch("app.v2.notifications.post_bulk_notifications.check_rate_limiting")
+
+    api_client_request.post(
+        sample_email_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={
+            "template_id": str(sample_email_template.id),
+            "notifications": [{"email_address": f"{i}@example.com"} for i in range(3)],
+        },
+    )
+
+    mock_check_rate_limiting.assert_called_once()
+    assert mock_check_rate_limiting.call_args.kwargs == {"notification_type": "email", "num_notifications": 3}
+
+
+def test_post_bulk_notifications_rejects_letter_templates(api_client_request, sample_letter_template):
+    resp_json = api_client_request.post(
+        sample_letter_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={"template_id": str(sample_letter_template.id), "notifications": [{"email_address": "a@example.com"}]},
+        _expected_status=400,
+    )
+
+    assert resp_json["errors"] == [{"error": "BadRequestError", "message": "Cannot send letter notifications in bulk"}]
+
+
+@pytest.mark.parametrize("notifications", ([], [{"email_address": "a@example.com"}] * 1001))
+def test_post_bulk_notifications_rejects_empty_or_oversized_batches(
+    api_client_request, sample_email_template, notifications
+):
+    api_client_request.post(
+        sample_email_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={"template_id": str(sample_email_template.id), "notifications": notifications},
+        _expected_status=400,
+    )
+
+    assert Notification.query.count() == 0
+
+
+def test_post_bulk_notifications_does_not_persist_simulated_recipients(
+    api_client_request, notify_api, sample_email_template, mocker
+):
+    mock_deliver = mocker.patch("app.celery.provider_tasks.deliver_email.apply_async")
+    simulated_address = notify_api.config["SIMULATED_EMAIL_ADDRESSES"][0]
+
+    resp_json = api_client_request.post(
+        sample_email_template.service_id,
+        "v2_notifications.post_bulk_notifications",
+        _data={"template_id": str(sample_email_template.id), "notifications": [{"email_address": simulated_address}]},
+    )
+
+    assert len(resp_json["data"]) == 1
+    assert Notification.query.count() == 0
+    assert mock_deliver.call_count == 0
+
+
+def test_post_bulk_notifications_errors_for_another_services_template(api_client_request, sample_service):
+    other_service_template = create_template(create_service(service_name="other service"))
+
+    resp_json = api_client_request.post(
+        sample_service.id,
+        "v2_notifications.post_bulk_notifications",
+        _data={"template_id": str(other_service_template.id), "notifications": [{"phone_number": "+31612345678"}]},
+        _expected_status=400,
+    )
+
+    assert resp_json["errors"] == [{"error": "BadRequestError", "message": "Template not found"}]